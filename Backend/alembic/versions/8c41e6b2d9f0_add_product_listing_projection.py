@@ -0,0 +1,95 @@
+"""Add product listing projection
+
+Revision ID: 8c41e6b2d9f0
+Revises: 3f9d2c7a1b84
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c41e6b2d9f0'
+down_revision: Union[str, Sequence[str], None] = '3f9d2c7a1b84'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('products', sa.Column('min_price_in_cents', sa.Integer(), nullable=True))
+    op.add_column('products', sa.Column('max_price_in_cents', sa.Integer(), nullable=True))
+    op.add_column(
+        'products',
+        sa.Column('total_stock', sa.Integer(), server_default='0', nullable=False),
+    )
+    op.add_column(
+        'products',
+        sa.Column('in_stock', sa.Boolean(), sa.Computed('total_stock > 0'), nullable=True),
+    )
+    op.add_column(
+        'products',
+        sa.Column(
+            'size_ids',
+            postgresql.ARRAY(sa.UUID()),
+            server_default='{}',
+            nullable=False,
+        ),
+    )
+    op.add_column(
+        'products',
+        sa.Column(
+            'color_ids',
+            postgresql.ARRAY(sa.UUID()),
+            server_default='{}',
+            nullable=False,
+        ),
+    )
+
+    # Backfill from existing variants
+    op.execute(
+        """
+        UPDATE products AS p
+        SET min_price_in_cents = v.min_price,
+            max_price_in_cents = v.max_price,
+            total_stock = v.total_stock,
+            size_ids = v.size_ids,
+            color_ids = v.color_ids
+        FROM (
+            SELECT product_id,
+                   min(coalesce(discount_price_in_cents, price_in_cents)) AS min_price,
+                   max(coalesce(discount_price_in_cents, price_in_cents)) AS max_price,
+                   coalesce(sum(stock), 0) AS total_stock,
+                   array_agg(DISTINCT size_id) AS size_ids,
+                   array_agg(DISTINCT color_id) AS color_ids
+            FROM product_variants
+            GROUP BY product_id
+        ) AS v
+        WHERE v.product_id = p.id
+        """
+    )
+
+    op.create_index(op.f('ix_products_min_price_in_cents'), 'products', ['min_price_in_cents'], unique=False)
+    op.create_index(op.f('ix_products_max_price_in_cents'), 'products', ['max_price_in_cents'], unique=False)
+    op.create_index(op.f('ix_products_in_stock'), 'products', ['in_stock'], unique=False)
+    op.create_index('ix_products_size_ids', 'products', ['size_ids'], unique=False, postgresql_using='gin')
+    op.create_index('ix_products_color_ids', 'products', ['color_ids'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_products_color_ids', table_name='products')
+    op.drop_index('ix_products_size_ids', table_name='products')
+    op.drop_index(op.f('ix_products_in_stock'), table_name='products')
+    op.drop_index(op.f('ix_products_max_price_in_cents'), table_name='products')
+    op.drop_index(op.f('ix_products_min_price_in_cents'), table_name='products')
+    op.drop_column('products', 'color_ids')
+    op.drop_column('products', 'size_ids')
+    op.drop_column('products', 'in_stock')
+    op.drop_column('products', 'total_stock')
+    op.drop_column('products', 'max_price_in_cents')
+    op.drop_column('products', 'min_price_in_cents')
@@ -0,0 +1,33 @@
+"""Add variant effective price index
+
+Revision ID: d4a7c3e91f52
+Revises: 8c41e6b2d9f0
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4a7c3e91f52'
+down_revision: Union[str, Sequence[str], None] = '8c41e6b2d9f0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_product_variants_product_effective_price',
+        'product_variants',
+        ['product_id', sa.text('coalesce(discount_price_in_cents, price_in_cents)')],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_product_variants_product_effective_price', table_name='product_variants')
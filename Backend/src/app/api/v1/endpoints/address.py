@@ -8,7 +8,8 @@ from sqlmodel.ext.asyncio.session import AsyncSession
 from app.core.config import settings
 from app.db.session import get_session
 from app.utils.deps import (
-    get_current_active_user,
+    AuthPrincipal,
+    get_current_active_principal,
     rate_limit_api,
     require_user,
 )
@@ -17,7 +18,6 @@ from app.schemas.address_schema import (
     AddressUpdate,
     AddressResponse,
 )
-from app.models.user_model import User
 from app.services.address_service import address_service
 
 logger = logging.getLogger(__name__)
@@ -40,7 +40,7 @@ async def get_address_by_id(
     address_id: uuid.UUID,
     *,
     db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_principal),
 ):
     return await address_service.get_address_by_id(
         db=db, current_user=current_user, address_id=address_id
@@ -59,7 +59,7 @@ async def create_address(
     *,
     address_data: AddressCreate,
     db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_principal),
 ):
     return await address_service.create(
         db=db, current_user=current_user, address_in=address_data
@@ -79,7 +79,7 @@ async def update_address(
     address_id: uuid.UUID,
     address_data: AddressUpdate,
     db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_principal),
 ):
     return await address_service.update(
         db=db,
@@ -101,7 +101,7 @@ async def delet_address(
     *,
     address_id: uuid.UUID,
     db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_principal),
 ):
     await address_service.delete(
         db=db, current_user=current_user, address_id=address_id
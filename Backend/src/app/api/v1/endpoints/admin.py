@@ -2,13 +2,15 @@ import logging
 import uuid
 from typing import Dict
 
-from fastapi import APIRouter, Depends, status, Query
+from fastapi import APIRouter, Depends, status, Query, Response
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.core.config import settings
+from app.db.instrumentation import sql_instrumentation
 from app.db.session import get_session
 from app.utils.deps import (
-    get_current_active_user,
+    AuthPrincipal,
+    get_current_active_principal,
     get_pagination_params,
     rate_limit_api,
     require_admin,
@@ -19,7 +21,8 @@ from app.schemas.user_schema import (
     UserListResponse,
     UserSearchParams,
 )
-from app.models.user_model import User, UserRole
+from app.schemas.diagnostics_schema import SlowQueryListResponse
+from app.models.user_model import UserRole
 from app.services.user_service import user_service
 
 logger = logging.getLogger(__name__)
@@ -42,13 +45,14 @@ async def get_user_by_id(
     *,
     db: AsyncSession = Depends(get_session),
     user_id: uuid.UUID,
-    current_user: User = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_principal),
 ):
     """Get User's profile by it's ID (Admin only)"""
 
-    return await user_service.get_user_by_id(
-        db=db, user_id=user_id, current_user=current_user
+    payload = await user_service.get_user_by_id(
+        db=db, user_id=user_id, current_user=current_user, return_json=True
     )
+    return Response(content=payload, media_type="application/json")
 
 
 @router.post(
@@ -62,7 +66,7 @@ async def get_user_by_id(
 async def change_user_role(
     *,
     db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_principal),
     user_id: uuid.UUID,
     new_role: UserRole = Query(..., description="New role for the user"),
 ):
@@ -104,7 +108,7 @@ async def activate_user(
     *,
     db: AsyncSession = Depends(get_session),
     user_id: uuid.UUID,
-    current_user: User = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_principal),
 ):
     """
     Deactivate a user account.
@@ -137,7 +141,7 @@ async def deactivate_user(
     db: AsyncSession = Depends(get_session),
     *,
     user_id: uuid.UUID,
-    current_user: User = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_principal),
 ):
     """
     Deactivate a user account.
@@ -165,7 +169,7 @@ async def delete_user(
     *,
     db: AsyncSession = Depends(get_session),
     user_id: uuid.UUID,
-    current_user: User = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_principal),
 ):
     """
     Delete a user account.
@@ -195,7 +199,7 @@ async def delete_user(
 async def get_all_users(
     *,
     db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_principal),
     pagination: PaginationParams = Depends(get_pagination_params),
     search_params: UserSearchParams = Depends(UserSearchParams),
     order_by: str = Query("created_at", description="Field to order by"),
@@ -208,7 +212,23 @@ async def get_all_users(
         current_user=current_user,
         skip=pagination.skip,
         limit=pagination.limit,
+        count_strategy=pagination.count_strategy,
         filters=search_params.model_dump(exclude_none=True),
         order_by=order_by,
         order_desc=order_desc,
     )
+
+
+@router.get(
+    "/diagnostics/slow-queries",
+    response_model=SlowQueryListResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Sampled slow queries",
+    description="Recent slow SQL statements with their EXPLAIN ANALYZE plans, "
+    "as sampled by this worker (Admins only).",
+    dependencies=[Depends(require_admin), Depends(rate_limit_api)],
+)
+async def get_slow_queries():
+    """Get the slow-query plan samples of the worker serving the request"""
+
+    return {"items": sql_instrumentation.slow_queries()}
@@ -7,10 +7,10 @@ from sqlmodel.ext.asyncio.session import AsyncSession
 from app.core.config import settings
 from app.schemas.user_schema import UserResponse, UserCreate
 from app.schemas.token_schema import TokenResponse, TokenRefresh
-from app.models.user_model import User
 from app.db.session import get_session
 from app.utils.deps import (
-    get_current_active_user,
+    AuthPrincipal,
+    get_current_active_principal,
     rate_limit_auth,
     rate_limit_api,
     reusable_oauth2,
@@ -115,7 +115,7 @@ async def admin_login(
 async def logout_user(
     token: TokenRefresh,
     access_token: str = Depends(reusable_oauth2),
-    current_user: User = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_principal),
 ):
     """User Logout Api"""
     await auth_service.logout(
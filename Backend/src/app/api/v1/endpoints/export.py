@@ -0,0 +1,53 @@
+import logging
+
+from fastapi import APIRouter, Depends, status, Query
+from fastapi.responses import StreamingResponse
+
+from app.core.config import settings
+from app.schemas.export_schema import ExportDataset, ExportFormat
+from app.utils.deps import (
+    AuthPrincipal,
+    get_current_active_principal,
+    rate_limit_heavy,
+    require_admin,
+)
+from app.services.export_service import export_service
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(
+    tags=["Export"],
+    prefix=f"{settings.API_V1_STR}/export",
+)
+
+
+@router.get(
+    "/{dataset}",
+    status_code=status.HTTP_200_OK,
+    response_class=StreamingResponse,
+    summary="Export a dataset",
+    description=(
+        "Stream every product (with variants), user or order (with items) as "
+        "NDJSON or CSV in a single pass, admin only"
+    ),
+    dependencies=[Depends(rate_limit_heavy), Depends(require_admin)],
+)
+async def export_dataset(
+    dataset: ExportDataset,
+    *,
+    current_user: AuthPrincipal = Depends(get_current_active_principal),
+    format: ExportFormat = Query(ExportFormat.NDJSON, description="File format"),
+    gzip: bool = Query(False, description="Gzip the file while streaming it"),
+):
+    stream = export_service.stream_export(
+        dataset=dataset,
+        export_format=format,
+        current_user=current_user,
+        compress=gzip,
+    )
+    filename = export_service.filename(dataset, format, gzip)
+    return StreamingResponse(
+        stream,
+        media_type=export_service.media_type(format, gzip),
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
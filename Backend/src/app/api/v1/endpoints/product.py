@@ -1,7 +1,7 @@
 import logging
 import uuid
-from typing import Dict
-from fastapi import APIRouter, Depends, status, Query
+from typing import Dict, Optional
+from fastapi import APIRouter, Depends, status, Query, Response, File, UploadFile
 
 from sqlmodel.ext.asyncio.session import AsyncSession
 
@@ -13,6 +13,8 @@ from app.schemas.product_schema import (
     ProductListResponse,
     ProductSearchParams,
     ProductPublicSearchParams,
+    ProductImportFormat,
+    ProductImportResult,
     # PRODUCT VARIANT
     ProductVariantCreate,
     ProductVariantResponse,
@@ -23,17 +25,19 @@ from app.schemas.product_schema import (
     ProductImageCreate,
     ProductImageResponse,
 )
-from app.models.user_model import User
-from app.db.session import get_session
+from app.db.session import get_read_session, get_session
 from app.utils.deps import (
-    get_current_active_user,
+    AuthPrincipal,
+    get_current_active_principal,
     rate_limit_api,
+    rate_limit_heavy,
     require_admin,
     require_user,
     PaginationParams,
     get_pagination_params,
 )
 from app.services.product_service import product_service
+from app.services.product_import_service import product_import_service
 
 logger = logging.getLogger(__name__)
 
@@ -55,21 +59,57 @@ router = APIRouter(
 async def get_all_products(
     *,
     db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_principal),
     pagination: PaginationParams = Depends(get_pagination_params),
     search_params: ProductSearchParams = Depends(ProductSearchParams),
-    order_by: str = Query("created_at", description="Field to order by"),
+    order_by: str = Query(
+        "created_at",
+        description=(
+            "Field to order by, `price` (lowest effective price) or "
+            "`relevance` to rank `search` matches"
+        ),
+    ),
     order_desc: bool = Query(True, description="Order descending"),
 ):
 
-    return await product_service.get_all_products(
+    payload = await product_service.get_all_products(
         db=db,
         current_user=current_user,
         skip=pagination.skip,
         limit=pagination.limit,
+        count_strategy=pagination.count_strategy,
         filters=search_params.model_dump(exclude_none=True),
         order_by=order_by,
         order_desc=order_desc,
+        return_json=True,
+    )
+    return Response(content=payload, media_type="application/json")
+
+
+@router.post(
+    "/import",
+    status_code=status.HTTP_200_OK,
+    response_model=ProductImportResult,
+    summary="Bulk import products",
+    description=(
+        "Import a catalog feed admin only. NDJSON holds one product (as for "
+        "create) per line; CSV holds one variant per row with the product's "
+        "columns repeated and its rows contiguous, plus optional `image_urls` "
+        "separated by `|`. Invalid products are skipped and reported by line."
+    ),
+    dependencies=[Depends(rate_limit_heavy), Depends(require_admin)],
+)
+async def import_products(
+    *,
+    file: UploadFile = File(..., description="NDJSON or CSV catalog feed"),
+    format: Optional[ProductImportFormat] = Query(
+        None, description="File format; detected from the file name when omitted"
+    ),
+    db: AsyncSession = Depends(get_session),
+    current_user: AuthPrincipal = Depends(get_current_active_principal),
+):
+    return await product_import_service.import_products(
+        db=db, upload=file, current_user=current_user, import_format=format
     )
 
 
@@ -85,7 +125,7 @@ async def get_all_variants(
     product_id: uuid.UUID,
     *,
     db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_principal),
     pagination: PaginationParams = Depends(get_pagination_params),
     search_params: ProductVariantSearchParams = Depends(ProductVariantSearchParams),
 ):
@@ -95,6 +135,7 @@ async def get_all_variants(
         product_id=product_id,
         skip=pagination.skip,
         limit=pagination.limit,
+        count_strategy=pagination.count_strategy,
         filters=search_params.model_dump(exclude_none=True),
     )
 
@@ -111,13 +152,14 @@ async def get_product_by_id(
     product_id: uuid.UUID,
     *,
     db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_principal),
 ):
     """Fetch a product by it's ID"""
 
-    return await product_service.get_product_by_id(
-        db=db, current_user=current_user, product_id=product_id
+    payload = await product_service.get_product_by_id(
+        db=db, current_user=current_user, product_id=product_id, return_json=True
     )
+    return Response(content=payload, media_type="application/json")
 
 
 @router.post(
@@ -132,7 +174,7 @@ async def create_product(
     *,
     product_data: ProductCreate,
     db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_principal),
 ):
     return await product_service.create_product(
         db=db, product_data=product_data, current_user=current_user
@@ -152,7 +194,7 @@ async def update_product(
     product_id: uuid.UUID,
     product_data: ProductUpdate,
     db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_principal),
 ):
 
     return await product_service.update_product(
@@ -175,7 +217,7 @@ async def deactivate_product(
     *,
     product_id: uuid.UUID,
     db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_principal),
 ):
 
     return await product_service.soft_delete_product(
@@ -195,7 +237,7 @@ async def delete_product(
     *,
     product_id: uuid.UUID,
     db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_principal),
 ):
 
     return await product_service.delete_product(
@@ -220,7 +262,7 @@ async def get_image_by_id(
     image_id: uuid.UUID,
     *,
     db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_principal),
 ):
 
     return await product_service.get_image_by_id(
@@ -241,7 +283,7 @@ async def add_image_to_product(
     image_data: ProductImageCreate,
     *,
     db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_principal),
 ):
 
     return await product_service.add_image_to_product(
@@ -261,7 +303,7 @@ async def delete_image(
     image_id: uuid.UUID,
     *,
     db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_principal),
 ):
 
     return await product_service.delete_image(
@@ -284,7 +326,7 @@ async def get_variant_by_id(
     variant_id: uuid.UUID,
     *,
     db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_principal),
 ):
 
     return await product_service.get_product_variant_by_id(
@@ -305,7 +347,7 @@ async def add_variant_to_product(
     variant_data: ProductVariantCreate,
     *,
     db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_principal),
 ):
 
     return await product_service.add_variant_to_product(
@@ -330,7 +372,7 @@ async def update_variant(
     product_id: uuid.UUID,
     variant_data: ProductVariantUpdate,
     db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_principal),
 ):
 
     return await product_service.update_variant(
@@ -355,7 +397,7 @@ async def delete_variant(
     variant_id: uuid.UUID,
     product_id: uuid.UUID,
     db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_principal),
 ):
 
     return await product_service.delete_variant(
@@ -376,21 +418,40 @@ async def delete_variant(
 )
 async def get_all_active_products(
     *,
-    db: AsyncSession = Depends(get_session),
+    db: AsyncSession = Depends(get_read_session),
     pagination: PaginationParams = Depends(get_pagination_params),
     search_params: ProductPublicSearchParams = Depends(ProductPublicSearchParams),
-    order_by: str = Query("created_at", description="Field to order by"),
+    order_by: str = Query(
+        "created_at",
+        description=(
+            "Field to order by, `price` (lowest effective price) or "
+            "`relevance` to rank `search` matches"
+        ),
+    ),
     order_desc: bool = Query(True, description="Order descending"),
+    cursor: Optional[str] = Query(
+        None,
+        description="Cursor from a previous response's next_cursor (keyset pagination, ignores page)",
+    ),
+    facets: bool = Query(
+        False,
+        description="Include size/color/category/gender/price facet counts",
+    ),
 ):
+    """Serves the rendered page straight from the listing cache when possible."""
 
-    return await product_service.get_all_active_products(
+    payload = await product_service.get_all_active_products_json(
         db=db,
         skip=pagination.skip,
         limit=pagination.limit,
+        count_strategy=pagination.count_strategy,
         filters=search_params.model_dump(exclude_none=True),
         order_by=order_by,
         order_desc=order_desc,
+        cursor=cursor,
+        facets=facets,
     )
+    return Response(content=payload, media_type="application/json")
 
 @router.get(
     "/{product_id}/active",
@@ -403,11 +464,12 @@ async def get_all_active_products(
 async def get_product_active_by_id(
     product_id: uuid.UUID,
     *,
-    db: AsyncSession = Depends(get_session),
+    db: AsyncSession = Depends(get_read_session),
 ):
     """Fetch a product by it's ID"""
 
-    return await product_service.get_active_product_by_id(
-        db=db, product_id=product_id
+    payload = await product_service.get_active_product_by_id(
+        db=db, product_id=product_id, return_json=True
     )
+    return Response(content=payload, media_type="application/json")
 
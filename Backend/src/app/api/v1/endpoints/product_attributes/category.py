@@ -2,13 +2,14 @@ import logging
 import uuid
 from typing import Dict
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, status, Response
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.core.config import settings
-from app.db.session import get_session
+from app.db.session import get_read_session, get_session
 from app.utils.deps import (
-    get_current_active_user,
+    AuthPrincipal,
+    get_current_active_principal,
     get_pagination_params,
     rate_limit_api,
     require_admin,
@@ -21,7 +22,6 @@ from app.schemas.category_schema import (
     CategoryUpdate,
     CategorySearchParams,
 )
-from app.models.user_model import User
 from app.services.product_attributes.category_service import category_service
 
 logger = logging.getLogger(__name__)
@@ -42,8 +42,8 @@ router = APIRouter(
 )
 async def get_all_categories(
     *,
-    db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_read_session),
+    current_user: AuthPrincipal = Depends(get_current_active_principal),
     pagination: PaginationParams = Depends(get_pagination_params),
     search_params: CategorySearchParams = Depends(CategorySearchParams),
 ):
@@ -53,6 +53,7 @@ async def get_all_categories(
         current_user=current_user,
         skip=pagination.skip,
         limit=pagination.limit,
+        count_strategy=pagination.count_strategy,
         filters=search_params.model_dump(exclude_none=True),
     )
 
@@ -68,12 +69,13 @@ async def get_all_categories(
 async def get_category_by_id(
     category_id: uuid.UUID,
     *,
-    db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_read_session),
+    current_user: AuthPrincipal = Depends(get_current_active_principal),
 ):
-    return await category_service.get_category_by_id(
-        db=db, current_user=current_user, category_id=category_id
+    payload = await category_service.get_category_by_id(
+        db=db, current_user=current_user, category_id=category_id, return_json=True
     )
+    return Response(content=payload, media_type="application/json")
 
 
 @router.post(
@@ -88,7 +90,7 @@ async def create_category(
     *,
     category_data: CategoryCreate,
     db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_principal),
 ):
     return await category_service.create(
         db=db, current_user=current_user, category_in=category_data
@@ -108,7 +110,7 @@ async def update_category(
     category_id: uuid.UUID,
     category_data: CategoryUpdate,
     db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_principal),
 ):
     return await category_service.update(
         db=db,
@@ -130,7 +132,7 @@ async def delet_category(
     *,
     category_id: uuid.UUID,
     db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_principal),
 ):
     await category_service.delete(
         db=db, current_user=current_user, category_id=category_id
@@ -6,9 +6,10 @@ from fastapi import APIRouter, Depends, status
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.core.config import settings
-from app.db.session import get_session
+from app.db.session import get_read_session, get_session
 from app.utils.deps import (
-    get_current_active_user,
+    AuthPrincipal,
+    get_current_active_principal,
     get_pagination_params,
     rate_limit_api,
     require_admin,
@@ -21,7 +22,6 @@ from app.schemas.color_schema import (
     ColorCreate,
     ColorUpdate,
 )
-from app.models.user_model import User
 from app.services.product_attributes.color_service import color_service
 
 logger = logging.getLogger(__name__)
@@ -42,8 +42,8 @@ router = APIRouter(
 )
 async def get_all_colors(
     *,
-    db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_read_session),
+    current_user: AuthPrincipal = Depends(get_current_active_principal),
     pagination: PaginationParams = Depends(get_pagination_params),
     search_params: ColorSearchParams = Depends(ColorSearchParams),
 ):
@@ -53,6 +53,7 @@ async def get_all_colors(
         current_user=current_user,
         skip=pagination.skip,
         limit=pagination.limit,
+        count_strategy=pagination.count_strategy,
         filters=search_params.model_dump(exclude_none=True),
     )
 
@@ -68,8 +69,8 @@ async def get_all_colors(
 async def get_color_by_id(
     color_id: uuid.UUID,
     *,
-    db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_read_session),
+    current_user: AuthPrincipal = Depends(get_current_active_principal),
 ):
     return await color_service.get_color_by_id(
         db=db, current_user=current_user, color_id=color_id
@@ -88,7 +89,7 @@ async def create_color(
     *,
     color_data: ColorCreate,
     db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_principal),
 ):
     return await color_service.create(
         db=db, current_user=current_user, color_in=color_data
@@ -108,7 +109,7 @@ async def update_color(
     color_id: uuid.UUID,
     color_data: ColorUpdate,
     db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_principal),
 ):
     return await color_service.update(
         db=db, current_user=current_user, color_data=color_data, color_id=color_id
@@ -127,7 +128,7 @@ async def delet_color(
     *,
     color_id: uuid.UUID,
     db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_principal),
 ):
     await color_service.delete(db=db, current_user=current_user, color_id=color_id)
 
@@ -6,9 +6,10 @@ from fastapi import APIRouter, Depends, status
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.core.config import settings
-from app.db.session import get_session
+from app.db.session import get_read_session, get_session
 from app.utils.deps import (
-    get_current_active_user,
+    AuthPrincipal,
+    get_current_active_principal,
     get_pagination_params,
     rate_limit_api,
     require_admin,
@@ -21,7 +22,6 @@ from app.schemas.size_schema import (
     SizeCreate,
     SizeUpdate,
 )
-from app.models.user_model import User
 from app.services.product_attributes.size_service import size_service
 
 logger = logging.getLogger(__name__)
@@ -41,8 +41,8 @@ router = APIRouter(
 )
 async def get_all_sizes(
     *,
-    db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_read_session),
+    current_user: AuthPrincipal = Depends(get_current_active_principal),
     pagination: PaginationParams = Depends(get_pagination_params),
     search_params: SizeSearchParams = Depends(SizeSearchParams),
 ):
@@ -52,6 +52,7 @@ async def get_all_sizes(
         current_user=current_user,
         skip=pagination.skip,
         limit=pagination.limit,
+        count_strategy=pagination.count_strategy,
         filters=search_params.model_dump(exclude_none=True),
     )
 
@@ -67,8 +68,8 @@ async def get_all_sizes(
 async def get_size_by_id(
     size_id: uuid.UUID,
     *,
-    db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_read_session),
+    current_user: AuthPrincipal = Depends(get_current_active_principal),
 ):
     return await size_service.get_size_by_id(
         db=db, current_user=current_user, size_id=size_id
@@ -87,7 +88,7 @@ async def create_size(
     *,
     size_data: SizeCreate,
     db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_principal),
 ):
     return await size_service.create(
         db=db, current_user=current_user, size_in=size_data
@@ -107,7 +108,7 @@ async def update_size(
     size_id: uuid.UUID,
     size_data: SizeUpdate,
     db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_principal),
 ):
     return await size_service.update(
         db=db, current_user=current_user, size_data=size_data, size_id=size_id
@@ -126,7 +127,7 @@ async def delet_size(
     *,
     size_id: uuid.UUID,
     db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_principal),
 ):
     await size_service.delete(db=db, current_user=current_user, size_id=size_id)
 
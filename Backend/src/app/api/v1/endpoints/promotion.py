@@ -2,13 +2,14 @@ import logging
 import uuid
 from typing import Dict
 
-from fastapi import APIRouter, Depends, status, Query
+from fastapi import APIRouter, Depends, status, Query, Response
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.core.config import settings
 from app.db.session import get_session
 from app.utils.deps import (
-    get_current_active_user,
+    AuthPrincipal,
+    get_current_active_principal,
     get_pagination_params,
     rate_limit_api,
     require_admin,
@@ -21,7 +22,6 @@ from app.schemas.promotion_schema import (
     PromotionUpdate,
     PromotionSearchParams,
 )
-from app.models.user_model import User
 from app.services.promotion_service import promotion_service
 
 logger = logging.getLogger(__name__)
@@ -43,7 +43,7 @@ router = APIRouter(
 async def get_all_promotions(
     *,
     db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_principal),
     pagination: PaginationParams = Depends(get_pagination_params),
     search_params: PromotionSearchParams = Depends(PromotionSearchParams),
     order_by: str = Query("created_at", description="Field to order by"),
@@ -55,6 +55,7 @@ async def get_all_promotions(
         current_user=current_user,
         skip=pagination.skip,
         limit=pagination.limit,
+        count_strategy=pagination.count_strategy,
         filters=search_params.model_dump(exclude_none=True),
         order_by=order_by,
         order_desc=order_desc,
@@ -73,11 +74,12 @@ async def get_promotion_by_id(
     promotion_id: uuid.UUID,
     *,
     db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_principal),
 ):
-    return await promotion_service.get_promotion_by_id(
-        db=db, current_user=current_user, promotion_id=promotion_id
+    payload = await promotion_service.get_promotion_by_id(
+        db=db, current_user=current_user, promotion_id=promotion_id, return_json=True
     )
+    return Response(content=payload, media_type="application/json")
 
 
 @router.post(
@@ -92,7 +94,7 @@ async def create_promotion(
     *,
     promotion_data: PromotionCreate,
     db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_principal),
 ):
     return await promotion_service.create(
         db=db, current_user=current_user, promotion_in=promotion_data
@@ -112,7 +114,7 @@ async def update_promotion(
     promotion_id: uuid.UUID,
     promotion_data: PromotionUpdate,
     db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_principal),
 ):
     return await promotion_service.update(
         db=db,
@@ -134,7 +136,7 @@ async def activate_promotion(
     *,
     promotion_id: uuid.UUID,
     db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_principal),
 ):
     return await promotion_service.activate(
         db=db,
@@ -155,7 +157,7 @@ async def deactivate_promotion(
     *,
     promotion_id: uuid.UUID,
     db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_principal),
 ):
     return await promotion_service.deactivate(
         db=db,
@@ -176,7 +178,7 @@ async def delete_promotion(
     *,
     promotion_id: uuid.UUID,
     db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_principal),
 ):
     await promotion_service.delete(
         db=db, current_user=current_user, promotion_id=promotion_id
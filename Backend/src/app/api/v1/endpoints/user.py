@@ -1,7 +1,7 @@
 import logging
 
 from typing import Dict
-from fastapi import APIRouter, Depends, status, Query
+from fastapi import APIRouter, Depends, status, Query, Response
 
 from sqlmodel.ext.asyncio.session import AsyncSession
 
@@ -15,6 +15,8 @@ from app.services.wishlist_service import wishlist_service
 from app.models.user_model import User
 from app.db.session import get_session
 from app.utils.deps import (
+    AuthPrincipal,
+    get_current_active_principal,
     get_current_active_user,
     rate_limit_api,
     require_user,
@@ -46,9 +48,12 @@ router = APIRouter(
 async def get_my_profile(
     *,
     db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_principal),
 ):
-    return current_user
+    payload = await user_service.get_user_by_id(
+        db=db, user_id=current_user.id, current_user=current_user, return_json=True
+    )
+    return Response(content=payload, media_type="application/json")
 
 
 @router.patch(
@@ -62,7 +67,7 @@ async def get_my_profile(
 async def update_my_profile(
     *,
     db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_principal),
     user_data: UserUpdate,
 ):
     updated_user = await user_service.update_user(
@@ -86,7 +91,7 @@ async def update_my_profile(
 async def deactivate_my_account(
     *,
     db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_principal),
 ):
     """
     Deactivate a user account.
@@ -113,7 +118,7 @@ async def deactivate_my_account(
 async def delete_my_account(
     *,
     db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_principal),
 ):
     """
     delete a user account.
@@ -162,7 +167,7 @@ async def change_my_password(
 async def get_my_addresses(
     *,
     db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_principal),
     pagination: PaginationParams = Depends(get_pagination_params),
     search_params: AddressSearchParams = Depends(AddressSearchParams),
     order_by: str = Query("created_at", description="Field to order by"),
@@ -174,6 +179,7 @@ async def get_my_addresses(
         current_user=current_user,
         skip=pagination.skip,
         limit=pagination.limit,
+        count_strategy=pagination.count_strategy,
         filters=search_params.model_dump(exclude_none=True),
         order_by=order_by,
         order_desc=order_desc,
@@ -191,7 +197,7 @@ async def get_my_addresses(
 async def get_my_wishlist(
     *,
     db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_principal),
     pagination: PaginationParams = Depends(get_pagination_params),
     order_by: str = Query("created_at", description="Field to order by"),
     order_desc: bool = Query(True, description="Order descending"),
@@ -202,6 +208,7 @@ async def get_my_wishlist(
         current_user=current_user,
         skip=pagination.skip,
         limit=pagination.limit,
+        count_strategy=pagination.count_strategy,
         order_by=order_by,
         order_desc=order_desc,
     )
@@ -8,10 +8,10 @@ from sqlmodel.ext.asyncio.session import AsyncSession
 from app.core.config import settings
 from app.schemas.wishlist_schema import WishlistResponse
 from app.services.wishlist_service import wishlist_service
-from app.models.user_model import User
 from app.db.session import get_session
 from app.utils.deps import (
-    get_current_active_user,
+    AuthPrincipal,
+    get_current_active_principal,
     rate_limit_api,
     require_user,
 )
@@ -37,7 +37,7 @@ async def add_item_to_wishlist(
     *,
     product_id: uuid.UUID,
     db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_principal),
 ):
 
     return await wishlist_service.add_product_to_wishlist(
@@ -57,7 +57,7 @@ async def remove_product_from_wishlist(
     *,
     product_id: uuid.UUID,
     db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(get_current_active_user),
+    current_user: AuthPrincipal = Depends(get_current_active_principal),
 ):
 
     return await wishlist_service.remove_item_from_wishlist(
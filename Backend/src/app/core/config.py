@@ -1,4 +1,6 @@
 # app/core/config.py
+from typing import List
+
 from pydantic import PostgresDsn, computed_field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -44,12 +46,102 @@ class Settings(BaseSettings):
             f"@localhost:5433/{self.POSTGRES_DB}"
         )
 
+    # --- Read Replicas ---
+    # Comma-separated host[:port] list of streaming replicas; empty disables them
+    POSTGRES_REPLICA_SERVERS: str = ""
+
+    @computed_field
+    @property
+    def DATABASE_REPLICA_URLS(self) -> List[str]:
+        urls = []
+        for server in self.POSTGRES_REPLICA_SERVERS.split(","):
+            if not server.strip():
+                continue
+            host, _, port = server.strip().partition(":")
+            urls.append(
+                f"postgresql+asyncpg://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}"
+                f"@{host}:{port or self.POSTGRES_PORT}/{self.POSTGRES_DB}"
+            )
+        return urls
+
     # --- Database Pool Settings (CORRECTED) ---
     DB_ECHO: bool = False
     DB_POOL_SIZE: int = 5
     DB_MAX_OVERFLOW: int = 10
     DB_POOL_RECYCLE: int = 3600
     DB_POOL_TIMEOUT: int = 30
+    DB_REPLICA_POOL_SIZE: int = 5
+    DB_REPLICA_MAX_OVERFLOW: int = 10
+    # Replicas further behind the primary than this leave the rotation
+    DB_REPLICA_MAX_LAG_BYTES: int = 16 * 1024 * 1024
+    DB_REPLICA_CHECK_INTERVAL: float = 5.0
+    # After a client writes, its reads skip replicas that have not replayed the
+    # write for this long (tracked in a signed cookie)
+    DB_READ_YOUR_WRITES_SECONDS: int = 10
+    DB_WRITE_POSITION_COOKIE: str = "db_write_position"
+
+    # --- Cache Settings ---
+    # In-process L1 tier in front of Redis for near-static schemas
+    CACHE_LOCAL_ENABLED: bool = True
+    CACHE_LOCAL_MAXSIZE: int = 1000
+    CACHE_LOCAL_TTL: int = 60
+    CACHE_INVALIDATION_CHANNEL: str = "cache:invalidations"
+    # Auth principal (id, role, is_active, tokens_valid_from_utc) cache
+    AUTH_PRINCIPAL_CACHE_SIZE: int = 10000
+    AUTH_PRINCIPAL_LOCAL_TTL: int = 30
+    AUTH_PRINCIPAL_TTL: int = 300
+    # Verified access token claims, so hot sessions skip JWT decoding
+    TOKEN_CLAIMS_CACHE_SIZE: int = 10000
+
+    # --- Product Loading ---
+    # Build ProductResponse documents in Postgres (json_build_object/json_agg)
+    # instead of ORM selectinloads; off by default so both can be benchmarked
+    PRODUCT_JSON_LOADER: bool = False
+    # Bulk import: variant rows per staging/commit chunk, and report size cap
+    PRODUCT_IMPORT_CHUNK_SIZE: int = 2000
+    PRODUCT_IMPORT_MAX_ERRORS: int = 1000
+    # Rows fetched per round trip from the server-side cursor of an export
+    EXPORT_BATCH_SIZE: int = 1000
+
+    # --- Rate Limiting Settings ---
+    # In-process limiter used while Redis is unreachable
+    RATE_LIMIT_LOCAL_MAXSIZE: int = 50000
+    RATE_LIMIT_SWEEP_INTERVAL: int = 30
+
+    # --- SQL Instrumentation ---
+    SQL_INSTRUMENTATION_ENABLED: bool = True
+    # Statements slower than this are logged and sampled for EXPLAIN ANALYZE
+    SQL_SLOW_QUERY_MS: float = 200.0
+    SQL_EXPLAIN_SAMPLE_RATE: float = 0.1
+    SQL_EXPLAIN_BUFFER_SIZE: int = 50
+    # A statement run this many times in one request is reported as a likely N+1
+    SQL_N_PLUS_ONE_THRESHOLD: int = 5
+
+    # --- Metrics ---
+    METRICS_ENABLED: bool = True
+    # Seconds between publishing this worker's metrics for /metrics to merge
+    METRICS_PUSH_INTERVAL: float = 5.0
+    # Scrapers send it as a Bearer token; /metrics is not served while unset
+    METRICS_TOKEN: str = ""
+    # Time every handle_exceptions-wrapped repository method
+    REPOSITORY_METRICS_ENABLED: bool = True
+
+    # --- Password Hashing ---
+    # Argon2 runs on dedicated threads. Each running hash holds ~50 MB, so the
+    # thread count is also capped to what fits in PASSWORD_HASH_MEMORY_MB
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MEMORY_MB: int = 128
+    # Hashes queued or running before new ones are rejected with a 503
+    PASSWORD_HASH_MAX_PENDING: int = 32
+
+    # --- Token Revocation ---
+    # Workers mirror revocations from this stream; a worker trusts its copy
+    # only while its last sync started at most REVOCATION_MAX_STALENESS ago
+    REVOCATION_STREAM: str = "auth:revocations"
+    REVOCATION_STREAM_MAXLEN: int = 100000
+    REVOCATION_MAX_STALENESS: float = 10.0
+    # Past this many revoked tokens, unknown ones are checked in Redis again
+    REVOCATION_FILTER_MAX_ENTRIES: int = 500000
 
     # --- Security & JWT Settings ---
     JWT_SECRET: str
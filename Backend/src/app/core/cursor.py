@@ -0,0 +1,73 @@
+import base64
+import hashlib
+import hmac
+import json
+import logging
+from typing import Any, Dict
+
+from app.core.config import settings
+from app.core.exceptions import InvalidInput
+
+logger = logging.getLogger(__name__)
+
+
+def _b64encode(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(data: str) -> bytes:
+    padding = "=" * (-len(data) % 4)
+    return base64.urlsafe_b64decode(data + padding)
+
+
+class CursorCodec:
+    """
+    Encodes and decodes opaque, signed pagination cursors.
+
+    A cursor is `base64url(json_payload).base64url(hmac_sha256)`. The payload is
+    readable by anyone holding the cursor, so it must never carry secrets; the
+    signature only guarantees that clients cannot forge or tamper with it.
+    """
+
+    # Domain separation so a cursor signature can never be confused with a JWT
+    SIGNING_CONTEXT = b"pagination-cursor:v1"
+
+    def __init__(self, secret: str):
+        self._key = hmac.new(
+            secret.encode("utf-8"), self.SIGNING_CONTEXT, hashlib.sha256
+        ).digest()
+
+    def _sign(self, body: bytes) -> bytes:
+        return hmac.new(self._key, body, hashlib.sha256).digest()
+
+    def encode(self, payload: Dict[str, Any]) -> str:
+        """Serialize and sign a cursor payload."""
+        body = json.dumps(payload, separators=(",", ":"), sort_keys=True).encode(
+            "utf-8"
+        )
+        return f"{_b64encode(body)}.{_b64encode(self._sign(body))}"
+
+    def decode(self, cursor: str) -> Dict[str, Any]:
+        """Verify and deserialize a cursor. Raises InvalidInput if it was tampered with."""
+        try:
+            body_part, sig_part = cursor.split(".", 1)
+            body = _b64decode(body_part)
+            signature = _b64decode(sig_part)
+        except (ValueError, TypeError):
+            raise InvalidInput(detail="Malformed pagination cursor.", field="cursor")
+
+        if not hmac.compare_digest(signature, self._sign(body)):
+            logger.warning("Rejected pagination cursor with an invalid signature.")
+            raise InvalidInput(detail="Invalid pagination cursor.", field="cursor")
+
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            raise InvalidInput(detail="Malformed pagination cursor.", field="cursor")
+
+        if not isinstance(payload, dict):
+            raise InvalidInput(detail="Malformed pagination cursor.", field="cursor")
+        return payload
+
+
+cursor_codec = CursorCodec(settings.JWT_SECRET)
@@ -1,16 +1,36 @@
 from typing import Optional, Type, TypeVar, Callable, Any
 from functools import wraps
 import asyncio
+import time
 
+from app.core.config import settings
 from app.core.exceptions import AppException, InternalServerError
+from app.core.metrics import repository_call_duration, repository_errors
+from app.db.instrumentation import query_stats
 
 T = TypeVar("T")
 
 
+def _record_call(label: str, start: float, failed: bool) -> None:
+    elapsed = time.perf_counter() - start
+    repository_call_duration.observe(elapsed, label)
+    if failed:
+        repository_errors.inc(label)
+    stats = query_stats.get()
+    if stats is not None:
+        stats.record_call(label, elapsed)
+
+
 def handle_exceptions(
     default_exception: Type[AppException] = InternalServerError,
     message: Optional[str] = None,
 ) -> Callable:
+    """
+    Convert unexpected errors to `default_exception`. Repository methods are
+    also timed (when REPOSITORY_METRICS_ENABLED), labelled by qualified name
+    such as "ProductRepository.get_all_active", into the metrics registry and
+    the current request's query stats.
+    """
 
     def decorator(func: Callable[..., T]) -> Callable[..., T]:
         @wraps(func)
@@ -37,7 +57,23 @@ def handle_exceptions(
                 error_message = message or f"Error in {func.__name__}"
                 raise default_exception(detail=error_message) from e
 
+        label = func.__qualname__
+
+        @wraps(func)
+        async def timed_async_wrapper(*args: Any, **kwargs: Any) -> T:
+            start = time.perf_counter()
+            failed = True
+            try:
+                result = await async_wrapper(*args, **kwargs)
+                failed = False
+                return result
+            finally:
+                _record_call(label, start, failed)
+
         if asyncio.iscoroutinefunction(func):
+            # Decided once here, so disabled timing costs nothing per call
+            if settings.REPOSITORY_METRICS_ENABLED:
+                return timed_async_wrapper
             return async_wrapper
         return sync_wrapper
 
@@ -0,0 +1,443 @@
+"""
+In-process metrics in the Prometheus text exposition format.
+
+Counters, gauges and histograms are plain dicts keyed by label values, updated
+without locks (the event loop is single threaded), so recording costs a dict
+lookup. Each worker process keeps its own registry; `snapshot()` turns it into
+JSON-friendly data that `merge()` can combine across workers before `render()`.
+
+Counters and histograms must not go down when a worker exits, or Prometheus
+sees a reset. `cumulative_fields()` flattens them to plain numbers that can be
+added to the totals of retired workers, and `from_fields()` turns those totals
+back into a snapshot to merge with the live ones.
+"""
+import bisect
+import json
+import math
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+LabelValues = Tuple[str, ...]
+
+# Seconds; covers a cache hit through a slow report query
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+class _Metric(ABC):
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    @abstractmethod
+    def _samples(self) -> list:
+        """[label values, value...] per label combination."""
+
+    def snapshot(self) -> dict:
+        return {
+            "type": self.type_name,
+            "help": self.documentation,
+            "labels": list(self.labelnames),
+            "samples": self._samples(),
+        }
+
+
+class Counter(_Metric):
+    """Monotonic count per label combination."""
+
+    type_name = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def _samples(self) -> list:
+        return [[list(labels), value] for labels, value in self._values.items()]
+
+
+class Gauge(_Metric):
+    """
+    Current value per label combination, either set directly or read from a
+    callback at collection time (for state that lives elsewhere, like pools).
+    Across workers gauges are summed, or with `merge_mode="max"` the highest
+    value wins (for lags and ages, where a total means nothing).
+    """
+
+    type_name = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        callback: Optional[Callable[[], Dict[LabelValues, float]]] = None,
+        merge_mode: str = "sum",
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.merge_mode = merge_mode
+        self._values: Dict[LabelValues, float] = {}
+        self._callbacks: List[Callable[[], Dict[LabelValues, float]]] = []
+        if callback is not None:
+            self._callbacks.append(callback)
+
+    def set(self, value: float, *labels: str) -> None:
+        self._values[labels] = value
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def dec(self, *labels: str, amount: float = 1.0) -> None:
+        self.inc(*labels, amount=-amount)
+
+    def add_callback(self, callback: Callable[[], Dict[LabelValues, float]]) -> None:
+        self._callbacks.append(callback)
+
+    def snapshot(self) -> dict:
+        data = super().snapshot()
+        data["merge"] = self.merge_mode
+        return data
+
+    def _samples(self) -> list:
+        values = dict(self._values)
+        for callback in self._callbacks:
+            values.update(callback())
+        return [[list(labels), value] for labels, value in values.items()]
+
+
+class Histogram(_Metric):
+    """Bucketed observations (non-cumulative internally) with sum and count."""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [count per bucket..., count above the last bucket]
+        self._counts: Dict[LabelValues, List[int]] = {}
+        self._sums: Dict[LabelValues, float] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        counts = self._counts.get(labels)
+        if counts is None:
+            counts = self._counts[labels] = [0] * (len(self.buckets) + 1)
+            self._sums[labels] = 0.0
+        counts[bisect.bisect_left(self.buckets, value)] += 1
+        self._sums[labels] += value
+
+    def snapshot(self) -> dict:
+        data = super().snapshot()
+        data["buckets"] = list(self.buckets)
+        return data
+
+    def _samples(self) -> list:
+        return [
+            [list(labels), list(counts), self._sums[labels]]
+            for labels, counts in self._counts.items()
+        ]
+
+
+class MetricsRegistry:
+    """The metrics of one process, by name."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def _register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered.")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        callback: Optional[Callable[[], Dict[LabelValues, float]]] = None,
+        merge_mode: str = "sum",
+    ) -> Gauge:
+        return self._register(
+            Gauge(name, documentation, labelnames, callback, merge_mode)
+        )
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def snapshot(self) -> Dict[str, dict]:
+        """Current values of every metric, as JSON-serializable data."""
+        return {name: metric.snapshot() for name, metric in self._metrics.items()}
+
+
+def merge(snapshots: Iterable[Dict[str, dict]]) -> Dict[str, dict]:
+    """
+    Combine per-worker snapshots: counters, histograms and gauges are summed
+    per label combination, so gauges read as totals across the workers,
+    except gauges registered with merge_mode="max".
+    """
+    merged: Dict[str, dict] = {}
+    indexes: Dict[str, Dict[LabelValues, list]] = {}
+    for snapshot in snapshots:
+        for name, data in snapshot.items():
+            target = merged.get(name)
+            if target is None:
+                target = merged[name] = {**data, "samples": []}
+                indexes[name] = {}
+            elif target.get("buckets") != data.get("buckets"):
+                continue  # Bucket layout changed mid-deploy; keep the first
+            index = indexes[name]
+            for sample in data["samples"]:
+                labels = tuple(sample[0])
+                existing = index.get(labels)
+                if existing is None:
+                    copy = [sample[0], *_copy_values(sample[1:])]
+                    index[labels] = copy
+                    target["samples"].append(copy)
+                elif data["type"] == "histogram":
+                    existing[1] = [a + b for a, b in zip(existing[1], sample[1])]
+                    existing[2] += sample[2]
+                elif data.get("merge") == "max":
+                    existing[1] = max(existing[1], sample[1])
+                else:
+                    existing[1] += sample[1]
+    return merged
+
+
+def _copy_values(values: list) -> list:
+    return [list(value) if isinstance(value, list) else value for value in values]
+
+
+def subtract(snapshot: Dict[str, dict], baseline: Dict[str, dict]) -> Dict[str, dict]:
+    """`snapshot` less the counter and histogram values in `baseline`."""
+    result: Dict[str, dict] = {}
+    for name, data in snapshot.items():
+        base = baseline.get(name)
+        if base is None or data["type"] == "gauge":
+            result[name] = data
+            continue
+        base_samples = {tuple(sample[0]): sample for sample in base["samples"]}
+        samples = []
+        for sample in data["samples"]:
+            old = base_samples.get(tuple(sample[0]))
+            if old is None:
+                samples.append(sample)
+            elif data["type"] == "histogram":
+                counts = [a - b for a, b in zip(sample[1], old[1])]
+                samples.append([sample[0], counts, sample[2] - old[2]])
+            else:
+                samples.append([sample[0], sample[1] - old[1]])
+        result[name] = {**data, "samples": samples}
+    return result
+
+
+def _field(name: str, labels: Sequence[str], part: str) -> str:
+    return json.dumps([name, list(labels), part], separators=(",", ":"))
+
+
+def cumulative_fields(snapshot: Dict[str, dict]) -> Dict[str, float]:
+    """
+    The counters and histograms of a snapshot as one number per field, keyed
+    by `[name, labels, part]` in JSON. The part is "" for a counter, and a
+    bucket's upper bound or "sum" for a histogram. Gauges are left out.
+    """
+    fields: Dict[str, float] = {}
+    for name, data in snapshot.items():
+        if data["type"] == "counter":
+            for labels, value in data["samples"]:
+                fields[_field(name, labels, "")] = value
+        elif data["type"] == "histogram":
+            bounds = [*data["buckets"], math.inf]
+            for labels, counts, total in data["samples"]:
+                for bound, count in zip(bounds, counts):
+                    fields[_field(name, labels, _format_value(bound))] = count
+                fields[_field(name, labels, "sum")] = total
+    return fields
+
+
+def from_fields(
+    fields: Dict[str, float], template: Dict[str, dict]
+) -> Dict[str, dict]:
+    """
+    Rebuild a snapshot from `cumulative_fields()` output, taking types, help
+    and bucket layouts from `template`. Fields of metrics or buckets that no
+    longer exist are dropped.
+    """
+    indexes: Dict[str, Dict[LabelValues, list]] = {}
+    for field, value in fields.items():
+        name, labels, part = json.loads(field)
+        data = template.get(name)
+        if data is None:
+            continue
+        index = indexes.setdefault(name, {})
+        key = tuple(labels)
+        if data["type"] == "counter" and part == "":
+            index[key] = [labels, value]
+        elif data["type"] == "histogram":
+            parts = [_format_value(bound) for bound in [*data["buckets"], math.inf]]
+            sample = index.get(key)
+            if sample is None:
+                sample = index[key] = [labels, [0] * len(parts), 0.0]
+            if part == "sum":
+                sample[2] = value
+            elif part in parts:
+                sample[1][parts.index(part)] = int(value)
+    return {
+        name: {**template[name], "samples": list(index.values())}
+        for name, index in indexes.items()
+        if index
+    }
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{n}="{_escape(str(v))}"' for n, v in zip(names, values))
+    return "{" + pairs + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+def render(snapshot: Dict[str, dict]) -> str:
+    """A (possibly merged) snapshot in the Prometheus text format, version 0.0.4."""
+    lines: List[str] = []
+    for name, data in snapshot.items():
+        help_text = data["help"].replace("\\", "\\\\").replace("\n", "\\n")
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {data['type']}")
+        labelnames = data["labels"]
+        if data["type"] != "histogram":
+            for labels, value in data["samples"]:
+                formatted = _format_labels(labelnames, labels)
+                lines.append(f"{name}{formatted} {_format_value(value)}")
+            continue
+
+        bucket_names = [*labelnames, "le"]
+        bounds = [*data["buckets"], math.inf]
+        for labels, counts, total in data["samples"]:
+            cumulative = 0
+            for bound, count in zip(bounds, counts):
+                cumulative += count
+                formatted = _format_labels(
+                    bucket_names, [*labels, _format_value(bound)]
+                )
+                lines.append(f"{name}_bucket{formatted} {cumulative}")
+            formatted = _format_labels(labelnames, labels)
+            lines.append(f"{name}_sum{formatted} {_format_value(total)}")
+            lines.append(f"{name}_count{formatted} {cumulative}")
+    lines.append("")
+    return "\n".join(lines)
+
+
+# ---------- Application metrics ----------
+registry = MetricsRegistry()
+
+http_requests = registry.counter(
+    "http_requests_total",
+    "HTTP requests by method, route template and status code.",
+    ("method", "route", "status"),
+)
+http_request_duration = registry.histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by method and route template.",
+    ("method", "route"),
+)
+http_requests_in_progress = registry.gauge(
+    "http_requests_in_progress", "HTTP requests currently being served."
+)
+db_pool_connections = registry.gauge(
+    "db_pool_connections",
+    "Connections per database pool: size, checked_out, overflow and idle.",
+    ("pool", "state"),
+)
+db_pool_wait = registry.histogram(
+    "db_pool_wait_seconds",
+    "Time spent acquiring a connection from a database pool.",
+    ("pool",),
+)
+cache_requests = registry.counter(
+    "cache_requests_total",
+    "Cache lookups by schema and result (hit, miss or error).",
+    ("schema", "result"),
+)
+redis_command_duration = registry.histogram(
+    "redis_command_duration_seconds",
+    "Redis round trip latency by command (PIPELINE for pipelines).",
+    ("command",),
+    buckets=(0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.1, 0.5),
+)
+repository_call_duration = registry.histogram(
+    "repository_call_duration_seconds",
+    "Repository method latency (its _count is the call count).",
+    ("method",),
+)
+repository_errors = registry.counter(
+    "repository_errors_total",
+    "Repository method calls that raised, by method.",
+    ("method",),
+)
+password_hash_duration = registry.histogram(
+    "password_hash_duration_seconds",
+    "Time spent hashing or verifying a password on the hashing pool.",
+    ("operation",),
+)
+password_hash_wait = registry.histogram(
+    "password_hash_wait_seconds",
+    "Time a password hash waited for a free hashing thread.",
+    ("operation",),
+)
+password_hash_pending = registry.gauge(
+    "password_hash_pending", "Password hashes queued or running."
+)
+password_hash_rejections = registry.counter(
+    "password_hash_rejections_total",
+    "Password hashes rejected because the hashing queue was full.",
+    ("operation",),
+)
+rate_limit_rejections = registry.counter(
+    "rate_limit_rejections_total",
+    "Requests rejected by each rate limiter.",
+    ("limiter",),
+)
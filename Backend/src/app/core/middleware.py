@@ -0,0 +1,163 @@
+"""
+ASGI middleware.
+
+Kept as plain ASGI callables rather than BaseHTTPMiddleware so they add no
+extra task or response buffering per request.
+"""
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.requests import HTTPConnection
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.metrics import (
+    http_request_duration,
+    http_requests,
+    http_requests_in_progress,
+)
+from app.db.instrumentation import (
+    RequestQueryStats,
+    query_stats,
+    sql_instrumentation,
+)
+from app.db.replicas import (
+    WritePosition,
+    decode_write_cookie,
+    encode_write_cookie,
+    write_position,
+)
+
+
+class RateLimitHeadersMiddleware:
+    """
+    Adds X-RateLimit-* headers from the result the rate limit dependency left
+    on request.state. Applies to error responses too, since exception handlers
+    run inside this middleware.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                # request.state is backed by scope["state"]
+                result = scope.get("state", {}).get("rate_limit")
+                if result is not None:
+                    headers = MutableHeaders(scope=message)
+                    for name, value in result.headers().items():
+                        if name not in headers:
+                            headers[name] = value
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
+
+class ReadYourWritesMiddleware:
+    """
+    Carries the client's last write position between requests: reads it from
+    the write-position cookie for replica selection, and sets the cookie when
+    the request commits a write on the primary. Only installed with replicas.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        cookie = HTTPConnection(scope).cookies.get(settings.DB_WRITE_POSITION_COOKIE)
+        position = WritePosition(seen_lsn=decode_write_cookie(cookie))
+        token = write_position.set(position)
+
+        async def send_with_cookie(message: Message) -> None:
+            if (
+                message["type"] == "http.response.start"
+                and position.written_lsn is not None
+            ):
+                headers = MutableHeaders(scope=message)
+                headers.append("set-cookie", encode_write_cookie(position.written_lsn))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_cookie)
+        finally:
+            write_position.reset(token)
+
+
+class MetricsMiddleware:
+    """
+    Records request count, latency and concurrency. Requests are labelled by
+    route template (/products/{product_id}), not raw path, to keep the label
+    set bounded; paths no route matched share "unmatched".
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500  # Unless a response starts before an exception escapes
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        http_requests_in_progress.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - start
+            http_requests_in_progress.dec()
+            # The router leaves the matched route in the (shared) scope
+            route = scope.get("route")
+            template = getattr(route, "path", None) or "unmatched"
+            method = scope["method"]
+            http_request_duration.observe(elapsed, method, template)
+            http_requests.inc(method, template, str(status))
+
+
+class QueryStatsMiddleware:
+    """
+    Collects the SQL statements each request runs, reports likely N+1
+    patterns when it finishes and, outside production, returns the totals in
+    X-DB-* response headers.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestQueryStats(endpoint=f"{scope['method']} {scope['path']}")
+        token = query_stats.set(stats)
+        expose = settings.ENVIRONMENT != "production"
+
+        async def send_with_stats(message: Message) -> None:
+            if expose and message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                for name, value in stats.headers().items():
+                    headers[name] = value
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_stats)
+        finally:
+            query_stats.reset(token)
+            sql_instrumentation.finish(stats)
@@ -0,0 +1,271 @@
+"""
+Local mirror of token revocations.
+
+Redis stays the source of truth: a `revoked_token:{jti}` key per revoked token
+and a hash of per-user `tokens_valid_from` watermarks. Every revocation is
+written together with an entry on a Redis Stream, in one MULTI, and each
+worker follows the stream to keep an in-process copy, so checking a token is
+a dict lookup instead of an EXISTS per request.
+
+The copy is only trusted while it is fresh: the last successful read of the
+stream started no more than `REVOCATION_MAX_STALENESS` seconds ago, and the
+copy holds every revoked token (it stops being complete past
+`REVOCATION_FILTER_MAX_ENTRIES`). Otherwise an unknown token is reported as
+unknown and callers fall back to asking Redis. A token found in the copy is
+always revoked, fresh or not.
+
+On startup, and when a reconnect finds that stream entries it never read were
+trimmed, the copy is rebuilt from the keys and the watermark hash.
+"""
+import asyncio
+import logging
+import time
+from typing import Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.metrics import registry
+from app.db.redis_conn import redis_client
+
+logger = logging.getLogger(__name__)
+
+REVOKED_KEY_PREFIX = "revoked_token:"
+VALID_FROM_KEY = "auth:tokens_valid_from"
+
+
+def revoked_key(jti: str) -> str:
+    return f"{REVOKED_KEY_PREFIX}{jti}"
+
+
+def _stream_id(entry_id: str) -> Tuple[int, int]:
+    ms, _, seq = entry_id.partition("-")
+    return int(ms), int(seq or 0)
+
+
+class RevocationFilter:
+    """Per-worker copy of revoked JTIs and per-user watermarks."""
+
+    def __init__(self):
+        self.stream = settings.REVOCATION_STREAM
+        self.max_staleness = settings.REVOCATION_MAX_STALENESS
+        self.max_entries = settings.REVOCATION_FILTER_MAX_ENTRIES
+        # Nothing issued longer ago than this can still be valid
+        self.max_token_lifetime = settings.REFRESH_TOKEN_EXPIRE_DAYS * 86400
+        # Wake up well within the staleness bound even when nothing happens
+        self._block_ms = int(min(5.0, self.max_staleness / 2) * 1000)
+
+        # jti -> token expiry (epoch seconds)
+        self._revoked: Dict[str, float] = {}
+        # user id -> tokens issued before this (epoch seconds) are revoked
+        self._valid_from: Dict[str, float] = {}
+        self._complete = False
+        self._last_id: Optional[str] = None
+        self._check_gap = False
+        # Monotonic start of the last read that saw the stream up to date
+        self._synced_at: Optional[float] = None
+        self._purged_at = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    # ---------- Lookups ----------
+    @property
+    def fresh(self) -> bool:
+        return (
+            self._synced_at is not None
+            and time.monotonic() - self._synced_at <= self.max_staleness
+        )
+
+    def is_revoked(self, jti: str) -> Optional[bool]:
+        """True or False from the local copy; None when only Redis can tell."""
+        if jti in self._revoked:
+            return True
+        if self._complete and self.fresh:
+            return False
+        return None
+
+    def valid_from(self, user_id: str) -> Optional[float]:
+        """The user's tokens_valid_from watermark, if one was published."""
+        return self._valid_from.get(user_id)
+
+    def entry_counts(self) -> Dict[Tuple[str, ...], float]:
+        return {("tokens",): len(self._revoked), ("users",): len(self._valid_from)}
+
+    def sync_lag(self) -> Dict[Tuple[str, ...], float]:
+        """Seconds since the copy was last known up to date (inf before that)."""
+        if self._synced_at is None:
+            return {(): float("inf")}
+        return {(): time.monotonic() - self._synced_at}
+
+    # ---------- Publishing ----------
+    async def revoke(self, jti: str, exp: int, reason: str) -> None:
+        """Revoke a token until `exp` (epoch seconds), in Redis and the stream."""
+        ttl = int(exp - time.time())
+        if ttl <= 0:
+            return
+        async with redis_client.pipeline(transaction=True) as pipe:
+            pipe.set(revoked_key(jti), reason, ex=ttl)
+            pipe.xadd(
+                self.stream,
+                {"jti": jti, "exp": str(int(exp))},
+                maxlen=settings.REVOCATION_STREAM_MAXLEN,
+                approximate=True,
+            )
+            await pipe.execute()
+        self._revoked[jti] = float(exp)
+
+    async def revoke_user(self, user_id: str, valid_from: float) -> None:
+        """Revoke every token of a user issued before `valid_from`."""
+        async with redis_client.pipeline(transaction=True) as pipe:
+            pipe.hset(VALID_FROM_KEY, user_id, repr(valid_from))
+            pipe.xadd(
+                self.stream,
+                {"user": user_id, "valid_from": repr(valid_from)},
+                maxlen=settings.REVOCATION_STREAM_MAXLEN,
+                approximate=True,
+            )
+            await pipe.execute()
+        self._set_valid_from(user_id, valid_from)
+
+    def _set_valid_from(self, user_id: str, valid_from: float) -> None:
+        self._valid_from[user_id] = max(valid_from, self._valid_from.get(user_id, 0))
+
+    def _apply(self, fields: Dict[str, str]) -> None:
+        if "jti" in fields:
+            if len(self._revoked) >= self.max_entries:
+                self._complete = False
+                return
+            self._revoked[fields["jti"]] = float(fields["exp"])
+        elif "user" in fields:
+            self._set_valid_from(fields["user"], float(fields["valid_from"]))
+
+    # ---------- Sync ----------
+    async def _resync(self) -> None:
+        """Rebuild the copy from Redis, then follow the stream from here on."""
+        started = time.monotonic()
+        newest = await redis_client.xrevrange(self.stream, count=1)
+        last_id = newest[0][0] if newest else "0-0"
+
+        revoked: Dict[str, float] = {}
+        complete = True
+        batch: List[str] = []
+        async for key in redis_client.scan_iter(
+            match=f"{REVOKED_KEY_PREFIX}*", count=1000
+        ):
+            batch.append(key)
+            if len(batch) >= 500:
+                await self._load_revoked(batch, revoked)
+                batch = []
+            if len(revoked) >= self.max_entries:
+                complete = False
+                break
+        if batch and complete:
+            await self._load_revoked(batch, revoked)
+
+        cutoff = time.time() - self.max_token_lifetime
+        valid_from: Dict[str, float] = {}
+        expired: List[str] = []
+        for user_id, value in (await redis_client.hgetall(VALID_FROM_KEY)).items():
+            if float(value) < cutoff:
+                expired.append(user_id)
+            else:
+                valid_from[user_id] = float(value)
+        if expired:
+            await redis_client.hdel(VALID_FROM_KEY, *expired)
+
+        self._revoked = revoked
+        self._valid_from = valid_from
+        self._complete = complete
+        self._last_id = last_id
+        self._synced_at = started
+        logger.info(
+            f"Revocation filter loaded: {len(revoked)} tokens, "
+            f"{len(valid_from)} user watermarks"
+            + ("" if complete else " (incomplete, over the entry limit)")
+        )
+
+    async def _load_revoked(self, keys: List[str], into: Dict[str, float]) -> None:
+        async with redis_client.pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.pttl(key)
+            ttls = await pipe.execute()
+        now = time.time()
+        for key, ttl in zip(keys, ttls):
+            if ttl == -2:
+                continue  # Expired since the scan
+            expires = now + ttl / 1000 if ttl > 0 else now + self.max_token_lifetime
+            into[key[len(REVOKED_KEY_PREFIX) :]] = expires
+
+    async def _catch_up(self) -> None:
+        """After an outage, resync if entries we never read were trimmed away."""
+        if self._last_id is not None:
+            oldest = await redis_client.xrange(self.stream, count=1)
+            if not oldest or _stream_id(oldest[0][0]) <= _stream_id(self._last_id):
+                self._check_gap = False
+                return
+        await self._resync()
+        self._check_gap = False
+
+    async def _read(self) -> None:
+        started = time.monotonic()
+        reply = await redis_client.xread(
+            {self.stream: self._last_id}, count=1000, block=self._block_ms
+        )
+        for _stream, entries in reply or []:
+            for entry_id, fields in entries:
+                self._apply(fields)
+                self._last_id = entry_id
+        self._synced_at = started
+
+    def _purge(self) -> None:
+        now = time.time()
+        self._revoked = {jti: exp for jti, exp in self._revoked.items() if exp > now}
+        cutoff = now - self.max_token_lifetime
+        self._valid_from = {
+            user_id: ts for user_id, ts in self._valid_from.items() if ts >= cutoff
+        }
+        self._purged_at = now
+
+    async def _sync_forever(self) -> None:
+        while True:
+            try:
+                if self._last_id is None or self._check_gap:
+                    await self._catch_up()
+                await self._read()
+                if time.time() - self._purged_at > 60:
+                    self._purge()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.warning("Revocation stream sync failed.", exc_info=True)
+                self._check_gap = True
+                await asyncio.sleep(1)
+
+    async def start(self) -> None:
+        """Load the copy and follow the stream (call on startup)."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._sync_forever())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+
+revocation_filter = RevocationFilter()
+
+registry.gauge(
+    "revocation_filter_entries",
+    "Revoked tokens and user watermarks held by the local revocation filter.",
+    ("kind",),
+    callback=revocation_filter.entry_counts,
+    merge_mode="max",
+)
+registry.gauge(
+    "revocation_filter_lag_seconds",
+    "Time since the revocation filter last caught up with the stream.",
+    callback=revocation_filter.sync_lag,
+    merge_mode="max",
+)
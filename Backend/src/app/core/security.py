@@ -1,9 +1,13 @@
+import asyncio
+import hashlib
 import logging
 import secrets
+import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from enum import Enum
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Union
 
 from jose import jwt, JWTError
 from passlib.context import CryptContext
@@ -12,12 +16,22 @@ from app.core.config import settings
 from app.core.exceptions import (
     InternalServerError,
     InvalidToken,
+    ServiceUnavailable,
     TokenExpired,
     TokenRevoked,
     ValidationError,
     TokenTypeInvalid,
 )
+from app.core.metrics import (
+    cache_requests,
+    password_hash_duration,
+    password_hash_pending,
+    password_hash_rejections,
+    password_hash_wait,
+)
+from app.core.revocation import revocation_filter, revoked_key
 from app.db.redis_conn import redis_client
+from app.utils.ttl_cache import TTLCache
 
 
 # --- Setup ---
@@ -74,6 +88,58 @@ SecurityConfig.validate()
 
 
 # ---- Password Management ----
+ARGON2_MEMORY_COST_KIB = 51200  # ~50MB per hash
+
+
+class PasswordHashPool:
+    """
+    Runs password hashing off the event loop on a few dedicated threads
+    (argon2 releases the GIL). The thread count bounds CPU and memory use; the
+    pending limit turns a login burst into fast 503s instead of a queue that
+    grows until requests time out.
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="password-hash"
+        )
+        self._pending = 0
+
+    def _release(self) -> None:
+        self._pending -= 1
+        password_hash_pending.set(self._pending)
+
+    async def run(self, operation: str, func: Callable[..., Any], *args: Any) -> Any:
+        if self._pending >= self.max_pending:
+            password_hash_rejections.inc(operation)
+            logger.warning(f"Password hashing queue full, rejecting {operation}.")
+            raise ServiceUnavailable(
+                detail="Too many sign-in requests right now. Please try again.",
+                service="password_hashing",
+                retry_after=1,
+            )
+
+        loop = asyncio.get_running_loop()
+        submitted = time.perf_counter()
+
+        def timed():
+            started = time.perf_counter()
+            return started, func(*args), time.perf_counter()
+
+        future = self._executor.submit(timed)
+        self._pending += 1
+        password_hash_pending.set(self._pending)
+        # Released when the hash really finishes, even if the caller went away
+        future.add_done_callback(lambda _: loop.call_soon_threadsafe(self._release))
+
+        started, result, finished = await asyncio.wrap_future(future)
+        password_hash_wait.observe(started - submitted, operation)
+        password_hash_duration.observe(finished - started, operation)
+        return result
+
+
 class PasswordManager:
     """Encapsulates all password hashing and verification logic (Argon2 preferred)."""
 
@@ -81,10 +147,21 @@ class PasswordManager:
         schemes=["argon2", "bcrypt"],
         deprecated="auto",
         argon2__time_cost=2,
-        argon2__memory_cost=51200,  # ~50MB
+        argon2__memory_cost=ARGON2_MEMORY_COST_KIB,
         argon2__parallelism=2,
     )
 
+    pool = PasswordHashPool(
+        workers=max(
+            1,
+            min(
+                settings.PASSWORD_HASH_WORKERS,
+                settings.PASSWORD_HASH_MEMORY_MB * 1024 // ARGON2_MEMORY_COST_KIB,
+            ),
+        ),
+        max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+    )
+
     @classmethod
     def hash_password(cls, password: str) -> str:
         """Hash a plain-text password."""
@@ -105,6 +182,20 @@ class PasswordManager:
             )
             return False
 
+    @classmethod
+    async def hash_password_async(cls, password: str) -> str:
+        """hash_password on the hashing pool; raises ServiceUnavailable if full."""
+        return await cls.pool.run("hash", cls.hash_password, password)
+
+    @classmethod
+    async def verify_password_async(
+        cls, plain_password: str, hashed_password: str
+    ) -> bool:
+        """verify_password on the hashing pool; raises ServiceUnavailable if full."""
+        return await cls.pool.run(
+            "verify", cls.verify_password, plain_password, hashed_password
+        )
+
 
 # ---- Token Management ----
 class TokenManager:
@@ -112,6 +203,18 @@ class TokenManager:
 
     config = SecurityConfig
 
+    def __init__(self):
+        # sha256(access token) -> its verified claims, kept until it expires.
+        # Revocation is checked by the callers on every use, cached or not.
+        self._verified_claims: TTLCache[Dict[str, Any]] = TTLCache(
+            maxsize=settings.TOKEN_CLAIMS_CACHE_SIZE,
+            ttl=self.config.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+        )
+
+    @staticmethod
+    def _token_digest(token: str) -> bytes:
+        return hashlib.sha256(token.encode("utf-8")).digest()
+
     @staticmethod
     def _now_utc() -> datetime:
         return datetime.now(timezone.utc)
@@ -171,13 +274,34 @@ class TokenManager:
             "token_type": "bearer",
         }
 
-    async def verify_token(
-        self, token: str, expected_type: TokenType
-    ) -> Dict[str, Any]:
-        """Verify and decode a JWT; validate iss/aud/exp/nbf; check type and blacklist."""
+    def decode_token(self, token: str, expected_type: TokenType) -> Dict[str, Any]:
+        """
+        Decode a JWT and validate iss/aud/exp/nbf and type; no Redis access.
+        Access tokens already verified by this worker are answered from the
+        claims cache until they expire.
+        """
         if not token:
             raise InvalidToken("Token cannot be empty.")
-
+        if expected_type != TokenType.ACCESS:
+            return self._decode_token(token, expected_type)
+
+        digest = self._token_digest(token)
+        cached = self._verified_claims.get(digest)
+        if cached is not None and cached.get("type") == expected_type.value:
+            cache_requests.inc("token_claims", "hit")
+            return dict(cached)
+        cache_requests.inc("token_claims", "miss")
+
+        payload = self._decode_token(token, expected_type)
+        exp = payload.get("exp")
+        if isinstance(exp, (int, float)):
+            # Without the leeway, so a cached token never outlives a fresh check
+            remaining = exp - time.time()
+            if remaining > 0:
+                self._verified_claims.set(digest, dict(payload), ttl=remaining)
+        return payload
+
+    def _decode_token(self, token: str, expected_type: TokenType) -> Dict[str, Any]:
         try:
             payload = jwt.decode(
                 token,
@@ -196,12 +320,8 @@ class TokenManager:
                     received=token_type,
                 )
 
-            if self.config.ENABLE_TOKEN_BLACKLIST:
-                jti = payload.get("jti")
-                if not jti:
-                    raise InvalidToken("Token is missing the required 'jti' claim.")
-                if await self.is_token_revoked(jti):
-                    raise TokenRevoked()
+            if self.config.ENABLE_TOKEN_BLACKLIST and not payload.get("jti"):
+                raise InvalidToken("Token is missing the required 'jti' claim.")
 
             return payload
 
@@ -218,6 +338,21 @@ class TokenManager:
             logger.warning(f"Token decode failed with an unexpected error: {e}")
             raise InvalidToken("Token is invalid or malformed.") from e
 
+    async def verify_token(
+        self, token: str, expected_type: TokenType
+    ) -> Dict[str, Any]:
+        """Verify and decode a JWT; validate iss/aud/exp/nbf; check type and blacklist."""
+        payload = self.decode_token(token, expected_type)
+        if self.config.ENABLE_TOKEN_BLACKLIST and await self.is_token_revoked(
+            payload["jti"]
+        ):
+            raise TokenRevoked()
+        return payload
+
+    @staticmethod
+    def revoked_key(jti: str) -> str:
+        return revoked_key(jti)
+
     # ---- Blacklist operations ----
     async def revoke_token(self, token: str, reason: str = "Revoked") -> bool:
         """Revoke a token by extracting its JTI and calculating TTL in Redis."""
@@ -253,8 +388,8 @@ class TokenManager:
             if remaining_time <= 0:
                 return True  # Already expired
 
-            key = f"revoked_token:{jti}"
-            await redis_client.set(key, reason, ex=remaining_time)
+            await revocation_filter.revoke(jti, exp, reason)
+            self._verified_claims.pop(self._token_digest(token))
             logger.info(f"Token revoked: {jti}")
             return True
         except Exception:
@@ -277,18 +412,38 @@ class TokenManager:
             remaining_time = exp_ts - self._ts(self._now_utc())
             if remaining_time <= 0:
                 return True
-            key = f"revoked_token:{jti}"
-            await redis_client.set(key, reason, ex=remaining_time)
+            await revocation_filter.revoke(jti, exp_ts, reason)
             return True
         except Exception:
             logger.error("Failed to revoke token by JTI.", exc_info=True)
             return False
 
+    async def revoke_user_tokens(
+        self, user_id: Union[str, uuid.UUID], valid_from: datetime
+    ) -> bool:
+        """
+        Publish a user's tokens_valid_from watermark, so every worker rejects
+        their older tokens without waiting for its principal cache to expire.
+        """
+        try:
+            await revocation_filter.revoke_user(str(user_id), valid_from.timestamp())
+            return True
+        except Exception:
+            logger.error("Failed to publish token watermark.", exc_info=True)
+            return False
+
     async def is_token_revoked(self, jti: str) -> bool:
-        """Check if a token's JTI is blacklisted."""
+        """
+        Check if a token's JTI is blacklisted: locally while the revocation
+        filter is in sync, otherwise in Redis.
+        """
         if not self.config.ENABLE_TOKEN_BLACKLIST:
             return False
 
+        revoked = revocation_filter.is_revoked(jti)
+        if revoked is not None:
+            return revoked
+
         if redis_client is None:
             msg = "Token validation service unavailable"
             logger.error("Redis client is None in is_token_revoked.")
@@ -298,7 +453,7 @@ class TokenManager:
             return False
 
         try:
-            key = f"revoked_token:{jti}"
+            key = self.revoked_key(jti)
             exists = await redis_client.exists(key)
             return bool(exists)
         except Exception:
@@ -1,14 +1,15 @@
 import logging
 import uuid
-from typing import Optional, List, Dict, Any, TypeVar, Generic, Tuple
+from typing import Optional, Dict, Any, TypeVar, Generic
 from abc import ABC, abstractmethod
 from datetime import datetime, timezone
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from sqlmodel import select, func, and_, delete, update, or_
+from sqlmodel import select, and_, delete, update, or_
 
 from app.core.exception_utils import handle_exceptions
 from app.core.exceptions import InternalServerError
+from app.crud.pagination import CountStrategy, Page, paginate
 
 from app.models.address_model import Address
 
@@ -76,7 +77,8 @@ class AddressRepository(BaseRepository[Address]):
         filters: Optional[Dict[str, Any]] = None,
         order_by: str = "created_at",
         order_desc: bool = True,
-    ) -> Tuple[List[Address], int]:
+        count_strategy: CountStrategy = CountStrategy.EXACT,
+    ) -> Page[Address]:
         """Get multiple users with filtering and pagination."""
         query = select(self.model).where(self.model.user_id == user_id)
 
@@ -84,19 +86,13 @@ class AddressRepository(BaseRepository[Address]):
         if filters:
             query = self._apply_filters(query, filters)
 
-        # Count total
-        count_query = select(func.count()).select_from(query.subquery())
-        total = (await db.execute(count_query)).scalar_one()
-
         # Apply ordering
         query = self._apply_ordering(query, order_by, order_desc)
 
-        # Apply pagination
-        paginated_query = query.offset(skip).limit(limit)
-        result = await db.execute(paginated_query)
-        addresses = result.scalars().all()
-
-        return addresses, total
+        # Page and total in a single statement
+        return await paginate(
+            db, query, skip=skip, limit=limit, count_strategy=count_strategy
+        )
 
     @handle_exceptions(
         default_exception=InternalServerError,
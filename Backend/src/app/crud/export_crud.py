@@ -0,0 +1,193 @@
+"""
+Queries for the admin data exports.
+
+Every export is a single statement read through a server-side cursor
+(`yield_per`), ordered by primary key, so a full export is one pass over the
+table with memory bounded by the batch size, not a series of OFFSET pages.
+NDJSON documents are rendered by Postgres; CSV rows come back as plain columns.
+"""
+import logging
+from typing import AsyncIterator, List, Sequence, Tuple
+
+from sqlalchemy import Enum as SAEnum
+from sqlalchemy import Text, cast, func, literal_column, select
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.engine import Row
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.crud.product_crud import product_repository
+from app.models.order_model import Order, OrderItem
+from app.models.product_model import Product, ProductImage, ProductVariant
+from app.models.user_model import User
+from app.schemas.export_schema import ExportDataset, ExportFormat
+
+logger = logging.getLogger(__name__)
+
+
+def _json_object(columns: Sequence[Tuple[str, object]]):
+    """json_build_object over (name, expression) pairs, enums as their values."""
+    arguments = []
+    for name, expression in columns:
+        # Enums are stored by name ('ACTIVE'); the API uses their values
+        if isinstance(getattr(expression, "type", None), SAEnum):
+            expression = func.lower(cast(expression, Text))
+        arguments.extend((name, expression))
+    return func.json_build_object(*arguments)
+
+
+class ExportRepository:
+    """Read-only, streaming queries backing the export endpoints."""
+
+    def __init__(self):
+        self._logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+
+    # ---------- Column sets ----------
+    def _user_columns(self) -> List[Tuple[str, object]]:
+        # Never hashed_password or token state
+        return [
+            ("id", User.id),
+            ("name", User.name),
+            ("email", User.email),
+            ("role", User.role),
+            ("is_active", User.is_active),
+            ("created_at", User.created_at),
+            ("updated_at", User.updated_at),
+        ]
+
+    def _order_columns(self) -> List[Tuple[str, object]]:
+        return [
+            ("id", Order.id),
+            ("user_id", Order.user_id),
+            ("status", Order.status),
+            ("total_amount_in_cents", Order.total_amount_in_cents),
+            ("address_id", Order.address_id),
+            ("promotion_id", Order.promotion_id),
+            ("created_at", Order.created_at),
+        ]
+
+    def _order_item_columns(self) -> List[Tuple[str, object]]:
+        return [
+            ("id", OrderItem.id),
+            ("product_variant_id", OrderItem.product_variant_id),
+            ("quantity", OrderItem.quantity),
+            ("price_at_purchase_in_cents", OrderItem.price_at_purchase_in_cents),
+        ]
+
+    def _product_csv_columns(self) -> List[Tuple[str, object]]:
+        # The product import's CSV layout, plus ids and timestamps
+        image_urls = (
+            select(
+                func.string_agg(
+                    ProductImage.url,
+                    aggregate_order_by(literal_column("'|'"), ProductImage.order_index),
+                )
+            )
+            .where(ProductImage.product_id == Product.id)
+            .scalar_subquery()
+        )
+        return [
+            ("product_id", Product.id),
+            ("name", Product.name),
+            ("description", Product.description),
+            ("brand", Product.brand),
+            ("status", Product.status),
+            ("gender", Product.gender),
+            ("category_id", Product.category_id),
+            ("variant_id", ProductVariant.id),
+            ("sku", ProductVariant.sku),
+            ("price_in_cents", ProductVariant.price_in_cents),
+            ("discount_price_in_cents", ProductVariant.discount_price_in_cents),
+            ("stock", ProductVariant.stock),
+            ("size_id", ProductVariant.size_id),
+            ("color_id", ProductVariant.color_id),
+            ("image_urls", image_urls),
+            ("created_at", Product.created_at),
+            ("updated_at", Product.updated_at),
+        ]
+
+    # ---------- Queries ----------
+    def query(self, dataset: ExportDataset, export_format: ExportFormat):
+        """
+        The export statement for a dataset. NDJSON queries select one text
+        column holding a JSON document per row.
+        """
+        as_json = export_format == ExportFormat.NDJSON
+
+        if dataset == ExportDataset.PRODUCTS:
+            if as_json:
+                return select(product_repository.product_document()).order_by(
+                    Product.id
+                )
+            return (
+                select(*self._labeled(self._product_csv_columns()))
+                .select_from(Product)
+                .outerjoin(ProductVariant, ProductVariant.product_id == Product.id)
+                .order_by(Product.id, ProductVariant.sku)
+            )
+
+        if dataset == ExportDataset.USERS:
+            columns = self._user_columns()
+            if as_json:
+                return select(self._document(columns)).order_by(User.id)
+            return select(*self._labeled(columns)).order_by(User.id)
+
+        if as_json:
+            items = (
+                select(
+                    func.coalesce(
+                        func.json_agg(
+                            aggregate_order_by(
+                                _json_object(self._order_item_columns()), OrderItem.id
+                            )
+                        ),
+                        literal_column("'[]'::json"),
+                    )
+                )
+                .where(OrderItem.order_id == Order.id)
+                .scalar_subquery()
+            )
+            document = self._document(self._order_columns() + [("items", items)])
+            return select(document).order_by(Order.id)
+
+        item_columns = [
+            (f"item_{name}" if name == "id" else name, expression)
+            for name, expression in self._order_item_columns()
+        ]
+        return (
+            select(*self._labeled(self._order_columns() + item_columns))
+            .select_from(Order)
+            .outerjoin(OrderItem, OrderItem.order_id == Order.id)
+            .order_by(Order.id, OrderItem.id)
+        )
+
+    def csv_header(self, dataset: ExportDataset) -> List[str]:
+        """Column names of the CSV export of a dataset."""
+        return list(self.query(dataset, ExportFormat.CSV).selected_columns.keys())
+
+    def _labeled(self, columns: Sequence[Tuple[str, object]]):
+        return [expression.label(name) for name, expression in columns]
+
+    def _document(self, columns: Sequence[Tuple[str, object]]):
+        return cast(_json_object(columns), Text).label("document")
+
+    async def stream(
+        self,
+        db: AsyncSession,
+        *,
+        dataset: ExportDataset,
+        export_format: ExportFormat,
+        batch_size: int,
+    ) -> AsyncIterator[Sequence[Row]]:
+        """
+        Yield the export in batches of up to `batch_size` rows from a
+        server-side cursor. The session must stay open while iterating.
+        """
+        query = self.query(dataset, export_format).execution_options(
+            yield_per=batch_size
+        )
+        result = await db.stream(query)
+        async for partition in result.partitions():
+            yield partition
+
+
+export_repository = ExportRepository()
@@ -0,0 +1,151 @@
+"""
+Shared pagination engine for repository listings.
+
+Every list endpoint used to run `SELECT count(*) FROM (<query>)` and then the
+page query, i.e. two scans of the same filtered set. `paginate` folds the
+total into the page statement (or skips/estimates it) depending on the
+requested CountStrategy.
+"""
+import json
+import logging
+from enum import Enum
+from typing import Any, Dict, Generic, List, Optional, TypeVar
+
+from sqlalchemy import func, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class CountStrategy(str, Enum):
+    """How a listing should compute its `total`."""
+
+    # COUNT(*) OVER() in the page statement itself - one round trip
+    EXACT = "exact"
+    # Planner row estimate (EXPLAIN) - cheap, approximate on large tables
+    ESTIMATED = "estimated"
+    # No total at all; only a has_more flag from fetching limit + 1 rows
+    NONE = "none"
+
+
+class Page(Generic[T]):
+    """A page of repository results plus whatever count information was requested."""
+
+    __slots__ = ("items", "total", "has_more")
+
+    def __init__(self, items: List[T], total: Optional[int], has_more: bool):
+        self.items = items
+        self.total = total
+        self.has_more = has_more
+
+    def metadata(self, *, skip: int, limit: int) -> Dict[str, Any]:
+        """Pagination fields shared by every *ListResponse schema."""
+        pages = None
+        if self.total is not None:
+            pages = (self.total + limit - 1) // limit  # Ceiling division
+        return {
+            "total": self.total,
+            "page": (skip // limit) + 1,
+            "pages": pages,
+            "size": limit,
+            "has_more": self.has_more,
+        }
+
+
+async def exact_count(db: AsyncSession, query) -> int:
+    """Classic `SELECT count(*) FROM (<query>)`; only used as a fallback."""
+    count_query = select(func.count()).select_from(query.order_by(None).subquery())
+    return (await db.execute(count_query)).scalar_one()
+
+
+async def estimated_count(db: AsyncSession, query) -> int:
+    """
+    Read the planner's row estimate for `query` via EXPLAIN (no execution).
+
+    Falls back to an exact count if the statement cannot be rendered with
+    literal binds or the plan cannot be read. The EXPLAIN runs in a savepoint,
+    so a server-side failure doesn't abort the transaction the fallback uses.
+    """
+    try:
+        compiled = query.order_by(None).compile(
+            dialect=db.bind.dialect, compile_kwargs={"literal_binds": True}
+        )
+        conn = await db.connection()
+        async with conn.begin_nested():
+            result = await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}")
+            plan = result.scalar_one()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+    except Exception:
+        logger.warning(
+            "Planner estimate unavailable; falling back to exact count.",
+            exc_info=True,
+        )
+        return await exact_count(db, query)
+
+
+async def paginate(
+    db: AsyncSession,
+    query,
+    *,
+    skip: int = 0,
+    limit: int = 100,
+    count_strategy: CountStrategy = CountStrategy.EXACT,
+    count_query=None,
+) -> Page:
+    """
+    Execute an ordered ORM `select(Model)` as a single page.
+
+    Args:
+        db: Database session
+        query: Filtered and ordered select whose first column is the entity
+        skip: Rows to skip (use 0 with keyset predicates)
+        limit: Page size
+        count_strategy: How to compute the total
+        count_query: Query to count instead of `query`, e.g. the listing
+            without its keyset predicate. Forces a separate count for EXACT.
+    """
+    if count_strategy == CountStrategy.EXACT and count_query is None:
+        # The window aggregate is evaluated before OFFSET/LIMIT, so every row
+        # of the page carries the size of the whole filtered set.
+        stmt = (
+            query.add_columns(func.count().over().label("total_count"))
+            .offset(skip)
+            .limit(limit)
+        )
+        rows = (await db.execute(stmt)).all()
+        items = [row[0] for row in rows]
+
+        if rows:
+            total = rows[0].total_count
+        elif skip == 0:
+            total = 0
+        else:
+            # Page past the end carries no window value; count explicitly
+            total = await exact_count(db, query)
+
+        return Page(items=items, total=total, has_more=skip + len(items) < total)
+
+    # Fetch one extra row so we know whether another page exists
+    result = await db.execute(query.offset(skip).limit(limit + 1))
+    items = list(result.scalars().all())
+    has_more = len(items) > limit
+    items = items[:limit]
+
+    total: Optional[int] = None
+    if count_strategy == CountStrategy.EXACT:
+        total = await exact_count(db, count_query)
+    elif count_strategy == CountStrategy.ESTIMATED:
+        if not has_more and count_query is None:
+            # Reached the end of the set: the total is known exactly
+            total = skip + len(items)
+        else:
+            estimate = await estimated_count(
+                db, count_query if count_query is not None else query
+            )
+            total = max(estimate, skip + len(items) + (1 if has_more else 0))
+
+    return Page(items=items, total=total, has_more=has_more)
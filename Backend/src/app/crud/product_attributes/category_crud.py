@@ -1,14 +1,15 @@
 import logging
 import uuid
-from typing import Optional, List, Dict, Any, TypeVar, Generic, Tuple
+from typing import Optional, Dict, Any, TypeVar, Generic
 from abc import ABC, abstractmethod
 from datetime import datetime, timezone
 
 from sqlmodel.ext.asyncio.session import AsyncSession
-from sqlmodel import select, func, and_, or_, delete
+from sqlmodel import select, and_, or_, delete
 
 from app.core.exception_utils import handle_exceptions
 from app.core.exceptions import InternalServerError
+from app.crud.pagination import CountStrategy, Page, paginate
 from app.models.product_model import Category
 
 logger = logging.getLogger(__name__)
@@ -93,7 +94,8 @@ class CategoryRepository(BaseRepository[Category]):
         skip: int = 0,
         filters: Optional[Dict[str, Any]] = None,
         limit: int = 100,
-    ) -> Tuple[List[Category], int]:
+        count_strategy: CountStrategy = CountStrategy.EXACT,
+    ) -> Page[Category]:
         """Get multiple Categories with filtering and pagination."""
 
         query = select(self.model)
@@ -102,16 +104,13 @@ class CategoryRepository(BaseRepository[Category]):
         if filters:
             query = self._apply_filters(query, filters)
 
-        # Count total
-        count_query = select(func.count()).select_from(query.subquery())
-        total = (await db.execute(count_query)).scalar_one()
+        # Stable order so OFFSET pages don't overlap
+        query = query.order_by(self.model.name.asc(), self.model.id.asc())
 
-        # Apply pagination
-        paginated_query = query.offset(skip).limit(limit)
-        result = await db.execute(paginated_query)
-        categories = result.scalars().all()
-
-        return categories, total
+        # Page and total in a single statement
+        return await paginate(
+            db, query, skip=skip, limit=limit, count_strategy=count_strategy
+        )
 
     @handle_exceptions(
         default_exception=InternalServerError,
@@ -1,27 +1,48 @@
 import logging
 import uuid
-from typing import Optional, List, Dict, Any, TypeVar, Generic, Tuple
+from typing import Optional, List, Dict, Any, TypeVar, Generic, Tuple, Union
 from abc import ABC, abstractmethod
 from datetime import datetime, timezone
 
 from sqlmodel.ext.asyncio.session import AsyncSession
-from sqlalchemy.orm import selectinload
-from sqlmodel import select, func, and_, or_, delete
+from sqlalchemy.orm import aliased, selectinload
+from sqlalchemy import (
+    Text,
+    any_,
+    cast,
+    distinct,
+    exists,
+    func,
+    insert,
+    literal_column,
+    nulls_last,
+    tuple_,
+)
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlmodel import select, and_, or_, delete, update
 
 from app.core.exception_utils import handle_exceptions
 from app.core.exceptions import InternalServerError
+from app.crud.pagination import CountStrategy, Page, paginate
+from app.crud.search import RELEVANCE, product_search_condition, product_search_rank
 
 from app.models.product_model import (
+    Category,
+    Color,
     Product,
     ProductImage,
     ProductVariant,
     ProductStatus,
+    Size,
 )
 
 logger = logging.getLogger(__name__)
 
 T = TypeVar("T")
 
+# order_by value that sorts by the lowest effective variant price
+PRICE_ORDER = "price"
+
 
 class BaseRepository(ABC, Generic[T]):
     """Abstract base repository providing consistent interface for database operations."""
@@ -78,6 +99,131 @@ class ProductRepository(BaseRepository[Product]):
         result = await db.execute(statement)
         return result.scalar_one_or_none()
 
+    @handle_exceptions(
+        default_exception=InternalServerError,
+        message="An unexpected database error occurred.",
+    )
+    async def get_by_ids(
+        self, db: AsyncSession, *, ids: List[uuid.UUID]
+    ) -> List[Product]:
+        """get many products by ID in one `WHERE id IN (...)` query"""
+
+        if not ids:
+            return []
+        statement = (
+            select(self.model)
+            .where(self.model.id.in_(ids))
+            .options(
+                selectinload(self.model.images),
+                selectinload(self.model.category),
+                selectinload(self.model.variants).options(
+                    selectinload(ProductVariant.size),
+                    selectinload(ProductVariant.color),
+                ),
+            )
+        )
+        result = await db.execute(statement)
+        return list(result.scalars().all())
+
+    @handle_exceptions(
+        default_exception=InternalServerError,
+        message="An unexpected database error occurred.",
+    )
+    async def get_json(
+        self, db: AsyncSession, *, obj_id: uuid.UUID, active_only: bool = False
+    ) -> Optional[str]:
+        """Get a product as its ProductResponse JSON, built in one statement."""
+        query = select(self.product_document()).where(self.model.id == obj_id)
+        if active_only:
+            query = query.where(self.model.status == ProductStatus.ACTIVE)
+        result = await db.execute(query)
+        return result.scalar_one_or_none()
+
+    def product_document(self):
+        """
+        SQL expression rendering a product row as ProductResponse JSON text.
+
+        Images, variants (with size and color) and the category are nested via
+        correlated json_agg/json_build_object subqueries, so a product or a
+        whole page is one statement with no ORM hydration. Must be kept in
+        step with ProductResponse.
+        """
+        empty_array = literal_column("'[]'::json")
+
+        image = func.json_build_object(
+            "id", ProductImage.id,
+            "url", ProductImage.url,
+            "alt_text", ProductImage.alt_text,
+            "order_index", ProductImage.order_index,
+        )
+        images = (
+            select(
+                func.coalesce(
+                    func.json_agg(
+                        aggregate_order_by(
+                            image, ProductImage.order_index, ProductImage.id
+                        )
+                    ),
+                    empty_array,
+                )
+            )
+            .where(ProductImage.product_id == Product.id)
+            .scalar_subquery()
+        )
+
+        variant = func.json_build_object(
+            "id", ProductVariant.id,
+            "product_id", ProductVariant.product_id,
+            "price_in_cents", ProductVariant.price_in_cents,
+            "discount_price_in_cents", ProductVariant.discount_price_in_cents,
+            "stock", ProductVariant.stock,
+            "sku", ProductVariant.sku,
+            "size", func.json_build_object("id", Size.id, "name", Size.name),
+            "color", func.json_build_object(
+                "id", Color.id, "name", Color.name, "hex_code", Color.hex_code
+            ),
+        )
+        variants = (
+            select(
+                func.coalesce(
+                    func.json_agg(aggregate_order_by(variant, ProductVariant.sku)),
+                    empty_array,
+                )
+            )
+            .select_from(ProductVariant)
+            .join(Size, Size.id == ProductVariant.size_id)
+            .join(Color, Color.id == ProductVariant.color_id)
+            .where(ProductVariant.product_id == Product.id)
+            .scalar_subquery()
+        )
+
+        category = (
+            select(
+                func.json_build_object(
+                    "id", Category.id, "name", Category.name, "slug", Category.slug
+                )
+            )
+            .where(Category.id == Product.category_id)
+            .scalar_subquery()
+        )
+
+        document = func.json_build_object(
+            "id", Product.id,
+            "name", Product.name,
+            "description", Product.description,
+            "brand", Product.brand,
+            # Enums are stored by name ('ACTIVE'); the API uses their values
+            "status", func.lower(cast(Product.status, Text)),
+            "gender", func.lower(cast(Product.gender, Text)),
+            "category_id", Product.category_id,
+            "created_at", Product.created_at,
+            "updated_at", Product.updated_at,
+            "images", images,
+            "variants", variants,
+            "category", category,
+        )
+        return cast(document, Text).label("document")
+
     @handle_exceptions(
         default_exception=InternalServerError,
         message="An unexpected database error occurred.",
@@ -102,35 +248,38 @@ class ProductRepository(BaseRepository[Product]):
         filters: Optional[Dict[str, Any]] = None,
         order_by: str = "created_at",
         order_desc: bool = True,
-    ) -> Tuple[List[Product], int]:
-        """Get multiple products with filtering and pagination."""
+        count_strategy: CountStrategy = CountStrategy.EXACT,
+        as_json: bool = False,
+    ) -> Union[Page[Product], Page[str]]:
+        """
+        Get multiple products with filtering and pagination.
+        With `as_json` the page holds ProductResponse JSON documents instead.
+        """
 
-        query = select(self.model).options(
-            selectinload(self.model.images),
-            selectinload(self.model.category),
-            selectinload(self.model.variants).options(
-                selectinload(ProductVariant.size),
-                selectinload(ProductVariant.color),
-            ),
-        )
+        if as_json:
+            query = select(self.product_document())
+        else:
+            query = select(self.model).options(
+                selectinload(self.model.images),
+                selectinload(self.model.category),
+                selectinload(self.model.variants).options(
+                    selectinload(ProductVariant.size),
+                    selectinload(ProductVariant.color),
+                ),
+            )
 
         # Apply filters
         if filters:
             query = self._apply_filters(query, filters)
 
-        # Count total
-        count_query = select(func.count()).select_from(query.subquery())
-        total = (await db.execute(count_query)).scalar_one()
-
         # Apply ordering
-        query = self._apply_ordering(query, order_by, order_desc)
-
-        # Apply pagination
-        paginated_query = query.offset(skip).limit(limit)
-        result = await db.execute(paginated_query)
-        products = result.scalars().all()
+        search = (filters or {}).get("search")
+        query = self._apply_ordering(query, order_by, order_desc, search)
 
-        return products, total
+        # Page and total in a single statement
+        return await paginate(
+            db, query, skip=skip, limit=limit, count_strategy=count_strategy
+        )
 
     @handle_exceptions(
         default_exception=InternalServerError,
@@ -145,13 +294,22 @@ class ProductRepository(BaseRepository[Product]):
         filters: Optional[Dict[str, Any]] = None,
         order_by: str = "created_at",
         order_desc: bool = True,
-    ) -> Tuple[List[Product], int]:
-        """Get multiple products with filtering and pagination."""
+        after: Optional[Tuple[Any, uuid.UUID]] = None,
+        count_strategy: CountStrategy = CountStrategy.EXACT,
+        as_json: bool = False,
+    ) -> Union[Page[Product], Page[str]]:
+        """
+        Get multiple active products with filtering and pagination.
 
-        query = (
-            select(self.model)
-            .where(self.model.status == ProductStatus.ACTIVE)
-            .options(
+        When `after` is given the page is located with a keyset (seek) predicate
+        on `(order_by, id)` instead of OFFSET, and `skip` is ignored.
+        With `as_json` the page holds ProductResponse JSON documents instead.
+        """
+
+        if as_json:
+            query = select(self.product_document())
+        else:
+            query = select(self.model).options(
                 selectinload(self.model.images),
                 selectinload(self.model.category),
                 selectinload(self.model.variants).options(
@@ -159,25 +317,30 @@ class ProductRepository(BaseRepository[Product]):
                     selectinload(ProductVariant.color),
                 ),
             )
-        )
+        query = query.where(self.model.status == ProductStatus.ACTIVE)
 
         # Apply filters
         if filters:
             query = self._apply_public_product_filters(query, filters)
 
-        # Count total
-        count_query = select(func.count()).select_from(query.subquery())
-        total = (await db.execute(count_query)).scalar_one()
-
-        # Apply ordering
-        query = self._apply_ordering(query, order_by, order_desc)
-
-        # Apply pagination
-        paginated_query = query.offset(skip).limit(limit)
-        result = await db.execute(paginated_query)
-        products = result.unique().scalars().all()
+        # Keyset mode: seek past the last row of the previous page. The total
+        # (if requested) must still describe the whole set, not what's left.
+        if after is not None:
+            return await paginate(
+                db,
+                self._apply_keyset(query, order_by, order_desc, after),
+                limit=limit,
+                count_strategy=count_strategy,
+                count_query=(
+                    query if count_strategy != CountStrategy.NONE else None
+                ),
+            )
 
-        return products, total
+        search = (filters or {}).get("search")
+        query = self._apply_ordering(query, order_by, order_desc, search)
+        return await paginate(
+            db, query, skip=skip, limit=limit, count_strategy=count_strategy
+        )
 
     @handle_exceptions(
         default_exception=InternalServerError,
@@ -305,6 +468,55 @@ class ProductRepository(BaseRepository[Product]):
         result = await db.execute(statement)
         return result.scalar_one_or_none()
 
+    @handle_exceptions(
+        default_exception=InternalServerError,
+        message="An unexpected database error occurred.",
+    )
+    async def get_existing_skus(
+        self, db: AsyncSession, *, skus: List[str]
+    ) -> List[str]:
+        """Which of `skus` are already taken, in one `WHERE sku = ANY(...)` query"""
+
+        if not skus:
+            return []
+        statement = select(ProductVariant.sku).where(ProductVariant.sku == any_(skus))
+        result = await db.execute(statement)
+        return list(result.scalars().all())
+
+    @handle_exceptions(
+        default_exception=InternalServerError,
+        message="An unexpected database error occurred.",
+    )
+    async def create_images(
+        self, db: AsyncSession, *, images: List[Dict[str, Any]]
+    ) -> List[ProductImage]:
+        """Insert images with one multi-row INSERT ... RETURNING. Does not commit."""
+
+        if not images:
+            return []
+        statement = insert(ProductImage).returning(
+            ProductImage, sort_by_parameter_order=True
+        )
+        result = await db.scalars(statement, images)
+        return list(result.all())
+
+    @handle_exceptions(
+        default_exception=InternalServerError,
+        message="An unexpected database error occurred.",
+    )
+    async def create_variants(
+        self, db: AsyncSession, *, variants: List[Dict[str, Any]]
+    ) -> List[ProductVariant]:
+        """Insert variants with one multi-row INSERT ... RETURNING. Does not commit."""
+
+        if not variants:
+            return []
+        statement = insert(ProductVariant).returning(
+            ProductVariant, sort_by_parameter_order=True
+        )
+        result = await db.scalars(statement, variants)
+        return list(result.all())
+
     @handle_exceptions(
         default_exception=InternalServerError,
         message="An unexpected database error occurred.",
@@ -338,8 +550,9 @@ class ProductRepository(BaseRepository[Product]):
         skip: int = 0,
         limit: int = 100,
         filters: Optional[Dict[str, Any]] = None,
-    ) -> Tuple[List[ProductVariant], int]:
-        """Get multiple products with filtering and pagination."""
+        count_strategy: CountStrategy = CountStrategy.EXACT,
+    ) -> Page[ProductVariant]:
+        """Get multiple variants of a product with filtering and pagination."""
         query = (
             select(ProductVariant)
             .where(ProductVariant.product_id == product_id)
@@ -353,16 +566,12 @@ class ProductRepository(BaseRepository[Product]):
         if filters:
             query = self._apply_variant_filters(query, filters)
 
-        # Count total
-        count_query = select(func.count()).select_from(query.subquery())
-        total = (await db.execute(count_query)).scalar_one()
-
-        # Apply pagination
-        paginated_query = query.offset(skip).limit(limit)
-        result = await db.execute(paginated_query)
-        variants = result.scalars().all()
+        # Stable order so OFFSET pages don't overlap
+        query = query.order_by(ProductVariant.sku.asc())
 
-        return variants, total
+        return await paginate(
+            db, query, skip=skip, limit=limit, count_strategy=count_strategy
+        )
 
     @handle_exceptions(
         default_exception=InternalServerError,
@@ -374,6 +583,7 @@ class ProductRepository(BaseRepository[Product]):
         """create a variant for a product"""
 
         db.add(variant)
+        await self.refresh_listing_projection(db, product_id=variant.product_id)
         await db.commit()
         await db.refresh(variant)
         self._logger.info(f"Product Variant created : {variant.id}")
@@ -402,6 +612,7 @@ class ProductRepository(BaseRepository[Product]):
             setattr(variant, field, value)
 
         db.add(variant)
+        await self.refresh_listing_projection(db, product_id=variant.product_id)
         await db.commit()
         await db.refresh(variant)
         self._logger.info(
@@ -416,13 +627,81 @@ class ProductRepository(BaseRepository[Product]):
     async def delete_variant(self, db: AsyncSession, *, variant_id: uuid.UUID) -> None:
         """Delete a variant by its ID"""
 
-        statement = delete(ProductVariant).where(ProductVariant.id == variant_id)
-        await db.execute(statement)
+        statement = (
+            delete(ProductVariant)
+            .where(ProductVariant.id == variant_id)
+            .returning(ProductVariant.product_id)
+        )
+        product_id = (await db.execute(statement)).scalar_one_or_none()
+        if product_id is not None:
+            await self.refresh_listing_projection(db, product_id=product_id)
         await db.commit()
         self._logger.info(f"Product Variant Hard Deleted {variant_id}")
         return
 
     # Helpers
+    @handle_exceptions(
+        default_exception=InternalServerError,
+        message="An unexpected database error occurred.",
+    )
+    async def refresh_listing_projection(
+        self, db: AsyncSession, *, product_id: uuid.UUID
+    ) -> None:
+        """
+        Recompute a product's listing projection (effective price range, stock,
+        size/color arrays) from its variants. Does not commit: call it inside
+        the transaction that writes the variants.
+        """
+        await self.refresh_listing_projections(db, product_ids=[product_id])
+
+    @handle_exceptions(
+        default_exception=InternalServerError,
+        message="An unexpected database error occurred.",
+    )
+    async def refresh_listing_projections(
+        self, db: AsyncSession, *, product_ids: List[uuid.UUID]
+    ) -> None:
+        """Set-based refresh_listing_projection for many products in one UPDATE."""
+        if not product_ids:
+            return
+        await db.flush()
+
+        def variant_aggregate(expression):
+            # Correlated to the UPDATE's products row
+            return (
+                select(expression)
+                .where(ProductVariant.product_id == Product.id)
+                .scalar_subquery()
+            )
+
+        effective_price = func.coalesce(
+            ProductVariant.discount_price_in_cents, ProductVariant.price_in_cents
+        )
+        empty_uuid_array = literal_column("'{}'::uuid[]")
+        await db.execute(
+            update(Product)
+            .where(Product.id.in_(product_ids))
+            .values(
+                min_price_in_cents=variant_aggregate(func.min(effective_price)),
+                max_price_in_cents=variant_aggregate(func.max(effective_price)),
+                total_stock=variant_aggregate(
+                    func.coalesce(func.sum(ProductVariant.stock), 0)
+                ),
+                size_ids=variant_aggregate(
+                    func.coalesce(
+                        func.array_agg(distinct(ProductVariant.size_id)),
+                        empty_uuid_array,
+                    )
+                ),
+                color_ids=variant_aggregate(
+                    func.coalesce(
+                        func.array_agg(distinct(ProductVariant.color_id)),
+                        empty_uuid_array,
+                    )
+                ),
+            )
+        )
+
     @handle_exceptions(
         default_exception=InternalServerError,
         message="An unexpected database error occurred while deleting product images.",
@@ -484,81 +763,173 @@ class ProductRepository(BaseRepository[Product]):
             conditions.append(Product.category_id == filters["category_id"])
 
         if "search" in filters and filters["search"]:
-            search_term = f"%{filters['search']}%"
-            conditions.append(
-                or_(
-                    Product.name.ilike(search_term),
-                    Product.brand.ilike(search_term),
-                )
-            )
+            conditions.append(product_search_condition(filters["search"]))
 
         if conditions:
             query = query.where(and_(*conditions))
 
         return query
 
-    def _apply_public_product_filters(self, query, filters: Dict[str, Any]):
+    def _public_filter_conditions(
+        self, filters: Dict[str, Any]
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
         """
-        Applies complex public-facing filters to a Product query.
-        Handles JOINs to variants as needed.
+        Build the public-facing filter conditions, keyed by the facet each one
+        belongs to: (product-level conditions, variant-level conditions).
+        Variant-level conditions are expressed on the products projection;
+        the price filter also checks the variants themselves, to stay exact.
         """
         # --- Separate filters for each table ---
-        product_conditions = []
-        variant_conditions = []
+        product_conditions: Dict[str, Any] = {}
+        variant_conditions: Dict[str, Any] = {}
 
         # --- Product-level Filters ---
         if "gender" in filters and filters["gender"]:
-            product_conditions.append(Product.gender == filters["gender"])
+            product_conditions["gender"] = Product.gender == filters["gender"]
 
         if "category_id" in filters and filters["category_id"]:
-            product_conditions.append(Product.category_id == filters["category_id"])
+            product_conditions["category"] = (
+                Product.category_id == filters["category_id"]
+            )
+
+        if "in_stock" in filters and filters["in_stock"] is not None:
+            product_conditions["in_stock"] = Product.in_stock == filters["in_stock"]
 
         if "search" in filters and filters["search"]:
-            search_term = f"%{filters['search']}%"
-            product_conditions.append(
-                or_(
-                    Product.name.ilike(search_term),
-                    Product.brand.ilike(search_term),
-                    Product.description.ilike(search_term),  # Search description too
-                )
+            # Full-text match on name, brand and description (GIN-indexed)
+            product_conditions["search"] = product_search_condition(
+                filters["search"]
             )
 
-        # --- ProductVariant-level Filters ---
-        # (These require a JOIN)
+        # --- Variant-level Filters (served by the listing projection) ---
         if "size_ids" in filters and filters["size_ids"]:
-            # Handle a list of size IDs
-            variant_conditions.append(ProductVariant.size_id.in_(filters["size_ids"]))
+            # Any of the given sizes
+            variant_conditions["size"] = Product.size_ids.overlap(
+                filters["size_ids"]
+            )
 
         if "color_ids" in filters and filters["color_ids"]:
-            # Handle a list of color IDs
-            variant_conditions.append(ProductVariant.color_id.in_(filters["color_ids"]))
-
-        if "min_price" in filters and filters["min_price"] is not None:
-            # Use price range, not exact price
-            variant_conditions.append(
-                ProductVariant.price_in_cents >= filters["min_price"]
+            # Any of the given colors
+            variant_conditions["color"] = Product.color_ids.overlap(
+                filters["color_ids"]
             )
 
+        # Some variant's effective price is in range. The projection's price
+        # range only has to overlap it, which cheaply narrows the candidates
+        # before the EXISTS (on the product/effective price index) decides.
+        # Aliased so it never correlates to a variant join in the outer query
+        variant = aliased(ProductVariant)
+        effective_price = func.coalesce(
+            variant.discount_price_in_cents, variant.price_in_cents
+        )
+        price_conditions = []
+        variant_price_conditions = []
+        if "min_price" in filters and filters["min_price"] is not None:
+            price_conditions.append(Product.max_price_in_cents >= filters["min_price"])
+            variant_price_conditions.append(effective_price >= filters["min_price"])
         if "max_price" in filters and filters["max_price"] is not None:
-            variant_conditions.append(
-                ProductVariant.price_in_cents <= filters["max_price"]
+            price_conditions.append(Product.min_price_in_cents <= filters["max_price"])
+            variant_price_conditions.append(effective_price <= filters["max_price"])
+        if price_conditions:
+            variant_conditions["price"] = and_(
+                *price_conditions,
+                exists().where(
+                    variant.product_id == Product.id,
+                    *variant_price_conditions,
+                ),
             )
 
-        # --- Apply the filter conditions ---
+        return product_conditions, variant_conditions
+
+    def _apply_public_product_filters(self, query, filters: Dict[str, Any]):
+        """
+        Applies complex public-facing filters to a Product query.
+        Variant-level filters read the listing projection, so no join is needed.
+        """
+        product_conditions, variant_conditions = self._public_filter_conditions(
+            filters
+        )
+        conditions = {**product_conditions, **variant_conditions}
+        if conditions:
+            query = query.where(and_(*conditions.values()))
+
+        return query
+
+    # ===========FACETS==============
+    # Upper bounds (exclusive, in cents) of the price facet buckets; the last
+    # bucket is open-ended.
+    PRICE_FACET_EDGES = (2500, 5000, 10000, 20000)
+
+    @handle_exceptions(
+        default_exception=InternalServerError,
+        message="An unexpected database error occurred.",
+    )
+    async def get_active_facets(
+        self, db: AsyncSession, *, filters: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Dict[Any, int]]:
+        """
+        Count matching active products per size, color, category, gender and
+        price bucket in one statement.
 
-        # Apply Product-level conditions
-        if product_conditions:
-            query = query.where(and_(*product_conditions))
+        Scans products LEFT JOIN product_variants once with GROUPING SETS; each
+        facet's count uses a FILTER clause with every condition but its own.
+        Returns {facet: {value: count}}; price buckets are keyed by their index
+        into PRICE_FACET_EDGES (0 = below the first edge).
+        """
+        product_conditions, variant_conditions = self._public_filter_conditions(
+            filters or {}
+        )
+        conditions = {**product_conditions, **variant_conditions}
 
-        # If there are any variant filters, we MUST add the JOIN and WHERE clauses
-        if variant_conditions:
-            query = (
-                query.join(ProductVariant, Product.id == ProductVariant.product_id)
-                .where(and_(*variant_conditions))
-                .distinct()  # Use distinct to avoid duplicate products
+        # Inlined so the expression in SELECT and GROUP BY is textually identical
+        edges = ",".join(str(edge) for edge in self.PRICE_FACET_EDGES)
+        price_bucket = func.width_bucket(
+            func.coalesce(
+                ProductVariant.discount_price_in_cents, ProductVariant.price_in_cents
+            ),
+            literal_column(f"ARRAY[{edges}]"),
+        )
+        facet_columns = {
+            "size": ProductVariant.size_id,
+            "color": ProductVariant.color_id,
+            "category": Product.category_id,
+            "gender": Product.gender,
+            "price": price_bucket,
+        }
+
+        columns = []
+        for facet, column in facet_columns.items():
+            others = [cond for name, cond in conditions.items() if name != facet]
+            count = func.count(distinct(Product.id))
+            if others:
+                count = count.filter(and_(*others))
+            columns.extend(
+                [
+                    func.grouping(column).label(f"{facet}_grouping"),
+                    column.label(f"{facet}_value"),
+                    count.label(f"{facet}_count"),
+                ]
             )
 
-        return query
+        query = (
+            select(*columns)
+            .select_from(Product)
+            .outerjoin(ProductVariant, ProductVariant.product_id == Product.id)
+            .where(Product.status == ProductStatus.ACTIVE)
+            .group_by(func.grouping_sets(*facet_columns.values()))
+        )
+        rows = (await db.execute(query)).mappings().all()
+
+        facets: Dict[str, Dict[Any, int]] = {facet: {} for facet in facet_columns}
+        for row in rows:
+            for facet in facet_columns:
+                # GROUPING() is 0 for the column this row is grouped by
+                if row[f"{facet}_grouping"] == 0:
+                    value, count = row[f"{facet}_value"], row[f"{facet}_count"]
+                    if value is not None and count:
+                        facets[facet][value] = count
+                    break
+        return facets
 
     def _apply_variant_filters(self, query, filters: Dict[str, Any]):
         """Apply filters to query."""
@@ -583,13 +954,93 @@ class ProductRepository(BaseRepository[Product]):
 
         return query
 
-    def _apply_ordering(self, query, order_by: str, order_desc: bool):
-        """Apply ordering to query."""
-        order_column = getattr(self.model, order_by, self.model.created_at)
+    def _apply_ordering(
+        self, query, order_by: str, order_desc: bool, search: Optional[str] = None
+    ):
+        """
+        Apply ordering to query. `relevance` ranks by `search` when given and
+        `price` sorts on the lowest effective price, products without variants last.
+        """
+        if order_by == RELEVANCE and search:
+            order_column = product_search_rank(search)
+        elif order_by == PRICE_ORDER:
+            order_column = self.model.min_price_in_cents
+            if order_desc:
+                return query.order_by(
+                    nulls_last(order_column.desc()), self.model.id.desc()
+                )
+            return query.order_by(order_column.asc(), self.model.id.asc())
+        else:
+            order_column = getattr(self.model, order_by, self.model.created_at)
         if order_desc:
-            return query.order_by(order_column.desc())
+            return query.order_by(order_column.desc(), self.model.id.desc())
         else:
-            return query.order_by(order_column.asc())
+            return query.order_by(order_column.asc(), self.model.id.asc())
+
+    # ===========KEYSET PAGINATION==============
+    # Columns that can drive a keyset (cursor) page. The primary key is always
+    # appended as a tie-breaker so the sort order is total.
+    KEYSET_ORDER_FIELDS = ("created_at", "updated_at", "name", "brand")
+
+    def cursor_order_field(self, order_by: str, search: Optional[str]) -> Optional[str]:
+        """
+        The keyset field that pages in the same order as `order_by` does with
+        offsets, or None when there is none: relevance isn't stored, price is
+        nullable and other columns (status, gender, ...) have no keyset index.
+        """
+        if order_by in self.KEYSET_ORDER_FIELDS:
+            return order_by
+        if order_by == PRICE_ORDER or (order_by == RELEVANCE and search):
+            return None
+        # _apply_ordering sorts on created_at when order_by isn't an attribute
+        if getattr(self.model, order_by, None) is None:
+            return "created_at"
+        return None
+
+    def keyset_order_field(self, order_by: str) -> str:
+        """Normalize an order_by value to a field that supports keyset pagination."""
+        return order_by if order_by in self.KEYSET_ORDER_FIELDS else "created_at"
+
+    def keyset_value(
+        self, product: Union[Product, Dict[str, Any]], order_by: str
+    ) -> Tuple[Any, str]:
+        """
+        Extract the JSON-safe `(order value, id)` pair of a row for a cursor.
+        Accepts a decoded product document as well as a model.
+        """
+        if isinstance(product, dict):
+            return product[self.keyset_order_field(order_by)], str(product["id"])
+        value = getattr(product, self.keyset_order_field(order_by))
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        return value, str(product.id)
+
+    def parse_keyset_value(
+        self, order_by: str, value: Any, last_id: str
+    ) -> Tuple[Any, uuid.UUID]:
+        """Convert a decoded cursor pair back into column-typed values."""
+        if order_by in {"created_at", "updated_at"}:
+            value = datetime.fromisoformat(value)
+        return value, uuid.UUID(last_id)
+
+    def _apply_keyset(
+        self,
+        query,
+        order_by: str,
+        order_desc: bool,
+        after: Tuple[Any, uuid.UUID],
+    ):
+        """Apply a seek predicate and matching ordering on (order_by, id)."""
+        order_column = getattr(self.model, self.keyset_order_field(order_by))
+        value, last_id = after
+
+        # Row-value comparison lets Postgres use a composite (col, id) index scan
+        boundary = tuple_(order_column, self.model.id)
+        if order_desc:
+            query = query.where(boundary < tuple_(value, last_id))
+            return query.order_by(order_column.desc(), self.model.id.desc())
+        query = query.where(boundary > tuple_(value, last_id))
+        return query.order_by(order_column.asc(), self.model.id.asc())
 
 
 product_repository = ProductRepository()
@@ -0,0 +1,328 @@
+"""
+Staging, validation and loading for bulk product imports.
+
+Each import chunk is COPY'd into temporary staging tables that are dropped on
+commit, validated there with a handful of set-based queries (one UNION ALL
+round trip instead of two lookups per variant), and moved into the real tables
+with INSERT ... SELECT. Rejected products never leave staging, so a bad row
+costs a report entry rather than the whole chunk.
+"""
+import logging
+import uuid
+from typing import Dict, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import (
+    Column,
+    Integer,
+    MetaData,
+    Table,
+    Text,
+    cast,
+    delete,
+    func,
+    insert,
+    literal,
+    null,
+    select,
+    union_all,
+)
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.exception_utils import handle_exceptions
+from app.core.exceptions import InternalServerError
+from app.models.product_model import (
+    Category,
+    Color,
+    Product,
+    ProductImage,
+    ProductVariant,
+    Size,
+)
+
+logger = logging.getLogger(__name__)
+
+# Kept out of SQLModel.metadata so Alembic never sees the staging tables
+_staging_metadata = MetaData()
+
+_TEMPORARY = {"prefixes": ["TEMPORARY"], "postgresql_on_commit": "DROP"}
+
+import_products = Table(
+    "import_products",
+    _staging_metadata,
+    Column("line", Integer, primary_key=True),
+    Column("id", PG_UUID(as_uuid=True), nullable=False),
+    Column("name", Text, nullable=False),
+    Column("description", Text, nullable=False),
+    Column("brand", Text, nullable=False),
+    # Enum names ('ACTIVE', 'MEN'), cast to the enum types on insert
+    Column("status", Text, nullable=False),
+    Column("gender", Text, nullable=False),
+    Column("category_id", PG_UUID(as_uuid=True), nullable=False),
+    **_TEMPORARY,
+)
+
+import_variants = Table(
+    "import_variants",
+    _staging_metadata,
+    # Position in the chunk; decides which of two duplicates is reported
+    Column("seq", Integer, primary_key=True),
+    Column("line", Integer, nullable=False),
+    Column("product_line", Integer, nullable=False),
+    Column("product_id", PG_UUID(as_uuid=True), nullable=False),
+    Column("sku", Text, nullable=False),
+    Column("price_in_cents", Integer, nullable=False),
+    Column("discount_price_in_cents", Integer),
+    Column("stock", Integer, nullable=False),
+    Column("size_id", PG_UUID(as_uuid=True), nullable=False),
+    Column("color_id", PG_UUID(as_uuid=True), nullable=False),
+    **_TEMPORARY,
+)
+
+import_images = Table(
+    "import_images",
+    _staging_metadata,
+    Column("product_line", Integer, nullable=False),
+    Column("product_id", PG_UUID(as_uuid=True), nullable=False),
+    Column("url", Text, nullable=False),
+    Column("alt_text", Text),
+    Column("order_index", Integer, nullable=False),
+    **_TEMPORARY,
+)
+
+
+class ImportRejection(NamedTuple):
+    """A staged row that failed validation; rejects its whole product."""
+
+    product_line: int
+    line: int
+    sku: Optional[str]
+    reason: str
+
+
+class ImportLoadResult(NamedTuple):
+    product_ids: List[uuid.UUID]
+    variants: int
+    images: int
+
+
+class ProductImportRepository:
+    """Database side of the bulk product import."""
+
+    # reason code -> report message
+    REJECTION_MESSAGES: Dict[str, str] = {
+        "category_missing": "Category does not exist.",
+        "name_exists": "A product with this name already exists.",
+        "name_duplicate": "Product name appears earlier in the file.",
+        "image_url_too_long": "Image URL is longer than 1024 characters.",
+        "size_missing": "Size does not exist.",
+        "color_missing": "Color does not exist.",
+        "sku_exists": "Variant SKU already exists.",
+        "sku_duplicate": "Variant SKU appears earlier in the file.",
+        "combo_duplicate": "Variant with this Size and Color already exists.",
+    }
+
+    def __init__(self):
+        self._logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+
+    @handle_exceptions(
+        default_exception=InternalServerError,
+        message="An unexpected database error occurred while staging the import.",
+    )
+    async def stage(
+        self,
+        db: AsyncSession,
+        *,
+        products: Sequence[Tuple],
+        variants: Sequence[Tuple],
+        images: Sequence[Tuple],
+    ) -> List[ImportRejection]:
+        """
+        COPY one chunk into fresh staging tables and validate it against the
+        catalog. Rows are tuples in the staging tables' column order. Must run
+        inside the transaction that calls `load`.
+        """
+        connection = await db.connection()
+        await connection.run_sync(_staging_metadata.create_all, checkfirst=False)
+
+        raw = await connection.get_raw_connection()
+        driver = raw.driver_connection
+        for table, records in (
+            (import_products, products),
+            (import_variants, variants),
+            (import_images, images),
+        ):
+            if records:
+                await driver.copy_records_to_table(
+                    table.name,
+                    records=records,
+                    columns=[column.name for column in table.columns],
+                )
+
+        result = await db.execute(self._validation_query())
+        return [ImportRejection(*row) for row in result.all()]
+
+    def _validation_query(self):
+        """Every check as (product_line, line, sku, reason), in one statement."""
+        p, v, i = import_products, import_variants, import_images
+        p2, v2 = p.alias("earlier_products"), v.alias("earlier_variants")
+        max_url_length = ProductImage.__table__.c.url.type.length
+
+        def product_check(reason: str, query):
+            return query.add_columns(p.c.line, p.c.line, null(), literal(reason))
+
+        def variant_check(reason: str, query):
+            return query.add_columns(
+                v.c.product_line, v.c.line, v.c.sku, literal(reason)
+            )
+
+        checks = [
+            product_check(
+                "category_missing",
+                select()
+                .select_from(p)
+                .outerjoin(Category, Category.id == p.c.category_id)
+                .where(Category.id.is_(None)),
+            ),
+            product_check(
+                "name_exists",
+                select().select_from(p).join(Product, Product.name == p.c.name),
+            ),
+            product_check(
+                "name_duplicate",
+                select()
+                .select_from(p)
+                .join(p2, (p2.c.name == p.c.name) & (p2.c.line < p.c.line)),
+            ),
+            select(
+                i.c.product_line,
+                i.c.product_line,
+                null(),
+                literal("image_url_too_long"),
+            ).where(func.length(i.c.url) > max_url_length),
+            variant_check(
+                "size_missing",
+                select()
+                .select_from(v)
+                .outerjoin(Size, Size.id == v.c.size_id)
+                .where(Size.id.is_(None)),
+            ),
+            variant_check(
+                "color_missing",
+                select()
+                .select_from(v)
+                .outerjoin(Color, Color.id == v.c.color_id)
+                .where(Color.id.is_(None)),
+            ),
+            variant_check(
+                "sku_exists",
+                select()
+                .select_from(v)
+                .join(ProductVariant, ProductVariant.sku == v.c.sku),
+            ),
+            variant_check(
+                "sku_duplicate",
+                select()
+                .select_from(v)
+                .join(v2, (v2.c.sku == v.c.sku) & (v2.c.seq < v.c.seq)),
+            ),
+            variant_check(
+                "combo_duplicate",
+                select()
+                .select_from(v)
+                .join(
+                    v2,
+                    (v2.c.product_line == v.c.product_line)
+                    & (v2.c.size_id == v.c.size_id)
+                    & (v2.c.color_id == v.c.color_id)
+                    & (v2.c.seq < v.c.seq),
+                ),
+            ),
+        ]
+        return union_all(*checks)
+
+    @handle_exceptions(
+        default_exception=InternalServerError,
+        message="An unexpected database error occurred while loading the import.",
+    )
+    async def load(
+        self, db: AsyncSession, *, rejected_lines: Set[int]
+    ) -> ImportLoadResult:
+        """
+        Move the staged chunk, minus rejected products, into the catalog.
+        Does not commit and does not refresh the listing projection.
+        """
+        p, v, i = import_products, import_variants, import_images
+        if rejected_lines:
+            rejected = list(rejected_lines)
+            await db.execute(delete(p).where(p.c.line.in_(rejected)))
+            await db.execute(delete(v).where(v.c.product_line.in_(rejected)))
+            await db.execute(delete(i).where(i.c.product_line.in_(rejected)))
+
+        now = func.now()
+        product_table = Product.__table__
+        inserted = await db.execute(
+            insert(Product)
+            .from_select(
+                [
+                    "id",
+                    "name",
+                    "description",
+                    "brand",
+                    "status",
+                    "gender",
+                    "category_id",
+                    "created_at",
+                    "updated_at",
+                ],
+                select(
+                    p.c.id,
+                    p.c.name,
+                    p.c.description,
+                    p.c.brand,
+                    cast(p.c.status, product_table.c.status.type),
+                    cast(p.c.gender, product_table.c.gender.type),
+                    p.c.category_id,
+                    now,
+                    now,
+                ).order_by(p.c.line),
+                include_defaults=False,
+            )
+            .returning(Product.id)
+        )
+        product_ids = list(inserted.scalars().all())
+
+        variant_columns = [
+            "product_id",
+            "sku",
+            "price_in_cents",
+            "discount_price_in_cents",
+            "stock",
+            "size_id",
+            "color_id",
+        ]
+        variants = await db.execute(
+            insert(ProductVariant).from_select(
+                variant_columns,
+                select(*(v.c[name] for name in variant_columns)).order_by(v.c.seq),
+                include_defaults=False,
+            )
+        )
+
+        image_columns = ["product_id", "url", "alt_text", "order_index"]
+        images = await db.execute(
+            insert(ProductImage).from_select(
+                image_columns,
+                select(*(i.c[name] for name in image_columns)),
+                include_defaults=False,
+            )
+        )
+
+        self._logger.info(
+            f"Imported {len(product_ids)} products, {variants.rowcount} variants, "
+            f"{images.rowcount} images"
+        )
+        return ImportLoadResult(product_ids, variants.rowcount, images.rowcount)
+
+
+product_import_repository = ProductImportRepository()
@@ -1,14 +1,15 @@
 import logging
 import uuid
-from typing import Optional, List, Dict, Any, TypeVar, Generic, Tuple
+from typing import Optional, Dict, Any, TypeVar, Generic
 from abc import ABC, abstractmethod
 from datetime import datetime, timezone
 
 from sqlmodel.ext.asyncio.session import AsyncSession
-from sqlmodel import select, func, and_, or_, delete
+from sqlmodel import select, and_, or_, delete
 
 from app.core.exception_utils import handle_exceptions
 from app.core.exceptions import InternalServerError
+from app.crud.pagination import CountStrategy, Page, paginate
 from app.models.promotion_model import Promotion
 
 logger = logging.getLogger(__name__)
@@ -84,7 +85,8 @@ class PromotionRepository(BaseRepository[Promotion]):
         limit: int = 100,
         order_by: str = "created_at",
         order_desc: bool = True,
-    ) -> Tuple[List[Promotion], int]:
+        count_strategy: CountStrategy = CountStrategy.EXACT,
+    ) -> Page[Promotion]:
         """Get multiple Categories with filtering and pagination."""
 
         query = select(self.model)
@@ -93,19 +95,13 @@ class PromotionRepository(BaseRepository[Promotion]):
         if filters:
             query = self._apply_filters(query, filters)
 
-        # Count total
-        count_query = select(func.count()).select_from(query.subquery())
-        total = (await db.execute(count_query)).scalar_one()
-
         # Apply ordering
         query = self._apply_ordering(query, order_by, order_desc)
 
-        # Apply pagination
-        paginated_query = query.offset(skip).limit(limit)
-        result = await db.execute(paginated_query)
-        promotions = result.scalars().all()
-
-        return promotions, total
+        # Page and total in a single statement
+        return await paginate(
+            db, query, skip=skip, limit=limit, count_strategy=count_strategy
+        )
 
     @handle_exceptions(
         default_exception=InternalServerError,
@@ -0,0 +1,59 @@
+"""
+Full-text search over products.
+
+`products.search_vector` is a generated, weighted tsvector (name > brand >
+description) backed by a GIN index, so a search is an index lookup instead
+of an ILIKE scan over every description. Queries are parsed with
+`websearch_to_tsquery`, which accepts what users type ("red shoes",
+`"exact phrase"`, `-excluded`) without raising on stray syntax.
+
+Stemming cannot fix typos, so short queries also match on trigram word
+similarity of name and brand (pg_trgm, GIN-indexed as well).
+"""
+from sqlalchemy import func, literal_column, or_
+
+from app.models.product_model import Product
+
+# Text search configuration used by the generated column; must match it
+SEARCH_CONFIG = "english"
+
+# Queries up to this many characters also get trigram (typo) matching
+TRIGRAM_MAX_QUERY_LENGTH = 32
+
+# order_by value that sorts search results by rank
+RELEVANCE = "relevance"
+
+
+def _tsquery(term: str):
+    config = literal_column(f"'{SEARCH_CONFIG}'::regconfig")
+    return func.websearch_to_tsquery(config, term)
+
+
+def _use_trigram(term: str) -> bool:
+    return len(term) <= TRIGRAM_MAX_QUERY_LENGTH
+
+
+def product_search_condition(term: str):
+    """WHERE clause matching products against a user search string."""
+    condition = Product.search_vector.op("@@")(_tsquery(term))
+    if _use_trigram(term):
+        # `name %> term` is word_similarity(term, name) above the pg_trgm
+        # threshold, and can use the gin_trgm_ops indexes
+        condition = or_(
+            condition,
+            Product.name.op("%>")(term),
+            Product.brand.op("%>")(term),
+        )
+    return condition
+
+
+def product_search_rank(term: str):
+    """Relevance score for `order_by=relevance`; higher is better."""
+    # Normalization 32 scales the rank into [0, 1) like the similarity below
+    rank = func.ts_rank_cd(Product.search_vector, _tsquery(term), 32)
+    if _use_trigram(term):
+        rank = rank + func.greatest(
+            func.word_similarity(term, Product.name),
+            func.word_similarity(term, Product.brand),
+        )
+    return rank
@@ -1,6 +1,6 @@
 import logging
 import uuid
-from typing import Optional, List, Dict, Any, TypeVar, Generic, Tuple
+from typing import Optional, Dict, Any, TypeVar, Generic
 from abc import ABC, abstractmethod
 from datetime import datetime, timezone
 
@@ -9,6 +9,7 @@ from sqlmodel import select, func, and_, or_, delete
 
 from app.core.exception_utils import handle_exceptions
 from app.core.exceptions import InternalServerError
+from app.crud.pagination import CountStrategy, Page, paginate
 
 from app.models.user_model import User
 
@@ -94,7 +95,8 @@ class UserRepository(BaseRepository[User]):
         filters: Optional[Dict[str, Any]] = None,
         order_by: str = "created_at",
         order_desc: bool = True,
-    ) -> Tuple[List[User], int]:
+        count_strategy: CountStrategy = CountStrategy.EXACT,
+    ) -> Page[User]:
         """Get multiple users with filtering and pagination."""
         query = select(self.model)
 
@@ -102,19 +104,13 @@ class UserRepository(BaseRepository[User]):
         if filters:
             query = self._apply_filters(query, filters)
 
-        # Count total
-        count_query = select(func.count()).select_from(query.subquery())
-        total = (await db.execute(count_query)).scalar_one()
-
         # Apply ordering
         query = self._apply_ordering(query, order_by, order_desc)
 
-        # Apply pagination
-        paginated_query = query.offset(skip).limit(limit)
-        result = await db.execute(paginated_query)
-        users = result.scalars().all()
-
-        return users, total
+        # Page and total in a single statement
+        return await paginate(
+            db, query, skip=skip, limit=limit, count_strategy=count_strategy
+        )
 
     @handle_exceptions(
         default_exception=InternalServerError,
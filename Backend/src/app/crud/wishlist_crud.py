@@ -1,15 +1,16 @@
 import logging
 import uuid
-from typing import Optional, List, Any, TypeVar, Generic, Tuple
+from typing import Optional, Any, TypeVar, Generic
 from abc import ABC, abstractmethod
 
 from sqlmodel.ext.asyncio.session import AsyncSession
-from sqlmodel import select, func, delete
+from sqlmodel import select, delete
 from sqlalchemy.orm import selectinload
 
 from app.models.product_model import Product, ProductVariant
 from app.core.exception_utils import handle_exceptions
 from app.core.exceptions import InternalServerError
+from app.crud.pagination import CountStrategy, Page, paginate
 
 from app.models.wishlist_model import Wishlist
 
@@ -95,37 +96,24 @@ class WishlistRepository(BaseRepository[Wishlist]):
         limit: int = 100,
         order_by: str = "created_at",
         order_desc: bool = True,
-    ) -> Tuple[List[Wishlist], int]:
-        """get full wishlist for a user"""
+        count_strategy: CountStrategy = CountStrategy.EXACT,
+    ) -> Page[Wishlist]:
+        """
+        get a page of a user's wishlist rows.
 
-        query = (
-            select(self.model)
-            .where(self.model.user_id == user_id)
-            .options(
-                selectinload(self.model.product).options(
-                    selectinload(Product.images),
-                    selectinload(Product.category),
-                    selectinload(Product.variants).options(
-                        selectinload(ProductVariant.size),
-                        selectinload(ProductVariant.color),
-                    ),
-                )
-            )
-        )
+        Products are not loaded here; the service hydrates them from the
+        per-product cache and loads only the misses.
+        """
 
-        # Count total
-        count_query = select(func.count()).select_from(query.subquery())
-        total = (await db.execute(count_query)).scalar_one()
+        query = select(self.model).where(self.model.user_id == user_id)
 
         # Apply ordering
         query = self._apply_ordering(query, order_by, order_desc)
 
-        # Apply pagination
-        paginated_query = query.offset(skip).limit(limit)
-        result = await db.execute(paginated_query)
-        wishlist_products = result.scalars().all()
-
-        return wishlist_products, total
+        # Page and total in a single statement
+        return await paginate(
+            db, query, skip=skip, limit=limit, count_strategy=count_strategy
+        )
 
     @handle_exceptions(
         default_exception=InternalServerError,
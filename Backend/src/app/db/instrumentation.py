@@ -0,0 +1,232 @@
+"""
+Per-request SQL instrumentation.
+
+Engine events attribute every statement to the request being served, through
+a context variable set by QueryStatsMiddleware: how many statements it ran,
+how long the database took, and which statements it repeated. Parameters are
+bound, so the same query issued once per row of a result (the N+1 pattern)
+shows up as one SQL text with a high count.
+
+Statements slower than `SQL_SLOW_QUERY_MS` are logged and, at
+`SQL_EXPLAIN_SAMPLE_RATE`, re-run under EXPLAIN (ANALYZE, BUFFERS) on a
+separate connection in a rolled-back transaction; the plans are kept in a
+small ring buffer for admins. ANALYZE executes the statement, so only plain
+SELECTs are explained, and only one at a time.
+"""
+import asyncio
+import logging
+import random
+import re
+import time
+from collections import Counter, deque
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+EXPLAIN_PREFIX = "EXPLAIN (ANALYZE, BUFFERS) "
+
+# Row-locking clauses; explaining these would take the locks
+_LOCKING_CLAUSE = re.compile(r"\bFOR\s+(UPDATE|SHARE|NO\s+KEY|KEY)\b", re.IGNORECASE)
+
+
+class RequestQueryStats:
+    """Statements run on behalf of one request."""
+
+    __slots__ = ("endpoint", "count", "total_time", "statements", "calls")
+
+    def __init__(self, endpoint: Optional[str] = None):
+        self.endpoint = endpoint
+        self.count = 0
+        self.total_time = 0.0
+        # SQL text -> executions
+        self.statements: Counter = Counter()
+        # Repository method -> [calls, seconds]; nested calls count in both
+        self.calls: Dict[str, List[float]] = {}
+
+    def record(self, statement: str, elapsed: float) -> None:
+        self.count += 1
+        self.total_time += elapsed
+        self.statements[statement] += 1
+
+    def record_call(self, method: str, elapsed: float) -> None:
+        entry = self.calls.get(method)
+        if entry is None:
+            self.calls[method] = [1, elapsed]
+        else:
+            entry[0] += 1
+            entry[1] += elapsed
+
+    def slowest_calls(self, limit: int = 5) -> List[Tuple[str, int, float]]:
+        """(method, calls, seconds) of the repository methods that took longest."""
+        ranked = sorted(self.calls.items(), key=lambda item: item[1][1], reverse=True)
+        return [
+            (method, int(calls), total) for method, (calls, total) in ranked[:limit]
+        ]
+
+    def repeated(self) -> List[Tuple[str, int]]:
+        """Statements run at least `SQL_N_PLUS_ONE_THRESHOLD` times, most first."""
+        threshold = settings.SQL_N_PLUS_ONE_THRESHOLD
+        return [
+            (statement, count)
+            for statement, count in self.statements.most_common()
+            if count >= threshold
+        ]
+
+    def headers(self) -> Dict[str, str]:
+        return {
+            "X-DB-Query-Count": str(self.count),
+            "X-DB-Query-Time-Ms": f"{self.total_time * 1000:.1f}",
+            "X-DB-Repeated-Queries": str(len(self.repeated())),
+            "Server-Timing": self.server_timing(),
+        }
+
+    def server_timing(self) -> str:
+        """Server-Timing value: database total, then the slowest repository calls."""
+        entries = [f'db;dur={self.total_time * 1000:.1f};desc="{self.count} queries"']
+        entries.extend(
+            f'{method};dur={total * 1000:.1f};desc="{calls} calls"'
+            for method, calls, total in self.slowest_calls()
+        )
+        return ", ".join(entries)
+
+
+query_stats: ContextVar[Optional[RequestQueryStats]] = ContextVar(
+    "db_query_stats", default=None
+)
+
+
+def _explainable(statement: str) -> bool:
+    if statement.lstrip()[:6].upper() != "SELECT":
+        return False
+    return not _LOCKING_CLAUSE.search(statement)
+
+
+class SQLInstrumentation:
+    """Engine event hooks, slow-query sampling and the plan ring buffer."""
+
+    def __init__(self):
+        self.slow_query_seconds = settings.SQL_SLOW_QUERY_MS / 1000
+        self.explain_sample_rate = settings.SQL_EXPLAIN_SAMPLE_RATE
+        self._samples: Deque[Dict[str, Any]] = deque(
+            maxlen=settings.SQL_EXPLAIN_BUFFER_SIZE
+        )
+        # Sync engine (what events see) -> async engine to run EXPLAIN on
+        self._engines: Dict[Engine, AsyncEngine] = {}
+        self._explain_task: Optional[asyncio.Task] = None
+
+    def attach(self, engine: AsyncEngine) -> None:
+        """Instrument every statement run through `engine`."""
+        self._engines[engine.sync_engine] = engine
+        event.listen(engine.sync_engine, "before_cursor_execute", self._before)
+        event.listen(engine.sync_engine, "after_cursor_execute", self._after)
+
+    def _before(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+    def _after(self, conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start_time"].pop()
+        if statement.startswith(EXPLAIN_PREFIX):
+            return  # Our own sampling
+
+        stats = query_stats.get()
+        if stats is not None:
+            stats.record(statement, elapsed)
+
+        if elapsed < self.slow_query_seconds:
+            return
+        endpoint = stats.endpoint if stats is not None else None
+        logger.warning(
+            f"Slow query ({elapsed * 1000:.0f} ms) in {endpoint or 'background'}: "
+            f"{statement[:500]}"
+        )
+        if (
+            not executemany
+            and self._explain_task is None
+            and random.random() < self.explain_sample_rate
+            and _explainable(statement)
+        ):
+            self._start_explain(conn.engine, statement, parameters, elapsed, endpoint)
+
+    def _start_explain(
+        self,
+        sync_engine: Engine,
+        statement: str,
+        parameters: Any,
+        elapsed: float,
+        endpoint: Optional[str],
+    ) -> None:
+        engine = self._engines.get(sync_engine)
+        if engine is None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # Sync use outside the event loop (scripts, migrations)
+        self._explain_task = loop.create_task(
+            self._explain(engine, statement, parameters, elapsed, endpoint)
+        )
+
+    async def _explain(
+        self,
+        engine: AsyncEngine,
+        statement: str,
+        parameters: Any,
+        elapsed: float,
+        endpoint: Optional[str],
+    ) -> None:
+        sample: Dict[str, Any] = {
+            "captured_at": datetime.now(timezone.utc),
+            "duration_ms": round(elapsed * 1000, 1),
+            "endpoint": endpoint,
+            "statement": statement,
+            "plan": None,
+            "error": None,
+        }
+        try:
+            async with engine.connect() as connection:
+                result = await connection.exec_driver_sql(
+                    EXPLAIN_PREFIX + statement, parameters
+                )
+                sample["plan"] = "\n".join(row[0] for row in result)
+                await connection.rollback()
+        except (SQLAlchemyError, OSError) as e:
+            sample["error"] = str(e)
+        finally:
+            self._explain_task = None
+        self._samples.append(sample)
+
+    def finish(self, stats: RequestQueryStats) -> None:
+        """
+        Report a finished request's repeated statements (likely N+1) and, when
+        its database time was slow, which repository calls it went to.
+        """
+        for statement, count in stats.repeated():
+            logger.warning(
+                f"Possible N+1 in {stats.endpoint}: statement ran {count} times: "
+                f"{statement[:500]}"
+            )
+        if stats.total_time >= self.slow_query_seconds:
+            breakdown = ", ".join(
+                f"{method} x{calls} {total * 1000:.0f} ms"
+                for method, calls, total in stats.slowest_calls()
+            )
+            logger.info(
+                f"{stats.endpoint}: {stats.total_time * 1000:.0f} ms in "
+                f"{stats.count} queries ({breakdown or 'no repository calls'})"
+            )
+
+    def slow_queries(self) -> List[Dict[str, Any]]:
+        """Sampled slow-query plans, newest first."""
+        return list(reversed(self._samples))
+
+
+sql_instrumentation = SQLInstrumentation()
@@ -8,15 +8,47 @@
 
 
 import redis.asyncio as redis
+from redis.asyncio.client import Pipeline
 from app.core.config import settings
+from app.core.metrics import redis_command_duration
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
 
+class _TimedPipeline(Pipeline):
+    """Pipeline that records its round trip as one PIPELINE observation."""
+
+    async def execute(self, raise_on_error: bool = True):
+        start = time.perf_counter()
+        try:
+            return await super().execute(raise_on_error)
+        finally:
+            redis_command_duration.observe(time.perf_counter() - start, "PIPELINE")
+
+
+class TimedRedis(redis.Redis):
+    """Redis client recording per-command latency in the metrics registry."""
+
+    async def execute_command(self, *args, **options):
+        start = time.perf_counter()
+        try:
+            return await super().execute_command(*args, **options)
+        finally:
+            redis_command_duration.observe(
+                time.perf_counter() - start, str(args[0]).upper()
+            )
+
+    def pipeline(self, transaction: bool = True, shard_hint=None) -> Pipeline:
+        return _TimedPipeline(
+            self.connection_pool, self.response_callbacks, transaction, shard_hint
+        )
+
+
 class RedisClient:
     def __init__(self, url: str):
-        self.client = redis.from_url(url, encoding="utf-8", decode_responses=True)
+        self.client = TimedRedis.from_url(url, encoding="utf-8", decode_responses=True)
 
     async def connect(self):
         """Establishes and tests the Redis connection on application startup."""
@@ -0,0 +1,205 @@
+"""
+Read-replica routing.
+
+Replicas are tracked by the WAL position they have replayed, checked
+periodically against the primary. A replica that falls more than
+`DB_REPLICA_MAX_LAG_BYTES` behind, or stops answering, leaves the rotation until
+it catches up again.
+
+Read-your-writes: when a request commits a write, the primary's WAL position
+is handed to the client in a short-lived signed cookie. Later reads from that
+client only use replicas known to have replayed at least that position, so a
+user always sees their own changes; everyone else keeps reading replicas.
+"""
+import asyncio
+import itertools
+import logging
+from contextvars import ContextVar
+from http.cookies import SimpleCookie
+from typing import Iterator, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.core.cursor import CursorCodec
+from app.core.exceptions import InvalidInput
+
+logger = logging.getLogger(__name__)
+
+# WAL positions as byte offsets, so they compare as integers
+PRIMARY_LSN_SQL = text("SELECT pg_wal_lsn_diff(pg_current_wal_lsn(), '0/0')::bigint")
+REPLAY_LSN_SQL = text(
+    "SELECT pg_wal_lsn_diff(pg_last_wal_replay_lsn(), '0/0')::bigint"
+)
+
+
+# ---------- Per-request write position ----------
+class WritePosition:
+    """
+    What the current request has to be able to read: the WAL position from
+    the client's cookie, and the one it leaves behind if it writes. Shared by
+    reference so the middleware sees what the session layer records.
+    """
+
+    __slots__ = ("seen_lsn", "written_lsn")
+
+    def __init__(self, seen_lsn: Optional[int] = None):
+        self.seen_lsn = seen_lsn
+        self.written_lsn: Optional[int] = None
+
+
+write_position: ContextVar[Optional[WritePosition]] = ContextVar(
+    "db_write_position", default=None
+)
+
+
+class _WritePositionCodec(CursorCodec):
+    SIGNING_CONTEXT = b"db-write-position:v1"
+
+
+_codec = _WritePositionCodec(settings.JWT_SECRET)
+
+
+def encode_write_cookie(lsn: int) -> str:
+    """Set-Cookie value carrying a WAL position for the read-your-writes window."""
+    cookie = SimpleCookie()
+    name = settings.DB_WRITE_POSITION_COOKIE
+    cookie[name] = _codec.encode({"lsn": lsn})
+    cookie[name]["max-age"] = settings.DB_READ_YOUR_WRITES_SECONDS
+    cookie[name]["path"] = "/"
+    cookie[name]["httponly"] = True
+    cookie[name]["samesite"] = "Lax"
+    if settings.ENVIRONMENT == "production":
+        cookie[name]["secure"] = True
+    return cookie[name].OutputString()
+
+
+def decode_write_cookie(value: Optional[str]) -> Optional[int]:
+    """The WAL position in a write-position cookie; None if absent or forged."""
+    if not value:
+        return None
+    try:
+        lsn = _codec.decode(value).get("lsn")
+    except InvalidInput:
+        return None
+    return lsn if isinstance(lsn, int) else None
+
+
+# ---------- Replica set ----------
+class Replica:
+    """One replica engine and what is known about its replay progress."""
+
+    __slots__ = ("name", "engine", "session_factory", "replay_lsn", "healthy")
+
+    def __init__(self, name: str, engine: AsyncEngine):
+        self.name = name
+        self.engine = engine
+        self.session_factory = async_sessionmaker(
+            bind=engine, class_=AsyncSession, expire_on_commit=False
+        )
+        self.replay_lsn = 0
+        # Out of rotation until the first lag check passes
+        self.healthy = False
+
+
+class ReplicaSet:
+    """Health-checked, round-robin rotation over the configured replicas."""
+
+    def __init__(self, replicas: List[Replica]):
+        self._replicas = replicas
+        self._counter = itertools.count()
+        self._monitor: Optional[asyncio.Task] = None
+
+    def __bool__(self) -> bool:
+        return bool(self._replicas)
+
+    def __iter__(self) -> Iterator[Replica]:
+        return iter(self._replicas)
+
+    def choose(self, min_lsn: Optional[int] = None) -> Optional[Replica]:
+        """
+        Next healthy replica that has replayed at least `min_lsn`, or None to
+        read from the primary. Replay positions only grow, so the last checked
+        value is a safe lower bound.
+        """
+        candidates = [
+            replica
+            for replica in self._replicas
+            if replica.healthy and (min_lsn is None or replica.replay_lsn >= min_lsn)
+        ]
+        if not candidates:
+            return None
+        return candidates[next(self._counter) % len(candidates)]
+
+    async def check(self, primary: AsyncEngine) -> None:
+        """Measure every replica's lag against the primary and update the rotation."""
+        try:
+            async with primary.connect() as connection:
+                primary_lsn = (await connection.execute(PRIMARY_LSN_SQL)).scalar_one()
+        except (SQLAlchemyError, OSError) as e:
+            # Without a reference point keep the current rotation
+            logger.warning(f"Replica lag check skipped, primary unavailable: {e}")
+            return
+
+        timeout = settings.DB_REPLICA_CHECK_INTERVAL
+        for replica in self._replicas:
+            try:
+                replay_lsn = await asyncio.wait_for(
+                    self._replay_lsn(replica), timeout=timeout
+                )
+            except (SQLAlchemyError, OSError, asyncio.TimeoutError) as e:
+                self._set_health(replica, False, f"unreachable ({e!r})")
+                continue
+            if replay_lsn is None:
+                self._set_health(replica, False, "not in recovery, not a replica")
+                continue
+
+            replica.replay_lsn = replay_lsn
+            lag = primary_lsn - replay_lsn
+            self._set_health(
+                replica,
+                lag <= settings.DB_REPLICA_MAX_LAG_BYTES,
+                f"{lag} bytes behind",
+            )
+
+    async def _replay_lsn(self, replica: Replica) -> Optional[int]:
+        async with replica.engine.connect() as connection:
+            return (await connection.execute(REPLAY_LSN_SQL)).scalar_one()
+
+    def _set_health(self, replica: Replica, healthy: bool, reason: str) -> None:
+        if healthy != replica.healthy:
+            log = logger.info if healthy else logger.warning
+            state = "back in" if healthy else "out of"
+            log(f"Replica {replica.name} {state} rotation: {reason}")
+        replica.healthy = healthy
+
+    async def _monitor_loop(self, primary: AsyncEngine) -> None:
+        while True:
+            try:
+                await self.check(primary)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Replica lag check failed.")
+            await asyncio.sleep(settings.DB_REPLICA_CHECK_INTERVAL)
+
+    def start_monitor(self, primary: AsyncEngine) -> None:
+        """Start the periodic lag check (no-op without replicas)."""
+        if self._replicas and self._monitor is None:
+            self._monitor = asyncio.create_task(self._monitor_loop(primary))
+
+    async def stop_monitor(self) -> None:
+        if self._monitor is not None:
+            self._monitor.cancel()
+            try:
+                await self._monitor
+            except asyncio.CancelledError:
+                pass
+            self._monitor = None
+
+    async def dispose(self) -> None:
+        await self.stop_monitor()
+        for replica in self._replicas:
+            await replica.engine.dispose()
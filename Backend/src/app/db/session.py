@@ -1,29 +1,103 @@
 import logging
+import time
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Dict, List, Optional, Tuple
 
 from app.core.exceptions import InternalServerError
 
-from sqlalchemy import text
+from sqlalchemy import event, text
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from app.core.config import settings
+from app.core.metrics import db_pool_connections, db_pool_wait
+from app.db.instrumentation import sql_instrumentation
+from app.db.replicas import (
+    PRIMARY_LSN_SQL,
+    Replica,
+    ReplicaSet,
+    write_position,
+)
 
 # Setup logging
 logger = logging.getLogger(__name__)
 
 
+class _WriteTrackingSession(Session):
+    """Sync session behind primary AsyncSessions; notes when it writes."""
+
+
+@event.listens_for(_WriteTrackingSession, "after_flush")
+def _mark_flush_write(session, flush_context):
+    session.info["wrote"] = True
+
+
+@event.listens_for(_WriteTrackingSession, "do_orm_execute")
+def _mark_statement_write(orm_execute_state):
+    if (
+        orm_execute_state.is_insert
+        or orm_execute_state.is_update
+        or orm_execute_state.is_delete
+    ):
+        orm_execute_state.session.info["wrote"] = True
+
+
+class _TimedPool(AsyncAdaptedQueuePool):
+    """Queue pool recording how long each checkout waits for a connection."""
+
+    metrics_label = "primary"
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            db_pool_wait.observe(time.perf_counter() - start, self.metrics_label)
+
+
+def _timed_pool(label: str) -> type:
+    # A class per pool, since the engine instantiates (and recreates) it
+    return type(f"TimedPool[{label}]", (_TimedPool,), {"metrics_label": label})
+
+
+class PrimarySession(AsyncSession):
+    """
+    Session on the primary. After committing a write it records the primary's
+    WAL position for the request, so the client's next reads can avoid
+    replicas that have not replayed it yet.
+    """
+
+    sync_session_class = _WriteTrackingSession
+
+    async def commit(self) -> None:
+        wrote = self.info.pop("wrote", False)
+        await super().commit()
+        position = write_position.get()
+        if wrote and position is not None:
+            lsn = (await self.execute(PRIMARY_LSN_SQL)).scalar_one()
+            position.written_lsn = max(lsn, position.written_lsn or 0)
+
+    async def rollback(self) -> None:
+        self.info.pop("wrote", None)
+        await super().rollback()
+
+
 class Database:
     """
     Manages the database connection, session creation, and engine lifecycle.
+
+    Writes and ordinary requests use the primary; `get_read_session` spreads
+    read-only endpoints over the replicas when any are configured.
     """
 
-    def __init__(self, db_url: str):
+    def __init__(self, db_url: str, replica_urls: Optional[List[str]] = None):
         # --- Tuneable connection pool settings for production performance ---
         self._engine = create_async_engine(
             db_url,
             echo=settings.DB_ECHO,
+            poolclass=_timed_pool("primary"),
             pool_size=settings.DB_POOL_SIZE,
             max_overflow=settings.DB_MAX_OVERFLOW,
             pool_recycle=settings.DB_POOL_RECYCLE,
@@ -31,9 +105,48 @@ class Database:
         )
         self._session_factory = async_sessionmaker(
             bind=self._engine,
-            class_=AsyncSession,
+            class_=PrimarySession,
             expire_on_commit=False,
         )
+        # Separate pools, so catalog reads never queue behind checkout writes
+        self._replicas = ReplicaSet(
+            [
+                Replica(
+                    name=f"replica-{index}",
+                    engine=create_async_engine(
+                        url,
+                        echo=settings.DB_ECHO,
+                        poolclass=_timed_pool(f"replica-{index}"),
+                        pool_size=settings.DB_REPLICA_POOL_SIZE,
+                        max_overflow=settings.DB_REPLICA_MAX_OVERFLOW,
+                        pool_recycle=settings.DB_POOL_RECYCLE,
+                        pool_timeout=settings.DB_POOL_TIMEOUT,
+                    ),
+                )
+                for index, url in enumerate(replica_urls or [])
+            ]
+        )
+        if settings.SQL_INSTRUMENTATION_ENABLED:
+            sql_instrumentation.attach(self._engine)
+            for replica in self._replicas:
+                sql_instrumentation.attach(replica.engine)
+
+    @property
+    def has_replicas(self) -> bool:
+        return bool(self._replicas)
+
+    def pool_stats(self) -> Dict[Tuple[str, str], float]:
+        """Connection counts of every pool, keyed by (pool, state)."""
+        pools = [("primary", self._engine.pool)]
+        pools.extend((replica.name, replica.engine.pool) for replica in self._replicas)
+        stats: Dict[Tuple[str, str], float] = {}
+        for name, pool in pools:
+            stats[(name, "size")] = pool.size()
+            stats[(name, "checked_out")] = pool.checkedout()
+            # Negative while the pool is below pool_size
+            stats[(name, "overflow")] = max(pool.overflow(), 0)
+            stats[(name, "idle")] = pool.checkedin()
+        return stats
 
     async def connect(self) -> None:
         """
@@ -53,9 +166,15 @@ class Database:
             # Re-raise to prevent the application from starting
             raise
 
+        # Replicas join the rotation once a lag check passes; they are optional
+        if self._replicas:
+            await self._replicas.check(self._engine)
+            self._replicas.start_monitor(self._engine)
+
     async def disconnect(self) -> None:
         """Closes the database connection pool on application shutdown."""
         logger.info("Closing database connection pool.")
+        await self._replicas.dispose()
         await self._engine.dispose()
 
     @asynccontextmanager
@@ -75,6 +194,22 @@ class Database:
             finally:
                 await session.close()
 
+    @asynccontextmanager
+    async def primary_for(
+        self, session: AsyncSession
+    ) -> AsyncGenerator[AsyncSession, None]:
+        """
+        `session` itself when it is on the primary, else a read session on the
+        primary. For loads whose result goes into a shared cache: a replica can
+        still return rows a write has just replaced, and caching them would
+        undo the write's invalidation for every reader until the entry expires.
+        """
+        if "replica" not in session.info:
+            yield session
+            return
+        async with self._session_factory() as primary:
+            yield primary
+
     async def get_session(self) -> AsyncGenerator[AsyncSession, None]:
         """
         FastAPI dependency to get a database session.
@@ -96,9 +231,35 @@ class Database:
                 await session.rollback()
                 raise
 
+    async def get_read_session(self) -> AsyncGenerator[AsyncSession, None]:
+        """
+        FastAPI dependency for read-only endpoints.
+        Yields a session on a healthy replica that has replayed the client's own
+        latest write, or on the primary when there is none. Nothing is committed.
+        Loads that fill shared caches should go through `primary_for`.
+        """
+        position = write_position.get()
+        replica = self._replicas.choose(
+            min_lsn=position.seen_lsn if position is not None else None
+        )
+        factory = replica.session_factory if replica else self._session_factory
+        async with factory() as session:
+            if replica is not None:
+                session.info["replica"] = replica.name
+            try:
+                yield session
+            except SQLAlchemyError as e:
+                logger.error("Read-only database query failed.", exc_info=e)
+                raise InternalServerError("A database error occurred.") from e
+
 
 # --- Create a single, reusable database instance ---
-db = Database(str(settings.DATABASE_URL))
+db = Database(str(settings.DATABASE_URL), settings.DATABASE_REPLICA_URLS)
+db_pool_connections.add_callback(db.pool_stats)
 
-# --- Dependency for use in FastAPI routes ---
+# --- Dependencies for use in FastAPI routes ---
 get_session = db.get_session
+get_read_session = db.get_read_session
+
+# --- For services filling shared caches from a read session ---
+primary_for = db.primary_for
@@ -1,12 +1,22 @@
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, Depends
+from fastapi import FastAPI, Depends, Response
 from typing import Dict, Any
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
 from app.core.exception_handler import register_exception_handlers
+from app.core.middleware import (
+    MetricsMiddleware,
+    QueryStatsMiddleware,
+    RateLimitHeadersMiddleware,
+    ReadYourWritesMiddleware,
+)
+from app.core.revocation import revocation_filter
 from app.db.session import db
 from app.db.redis_conn import redis_client_instance
-from app.utils.deps import get_health_status
+from app.services.cache_service import cache_service
+from app.services.metrics_service import metrics_service
+from app.services.rate_limit_service import rate_limit_service
+from app.utils.deps import get_health_status, require_metrics_token
 from app.api.v1.endpoints import (
     user,
     auth,
@@ -15,6 +25,7 @@ from app.api.v1.endpoints import (
     address,
     product,
     wishlist,
+    export,
 )
 from app.api.v1.endpoints.product_attributes import size, color, category
 from app.db import base
@@ -28,7 +39,16 @@ async def lifespan(app: FastAPI):
     """
     await db.connect()
     await redis_client_instance.connect()
+    await cache_service.start_invalidation_listener()
+    await revocation_filter.start()
+    await rate_limit_service.start_sweeper()
+    if settings.METRICS_ENABLED:
+        await metrics_service.start_publisher()
     yield
+    await metrics_service.stop_publisher()
+    await rate_limit_service.stop_sweeper()
+    await revocation_filter.stop()
+    await cache_service.stop_invalidation_listener()
     await redis_client_instance.disconnect()
     await db.disconnect()
 
@@ -56,14 +76,32 @@ def create_application() -> FastAPI:
     app.include_router(address.router)
     app.include_router(product.router)
     app.include_router(wishlist.router)
+    app.include_router(export.router)
 
+    app.add_middleware(RateLimitHeadersMiddleware)
+    if db.has_replicas:
+        app.add_middleware(ReadYourWritesMiddleware)
+    if settings.SQL_INSTRUMENTATION_ENABLED:
+        app.add_middleware(QueryStatsMiddleware)
     app.add_middleware(
         CORSMiddleware,
         allow_origins=[str(origin) for origin in settings.CORS_ORIGINS],
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=[
+            "X-RateLimit-Limit",
+            "X-RateLimit-Remaining",
+            "X-RateLimit-Reset",
+            "Retry-After",
+            "X-DB-Query-Count",
+            "X-DB-Query-Time-Ms",
+            "X-DB-Repeated-Queries",
+        ],
     )
+    # Outermost, so latency includes every other middleware
+    if settings.METRICS_ENABLED:
+        app.add_middleware(MetricsMiddleware)
 
     return app
 
@@ -77,3 +115,18 @@ async def health_check(health: Dict[str, Any] = Depends(get_health_status)):
     Health check endpoint that provides status and version info.
     """
     return health
+
+
+if settings.METRICS_ENABLED and settings.METRICS_TOKEN:
+
+    @app.get(
+        "/metrics",
+        include_in_schema=False,
+        dependencies=[Depends(require_metrics_token)],
+    )
+    async def metrics():
+        """Prometheus scrape endpoint, merged across all workers."""
+        return Response(
+            content=await metrics_service.render(),
+            media_type="text/plain; version=0.0.4; charset=utf-8",
+        )
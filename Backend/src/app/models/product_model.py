@@ -10,11 +10,17 @@ from sqlalchemy import (
     DateTime,
     Text,
     Integer,
+    Boolean,
     CheckConstraint,
     UniqueConstraint,
+    Computed,
+    Index,
+    text,
 )
 from sqlalchemy.dialects.postgresql import (
     UUID as PG_UUID,
+    ARRAY,
+    TSVECTOR,
 )
 from sqlmodel import Field, SQLModel, Relationship
 
@@ -106,8 +112,36 @@ class Category(SQLModel, table=True):
     )
 
 
+# Weighted document for full-text search: name (A) > brand (B) > description (C).
+# The 'english' config must match app.crud.search.SEARCH_CONFIG.
+PRODUCT_SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('english', coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(brand, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'C')"
+)
+
+
 class Product(SQLModel, table=True):
     __tablename__ = "products"
+    __table_args__ = (
+        Index("ix_products_search_vector", "search_vector", postgresql_using="gin"),
+        # Trigram indexes for typo-tolerant matching on short queries
+        Index(
+            "ix_products_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_products_brand_trgm",
+            "brand",
+            postgresql_using="gin",
+            postgresql_ops={"brand": "gin_trgm_ops"},
+        ),
+        # Listing projection: containment/overlap filters on variant attributes
+        Index("ix_products_size_ids", "size_ids", postgresql_using="gin"),
+        Index("ix_products_color_ids", "color_ids", postgresql_using="gin"),
+    )
 
     id: uuid.UUID = Field(
         default_factory=uuid.uuid4,
@@ -124,6 +158,50 @@ class Product(SQLModel, table=True):
     )
     description: str = Field(sa_column=Column(Text, nullable=False))
     brand: str = Field(sa_column=Column(String(100), index=True, nullable=False))
+    # Maintained by Postgres on every write; never set from Python
+    search_vector: Optional[str] = Field(
+        default=None,
+        sa_column=Column(
+            TSVECTOR, Computed(PRODUCT_SEARCH_VECTOR_SQL, persisted=True)
+        ),
+    )
+
+    # --- Listing projection over variants ---
+    # Kept in sync by ProductRepository.refresh_listing_projection in the same
+    # transaction as every variant write, so listings never join variants.
+    # Prices are effective (discount-aware); null while there are no variants.
+    min_price_in_cents: Optional[int] = Field(
+        default=None, sa_column=Column(Integer, index=True, nullable=True)
+    )
+    max_price_in_cents: Optional[int] = Field(
+        default=None, sa_column=Column(Integer, index=True, nullable=True)
+    )
+    total_stock: int = Field(
+        default=0,
+        sa_column=Column(Integer, server_default="0", default=0, nullable=False),
+    )
+    in_stock: Optional[bool] = Field(
+        default=None,
+        sa_column=Column(Boolean, Computed("total_stock > 0"), index=True),
+    )
+    size_ids: List[uuid.UUID] = Field(
+        default_factory=list,
+        sa_column=Column(
+            ARRAY(PG_UUID(as_uuid=True)),
+            server_default="{}",
+            default=list,
+            nullable=False,
+        ),
+    )
+    color_ids: List[uuid.UUID] = Field(
+        default_factory=list,
+        sa_column=Column(
+            ARRAY(PG_UUID(as_uuid=True)),
+            server_default="{}",
+            default=list,
+            nullable=False,
+        ),
+    )
 
     status: ProductStatus = Field(
         sa_column=Column(
@@ -207,6 +285,12 @@ class ProductVariant(SQLModel, table=True):
         CheckConstraint(
             "discount_price_in_cents <= price_in_cents", name="check_discount_valid"
         ),
+        # Public price filter: does the product have a variant in the range?
+        Index(
+            "ix_product_variants_product_effective_price",
+            "product_id",
+            text("coalesce(discount_price_in_cents, price_in_cents)"),
+        ),
     )
 
     id: uuid.UUID = Field(
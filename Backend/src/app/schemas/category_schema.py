@@ -71,15 +71,20 @@ class CategoryListResponse(BaseModel):
     """Response for paginated category list."""
 
     items: List[CategoryResponse] = Field(..., description="List of categories")
-    total: int = Field(..., ge=0, description="Total number of categories")
+    total: Optional[int] = Field(
+        None, ge=0, description="Total number of categories (null when not counted)"
+    )
     page: int = Field(..., ge=1, description="Current page number")
-    pages: int = Field(..., ge=0, description="Total number of pages")
+    pages: Optional[int] = Field(
+        None, ge=0, description="Total number of pages (null when not counted)"
+    )
     size: int = Field(..., ge=1, le=100, description="Number of items per page")
+    has_more: bool = Field(False, description="Whether another page exists")
 
     @property
     def has_next(self) -> bool:
         """Check if there's a next page."""
-        return self.page < self.pages
+        return self.has_more
 
     @property
     def has_previous(self) -> bool:
@@ -0,0 +1,26 @@
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class SlowQuerySample(BaseModel):
+    """A slow statement and the plan it got when re-run under EXPLAIN ANALYZE."""
+
+    captured_at: datetime
+    duration_ms: float = Field(..., description="Duration of the original run")
+    endpoint: Optional[str] = Field(
+        None, description="Request that ran it, e.g. 'GET /api/v1/products/'"
+    )
+    statement: str
+    plan: Optional[str] = Field(None, description="EXPLAIN (ANALYZE, BUFFERS) output")
+    error: Optional[str] = Field(None, description="Why the plan could not be taken")
+
+
+class SlowQueryListResponse(BaseModel):
+    """Sampled slow queries, newest first."""
+
+    items: List[SlowQuerySample] = Field(..., description="List of samples")
+
+
+__all__ = ["SlowQuerySample", "SlowQueryListResponse"]
@@ -0,0 +1,19 @@
+from enum import Enum
+
+
+class ExportDataset(str, Enum):
+    """Tables that can be exported."""
+
+    PRODUCTS = "products"  # products with their variants
+    USERS = "users"
+    ORDERS = "orders"  # orders with their items
+
+
+class ExportFormat(str, Enum):
+    """Export file formats."""
+
+    NDJSON = "ndjson"  # one JSON document per line
+    CSV = "csv"  # flat rows; products and orders repeat per variant / item
+
+
+__all__ = ["ExportDataset", "ExportFormat"]
@@ -1,4 +1,5 @@
 import uuid
+from enum import Enum
 from fastapi import Query
 from typing import Optional, List, Dict, Any
 from datetime import datetime, date
@@ -210,24 +211,97 @@ class ProductVariantResponse(BaseModel):
 
 
 # ======== LIST & SEARCH SCHEMAS ========
+class FacetCount(BaseModel):
+    """Number of matching products for one facet value."""
+
+    value: str = Field(..., description="Facet value (an ID or enum value)")
+    count: int = Field(..., ge=0, description="Matching active products")
+
+
+class PriceRangeFacet(BaseModel):
+    """Number of matching products with a variant in a price range."""
+
+    min_price: int = Field(..., ge=0, description="Lower bound in cents (inclusive)")
+    max_price: Optional[int] = Field(
+        None, description="Upper bound in cents (inclusive); null if unbounded"
+    )
+    count: int = Field(..., ge=0, description="Matching active products")
+
+
+class ProductFacets(BaseModel):
+    """
+    Facet counts for a public listing. Each facet applies every active filter
+    except its own, so the counts show what selecting another value would give.
+    """
+
+    sizes: List[FacetCount] = Field(default_factory=list)
+    colors: List[FacetCount] = Field(default_factory=list)
+    categories: List[FacetCount] = Field(default_factory=list)
+    genders: List[FacetCount] = Field(default_factory=list)
+    price_ranges: List[PriceRangeFacet] = Field(default_factory=list)
+
+
 class ProductListResponse(BaseModel):
     """Paginated response for products."""
 
     items: List[ProductResponse] = Field(..., description="List of products")
-    total: int = Field(..., ge=0, description="Total number of products")
+    total: Optional[int] = Field(
+        None, ge=0, description="Total number of products (null when not counted)"
+    )
     page: int = Field(..., ge=1, description="Current page number")
-    pages: int = Field(..., ge=0, description="Total pages")
+    pages: Optional[int] = Field(
+        None, ge=0, description="Total pages (null when not counted)"
+    )
     size: int = Field(..., ge=1, le=100, description="Items per page")
+    has_more: bool = Field(False, description="Whether another page exists")
+    next_cursor: Optional[str] = Field(
+        None,
+        description="Opaque cursor for the next page (keyset pagination); null on the last page",
+    )
+    facets: Optional[ProductFacets] = Field(
+        None, description="Facet counts, present when requested with facets=true"
+    )
 
     @property
     def has_next(self) -> bool:
-        return self.page < self.pages
+        return self.has_more
 
     @property
     def has_previous(self) -> bool:
         return self.page > 1
 
 
+# =============BULK IMPORT======================
+class ProductImportFormat(str, Enum):
+    """Upload formats accepted by the bulk product import."""
+
+    NDJSON = "ndjson"  # one ProductCreate object per line
+    CSV = "csv"  # one variant per row, rows of a product contiguous
+
+
+class ProductImportError(BaseModel):
+    """A rejected row of a bulk import."""
+
+    line: int = Field(..., ge=1, description="Line (or CSV record) number")
+    sku: Optional[str] = Field(None, description="Variant SKU, when row-specific")
+    message: str = Field(..., description="Why the row was rejected")
+
+
+class ProductImportResult(BaseModel):
+    """Outcome of a bulk product import."""
+
+    products_created: int = Field(0, ge=0)
+    variants_created: int = Field(0, ge=0)
+    images_created: int = Field(0, ge=0)
+    products_rejected: int = Field(
+        0, ge=0, description="Products skipped; any error rejects all of its rows"
+    )
+    errors: List[ProductImportError] = Field(default_factory=list)
+    errors_truncated: bool = Field(
+        False, description="Whether more errors occurred than are listed"
+    )
+
+
 class ProductSearchParams(BaseModel):
     """Parameters for searching products."""
 
@@ -288,6 +362,9 @@ class ProductPublicSearchParams(BaseModel):
         description="Maximum product price in cents (must be non-negative).",
         examples=[10000],
     )
+    in_stock: Optional[bool] = Field(
+        None, description="Only products with (or without) stock left."
+    )
     created_after: Optional[date] = Field(None, description="Created after date")
     created_before: Optional[date] = Field(None, description="Created before date")
 
@@ -325,14 +402,19 @@ class ProductVariantListResponse(BaseModel):
     """Paginated response for products."""
 
     items: List[ProductVariantResponse] = Field(..., description="List of products")
-    total: int = Field(..., ge=0, description="Total number of products")
+    total: Optional[int] = Field(
+        None, ge=0, description="Total number of products (null when not counted)"
+    )
     page: int = Field(..., ge=1, description="Current page number")
-    pages: int = Field(..., ge=0, description="Total pages")
+    pages: Optional[int] = Field(
+        None, ge=0, description="Total pages (null when not counted)"
+    )
     size: int = Field(..., ge=1, le=100, description="Items per page")
+    has_more: bool = Field(False, description="Whether another page exists")
 
     @property
     def has_next(self) -> bool:
-        return self.page < self.pages
+        return self.has_more
 
     @property
     def has_previous(self) -> bool:
@@ -365,6 +447,9 @@ __all__ = [
     "ProductResponse",
     "ProductListResponse",
     "ProductSearchParams",
+    "ProductImportFormat",
+    "ProductImportError",
+    "ProductImportResult",
     # Product Images
     "ProductImageBase",
     "ProductImageCreate",
@@ -1,6 +1,6 @@
 import uuid
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 from pydantic import BaseModel, Field, ConfigDict
 from .product_schema import ProductResponse
 
@@ -18,15 +18,20 @@ class WishlistListResponse(BaseModel):
     """Response for paginated wishlist list."""
 
     items: List[WishlistResponse] = Field(..., description="List of wishlist items")
-    total: int = Field(..., ge=0, description="Total number of wishlist items")
+    total: Optional[int] = Field(
+        None, ge=0, description="Total number of wishlist items (null when not counted)"
+    )
     page: int = Field(..., ge=1, description="Current page number")
-    pages: int = Field(..., ge=0, description="Total number of pages")
+    pages: Optional[int] = Field(
+        None, ge=0, description="Total number of pages (null when not counted)"
+    )
     size: int = Field(..., ge=1, le=100, description="Number of items per page")
+    has_more: bool = Field(False, description="Whether another page exists")
 
     @property
     def has_next(self) -> bool:
         """Check if there's a next page."""
-        return self.page < self.pages
+        return self.has_more
 
     @property
     def has_previous(self) -> bool:
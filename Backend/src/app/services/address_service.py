@@ -5,6 +5,7 @@ from datetime import datetime, timezone
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 from app.crud.address_crud import address_repository
+from app.crud.pagination import CountStrategy
 from app.schemas.address_schema import (
     AddressCreate,
     AddressResponse,
@@ -111,6 +112,7 @@ class AddressService:
         filters: Optional[Dict[str, Any]] = None,
         order_by: str = "created_at",
         order_desc: bool = True,
+        count_strategy: CountStrategy = CountStrategy.EXACT,
     ) -> AddressListResponse:
         """
         Lists addresses with pagination and filtering.
@@ -136,7 +138,7 @@ class AddressService:
             raise ValidationError("Limit must be between 1 and 100")
 
         # Delegate fetching to the repository
-        addresses, total = await self.address_repository.get_all_by_user(
+        page = await self.address_repository.get_all_by_user(
             db=db,
             skip=skip,
             limit=limit,
@@ -144,19 +146,16 @@ class AddressService:
             filters=filters,
             order_by=order_by,
             order_desc=order_desc,
+            count_strategy=count_strategy,
         )
 
-        # Calculate pagination info
-        page = (skip // limit) + 1
-        total_pages = (total + limit - 1) // limit  # Ceiling division
-
         # Construct the response schema
         response = AddressListResponse(
-            items=addresses, total=total, page=page, pages=total_pages, size=limit
+            items=page.items, **page.metadata(skip=skip, limit=limit)
         )
 
         self._logger.info(
-            f"Address list retrieved by {current_user.id}: {len(addresses)} addresses returned"
+            f"Address list retrieved by {current_user.id}: {len(page.items)} addresses returned"
         )
         return response
 
@@ -180,7 +179,7 @@ class AddressService:
                 current_default_id=uuid.uuid4(),  # Pass dummy ID, won't match anything
             )
         else:
-            addresses_list, _ = await self.address_repository.get_all_by_user(
+            existing_addresses = await self.address_repository.get_all_by_user(
                 db=db,
                 user_id=current_user.id,
                 skip=0,
@@ -188,8 +187,9 @@ class AddressService:
                 filters=None,
                 order_by="desc",
                 order_desc=True,
+                count_strategy=CountStrategy.NONE,
             )
-            if not addresses_list:
+            if not existing_addresses.items:
                 self._logger.info("Setting first address as default.")
                 address_to_create.is_default = True
 
@@ -249,7 +249,7 @@ class AddressService:
 
         elif unsetting_default and address_to_update.is_default:
             # Check if this is the ONLY address, if so, cannot unset default
-            all_addresses, _ = await self.address_repository.get_all_by_user(
+            existing_addresses = await self.address_repository.get_all_by_user(
                 db=db,
                 user_id=current_user.id,
                 skip=0,
@@ -257,8 +257,9 @@ class AddressService:
                 filters=None,
                 order_by="desc",
                 order_desc=True,
+                count_strategy=CountStrategy.NONE,
             )
-            if len(all_addresses) <= 1:
+            if len(existing_addresses.items) <= 1:
                 raise ValidationError(
                     "Cannot unset the default status of your only address."
                 )
@@ -297,7 +298,7 @@ class AddressService:
         )
 
         if address_to_delete.is_default:
-            all_addresses, _ = await self.address_repository.get_all_by_user(
+            existing_addresses = await self.address_repository.get_all_by_user(
                 db=db,
                 user_id=current_user.id,
                 skip=0,
@@ -305,8 +306,9 @@ class AddressService:
                 filters=None,
                 order_by="desc",
                 order_desc=True,
+                count_strategy=CountStrategy.NONE,
             )
-            if len(all_addresses) <= 1:
+            if len(existing_addresses.items) <= 1:
                 raise ValidationError(
                     "Cannot delete your only address, especially if it's the default."
                 )
@@ -18,7 +18,7 @@ from app.schemas.auth_schema import (
 )
 from app.models.user_model import User, UserRole
 from app.core.security import token_manager, TokenType, password_manager
-from app.services.cache_service import cache_service
+from app.services.principal_cache import principal_cache
 from app.core.exceptions import (
     InvalidCredentials,
     InternalServerError,
@@ -75,7 +75,7 @@ class AuthService:
         )
 
         # 3. Verify the user and password
-        password_is_valid = user and password_manager.verify_password(
+        password_is_valid = user and await password_manager.verify_password_async(
             password, user.hashed_password
         )
 
@@ -111,7 +111,7 @@ class AuthService:
         user = await user_repository.get_by_email(db=db, email=email)
 
         # 3. Verify the user and password
-        password_is_valid = user and password_manager.verify_password(
+        password_is_valid = user and await password_manager.verify_password_async(
             password, user.hashed_password
         )
 
@@ -185,12 +185,14 @@ class AuthService:
         Revokes all tokens for a user by updating the tokens_valid_from_utc timestamp.
         """
         # Set the revocation timestamp to the current time
+        valid_from = datetime.now(timezone.utc)
         await user_repository.update(
             db=db,
             user=user,
-            fields_to_update={"tokens_valid_from_utc": datetime.now(timezone.utc)},
+            fields_to_update={"tokens_valid_from_utc": valid_from},
         )
-        await cache_service.invalidate(User, user.id)
+        await principal_cache.invalidate(user.id)
+        await token_manager.revoke_user_tokens(user.id, valid_from)
         self._logger.info(f"All tokens revoked for user {user.id}")
 
     # =========PASSWORD===========
@@ -201,13 +203,15 @@ class AuthService:
         Allows an authenticated user to change their own password.
         """
         # 1. Verify the user's current password is correct.
-        if not password_manager.verify_password(
+        if not await password_manager.verify_password_async(
             password_data.current_password, user.hashed_password
         ):
             raise InvalidCredentials(detail="Incorrect current password.")
 
         # 2. Hash the new password.
-        new_hashed_password = password_manager.hash_password(password_data.new_password)
+        new_hashed_password = await password_manager.hash_password_async(
+            password_data.new_password
+        )
 
         # 3. Update the password in the database.
         await user_repository.update(
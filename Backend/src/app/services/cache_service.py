@@ -1,4 +1,11 @@
+import asyncio
+import hashlib
+import json
 import logging
+import math
+import random
+import time
+import uuid
 from typing import (
     Any,
     Awaitable,
@@ -15,12 +22,26 @@ from typing import (
 
 from pydantic import BaseModel
 
+from app.core.config import settings
+from app.core.metrics import cache_requests
 from app.db.redis_conn import redis_client
+from app.schemas.category_schema import CategoryResponse
+from app.schemas.color_schema import ColorResponse
+from app.schemas.size_schema import SizeResponse
+from app.utils.ttl_cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
 SchemaType = TypeVar("SchemaType", bound=BaseModel)
 
+# Delete the fill lock only if we still own it
+_RELEASE_LOCK_LUA = """
+if redis.call("GET", KEYS[1]) == ARGV[1] then
+    return redis.call("DEL", KEYS[1])
+end
+return 0
+"""
+
 
 class CacheService:
     """
@@ -32,6 +53,17 @@ class CacheService:
     - Namespace and version prefixing for clean segmentation and bulk invalidation.
     - Per-model TTL overrides.
     - get_or_set convenience to fetch on miss and populate the cache.
+    - Query-result cache: whole rendered list pages keyed by a canonical hash of
+      their parameters, tagged with the entity IDs they contain and invalidated
+      by tag.
+    - Optional in-process L1 tier (bounded LRU + TTL, per schema) in front of
+      Redis. Invalidations are broadcast over Redis pub/sub so every worker
+      evicts its L1 copy; each tier keeps hit/miss counters (see `stats`).
+    - get_or_set coalesces concurrent misses (single-flight): one load per key
+      per worker via a shared future, and one per cluster via a short Redis
+      lock. Optional XFetch early refresh renews hot keys before they expire.
+    - Batch get_many / set_many / invalidate_many on MGET and pipelines, with
+      get_many reporting the misses so callers can load only the gaps.
 
     Notes:
     - We only cache schemas (never raw SQLAlchemy models) for security and speed.
@@ -51,6 +83,9 @@ class CacheService:
         dump_by_alias: bool = False,
         dump_exclude_none: bool = False,
         validate_strict: bool = False,
+        local_limits: Optional[Dict[Type[BaseModel], Tuple[int, float]]] = None,
+        invalidation_channel: Optional[str] = None,
+        fill_lock_timeout: float = 5.0,
     ):
         self.default_ttl = int(ttl)
         self.namespace = namespace
@@ -62,8 +97,33 @@ class CacheService:
         self.dump_exclude_none = dump_exclude_none
         self.validate_strict = validate_strict
 
+        # L1: schema name -> LRU of key -> JSON, for schemas given (maxsize, ttl)
+        self._local: Dict[str, TTLCache[str]] = {
+            self._schema_name(schema_type): TTLCache(maxsize=maxsize, ttl=ttl)
+            for schema_type, (maxsize, ttl) in (local_limits or {}).items()
+        }
+        self.invalidation_channel = invalidation_channel
+        # Lets a worker recognise (and skip) its own broadcasts
+        self._instance_id = uuid.uuid4().hex
+        self._listener_task: Optional[asyncio.Task] = None
+        self._l2_hits = 0
+        self._l2_misses = 0
+
+        # Single-flight: key -> future of (model, json) for loads in progress
+        self._inflight: Dict[str, "asyncio.Future[Tuple[Any, Optional[str]]]"] = {}
+        # How long a worker may hold the fill lock, and others wait on it
+        self.fill_lock_timeout = float(fill_lock_timeout)
+        self._release_lock = redis_client.register_script(_RELEASE_LOCK_LUA)
+
     # ---------- TTL helpers ----------
 
+    def _count(
+        self, schema_type: Type[BaseModel], result: str, amount: int = 1
+    ) -> None:
+        """Record lookups per schema: result is 'hit', 'miss' or 'error'."""
+        if amount:
+            cache_requests.inc(self._schema_name(schema_type), result, amount=amount)
+
     def _ttl_for(self, schema_type: Type[SchemaType]) -> int:
         return int(self.ttl_overrides.get(schema_type, self.default_ttl))
 
@@ -204,14 +264,13 @@ class CacheService:
         """
         key = self._key_for_id(schema_type, obj_id)
         try:
-            cached = await redis_client.get(key)
-            if not cached:
+            cached = await self._fetch_json(schema_type, key)
+            if cached is None:
                 return None
-            if isinstance(cached, bytes):
-                cached = cached.decode("utf-8")
             return schema_type.model_validate_json(cached, strict=self.validate_strict)
         except Exception:
             logger.warning("Cache lookup failed for key: %s", key, exc_info=True)
+            self._count(schema_type, "error")
             return None
 
     async def set(self, obj: SchemaType, *, ttl: Optional[int] = None) -> None:
@@ -229,15 +288,107 @@ class CacheService:
             return
 
         try:
-            payload = obj.model_dump_json(
-                by_alias=self.dump_by_alias, exclude_none=self.dump_exclude_none
-            )
-            await redis_client.set(
-                key, payload, ex=int(ttl or self._ttl_for(type(obj)))
+            await self._store_json(
+                type(obj),
+                key,
+                self._dump_json(obj),
+                ttl=ttl or self._ttl_for(type(obj)),
             )
         except Exception:
             logger.warning("Failed to cache object with key: %s", key, exc_info=True)
 
+    def _dump_json(self, obj: SchemaType) -> str:
+        return obj.model_dump_json(
+            by_alias=self.dump_by_alias, exclude_none=self.dump_exclude_none
+        )
+
+    async def _fetch_json(
+        self, schema_type: Type[SchemaType], key: str
+    ) -> Optional[str]:
+        """Read through L1 (if enabled for the schema) to Redis."""
+        local = self._local.get(self._schema_name(schema_type))
+        if local is not None:
+            cached = local.get(key)
+            if cached is not None:
+                self._count(schema_type, "hit")
+                return cached
+
+        cached = await redis_client.get(key)
+        if not cached:
+            self._l2_misses += 1
+            self._count(schema_type, "miss")
+            return None
+        self._l2_hits += 1
+        self._count(schema_type, "hit")
+        if isinstance(cached, bytes):
+            cached = cached.decode("utf-8")
+        if local is not None:
+            local.set(key, cached)
+        return cached
+
+    async def _fetch_json_for_refresh(
+        self, schema_type: Type[SchemaType], key: str, beta: float
+    ) -> Tuple[Optional[str], bool]:
+        """
+        Like _fetch_json, but also decide (XFetch) whether this caller should
+        recompute the entry early. Costs one pipelined round trip on an L2 read.
+        """
+        local = self._local.get(self._schema_name(schema_type))
+        if local is not None:
+            cached = local.get(key)
+            if cached is not None:
+                self._count(schema_type, "hit")
+                return cached, False
+
+        async with redis_client.pipeline(transaction=False) as pipe:
+            pipe.get(key)
+            pipe.pttl(key)
+            pipe.get(self._delta_key(key))
+            cached, ttl_ms, delta_ms = await pipe.execute()
+
+        if not cached:
+            self._l2_misses += 1
+            self._count(schema_type, "miss")
+            return None, False
+        self._l2_hits += 1
+        self._count(schema_type, "hit")
+        if isinstance(cached, bytes):
+            cached = cached.decode("utf-8")
+
+        # XFetch: refresh with probability rising as expiry approaches, scaled
+        # by how long the value took to compute (delta) and beta.
+        refresh = False
+        if delta_ms and ttl_ms and ttl_ms > 0:
+            gap = float(delta_ms) * beta * -math.log(1.0 - random.random())
+            refresh = gap >= ttl_ms
+        if local is not None and not refresh:
+            local.set(key, cached)
+        return cached, refresh
+
+    def _delta_key(self, key: str) -> str:
+        return f"{key}:delta"
+
+    async def _store_json(
+        self,
+        schema_type: Type[SchemaType],
+        key: str,
+        payload: str,
+        *,
+        ttl: int,
+        delta_ms: Optional[int] = None,
+    ) -> None:
+        if delta_ms is None:
+            await redis_client.set(key, payload, ex=int(ttl))
+        else:
+            # Recompute time for XFetch lives next to the value, same lifetime
+            async with redis_client.pipeline(transaction=False) as pipe:
+                pipe.set(key, payload, ex=int(ttl))
+                pipe.set(self._delta_key(key), delta_ms, ex=int(ttl))
+                await pipe.execute()
+        local = self._local.get(self._schema_name(schema_type))
+        if local is not None:
+            local.set(key, payload, ttl=min(local.ttl, ttl))
+
     async def invalidate(
         self,
         schema_type: Type[SchemaType],
@@ -247,11 +398,133 @@ class CacheService:
         Invalidate a single cached entry.
         """
         key = self._key_for_id(schema_type, obj_id)
+        local = self._local.get(self._schema_name(schema_type))
+        if local is not None:
+            local.pop(key)
         try:
             await redis_client.delete(key)
+            await self._publish_invalidation(schema_type, [key])
         except Exception:
             logger.warning("Failed to invalidate cache for key: %s", key, exc_info=True)
 
+    async def get_many(
+        self,
+        schema_type: Type[SchemaType],
+        obj_ids: Iterable[Any],
+    ) -> Tuple[Dict[Any, SchemaType], List[Any]]:
+        """
+        Retrieve many cached instances in one round trip (L1 first, then MGET).
+
+        Returns (found, missing): found maps each cached ID to its instance and
+        missing lists the other IDs in input order, ready for a single
+        `WHERE id IN (...)` load.
+        """
+        ids = list(dict.fromkeys(obj_ids))  # De-duplicate, keep order
+        keys = {obj_id: self._key_for_id(schema_type, obj_id) for obj_id in ids}
+        raw: Dict[Any, str] = {}
+
+        local = self._local.get(self._schema_name(schema_type))
+        pending = ids
+        if local is not None:
+            pending = []
+            for obj_id in ids:
+                cached = local.get(keys[obj_id])
+                if cached is None:
+                    pending.append(obj_id)
+                else:
+                    raw[obj_id] = cached
+            self._count(schema_type, "hit", len(raw))
+
+        if pending:
+            try:
+                values = await redis_client.mget([keys[obj_id] for obj_id in pending])
+            except Exception:
+                logger.warning(
+                    "Cache multi-get failed for %s", schema_type.__name__, exc_info=True
+                )
+                self._count(schema_type, "error", len(pending))
+                values = [None] * len(pending)
+            hits = sum(1 for cached in values if cached)
+            self._count(schema_type, "hit", hits)
+            self._count(schema_type, "miss", len(pending) - hits)
+            for obj_id, cached in zip(pending, values):
+                if not cached:
+                    self._l2_misses += 1
+                    continue
+                self._l2_hits += 1
+                if isinstance(cached, bytes):
+                    cached = cached.decode("utf-8")
+                raw[obj_id] = cached
+                if local is not None:
+                    local.set(keys[obj_id], cached)
+
+        found: Dict[Any, SchemaType] = {}
+        for obj_id, cached in raw.items():
+            model = self._from_json(schema_type, cached, False)
+            if model is not None:
+                found[obj_id] = model
+        missing = [obj_id for obj_id in ids if obj_id not in found]
+        return found, missing
+
+    async def set_many(
+        self, objs: Iterable[SchemaType], *, ttl: Optional[int] = None
+    ) -> None:
+        """Cache many schema instances with one pipelined round trip."""
+        entries = []
+        for obj in objs:
+            try:
+                key = self._key_for_obj(obj)
+                entries.append((type(obj), key, self._dump_json(obj)))
+            except Exception:
+                logger.warning(
+                    "Attempted to cache object of type %s but could not derive key.",
+                    type(obj).__name__,
+                    exc_info=True,
+                )
+        if not entries:
+            return
+
+        try:
+            async with redis_client.pipeline(transaction=False) as pipe:
+                for schema_type, key, payload in entries:
+                    pipe.set(key, payload, ex=int(ttl or self._ttl_for(schema_type)))
+                await pipe.execute()
+        except Exception:
+            logger.warning("Failed to cache %d objects", len(entries), exc_info=True)
+            return
+
+        for schema_type, key, payload in entries:
+            local = self._local.get(self._schema_name(schema_type))
+            if local is not None:
+                expire = ttl or self._ttl_for(schema_type)
+                local.set(key, payload, ttl=min(local.ttl, expire))
+
+    async def invalidate_many(
+        self,
+        entries: Iterable[Tuple[Type[BaseModel], Any]],
+    ) -> None:
+        """
+        Invalidate many entries, possibly of different schemas, with a single DEL,
+        e.g. [(ProductVariantResponse, variant_id), (ProductResponse, product_id)].
+        """
+        by_schema: Dict[Type[BaseModel], List[str]] = {}
+        for schema_type, obj_id in entries:
+            key = self._key_for_id(schema_type, obj_id)
+            by_schema.setdefault(schema_type, []).append(key)
+            local = self._local.get(self._schema_name(schema_type))
+            if local is not None:
+                local.pop(key)
+        if not by_schema:
+            return
+
+        keys = [key for schema_keys in by_schema.values() for key in schema_keys]
+        try:
+            await redis_client.delete(*keys)
+            for schema_type, schema_keys in by_schema.items():
+                await self._publish_invalidation(schema_type, schema_keys)
+        except Exception:
+            logger.warning("Failed to invalidate cache keys: %s", keys, exc_info=True)
+
     async def get_json(
         self,
         schema_type: Type[SchemaType],
@@ -262,47 +535,438 @@ class CacheService:
         """
         key = self._key_for_id(schema_type, obj_id)
         try:
-            cached = await redis_client.get(key)
-            if not cached:
-                return None
-            return cached.decode("utf-8") if isinstance(cached, bytes) else cached
+            return await self._fetch_json(schema_type, key)
         except Exception:
             logger.warning("Cache lookup (raw) failed for key: %s", key, exc_info=True)
+            self._count(schema_type, "error")
             return None
 
     async def get_or_set(
         self,
         schema_type: Type[SchemaType],
         obj_id: Union[Any, Tuple[Any, ...], List[Any], Dict[str, Any]],
-        loader: Callable[[], Awaitable[Optional[SchemaType]]],
+        loader: Callable[[], Awaitable[Optional[Union[SchemaType, str]]]],
         *,
         ttl: Optional[int] = None,
         return_json: bool = False,
+        early_refresh: float = 0.0,
     ) -> Optional[Union[SchemaType, str]]:
         """
         Fetch from cache; on miss, await loader(), cache the result, and return it.
         Optionally return the cached JSON string instead of a model.
+
+        A hit costs a single GET. With return_json=True the stored JSON is handed
+        back untouched (no validate/dump round trip), so an endpoint can send it
+        as the response body as-is.
+
+        The loader may also return the schema already rendered as JSON; it is
+        cached as-is and only parsed if a model is requested.
+
+        Concurrent misses for the same key run the loader once: callers in this
+        worker share the leader's result, other workers wait for the Redis fill
+        lock holder to populate the key. `early_refresh` > 0 enables XFetch with
+        that beta (1.0 is the usual choice): a hit may be recomputed shortly
+        before expiry, while everyone else keeps being served the cached value.
         """
+        key = self._key_for_id(schema_type, obj_id)
+
         # 1) Try cache
-        cached_model = await self.get(schema_type, obj_id)
-        if cached_model is not None:
-            if return_json:
-                return await self.get_json(schema_type, obj_id)
-            return cached_model
-
-        # 2) Load on miss
-        obj = await loader()
-        if obj is None:
+        cached_json: Optional[str] = None
+        refresh = False
+        try:
+            if early_refresh > 0:
+                cached_json, refresh = await self._fetch_json_for_refresh(
+                    schema_type, key, early_refresh
+                )
+            else:
+                cached_json = await self._fetch_json(schema_type, key)
+        except Exception:
+            logger.warning("Cache lookup failed for key: %s", key, exc_info=True)
+            self._count(schema_type, "error")
+
+        if cached_json is not None and not refresh:
+            result = self._from_json(schema_type, cached_json, return_json)
+            if result is not None:
+                return result
+            cached_json = None
+
+        # 2) Load on miss (or early refresh), coalesced per key
+        obj, payload = await self._load_coalesced(
+            schema_type,
+            key,
+            loader,
+            ttl=ttl,
+            stale=cached_json,
+            track_delta=early_refresh > 0,
+        )
+        if return_json:
+            return payload
+        if obj is None and payload is not None:
+            # Another worker filled the key; we only have its JSON
+            return self._from_json(schema_type, payload, False)
+        return obj
+
+    def _from_json(
+        self, schema_type: Type[SchemaType], payload: str, return_json: bool
+    ) -> Optional[Union[SchemaType, str]]:
+        if return_json:
+            return payload
+        try:
+            return schema_type.model_validate_json(payload, strict=self.validate_strict)
+        except Exception:
+            logger.warning(
+                "Discarding undecodable cache entry for %s",
+                schema_type.__name__,
+                exc_info=True,
+            )
             return None
 
-        # Validate type (defensive)
-        if not isinstance(obj, schema_type):
-            raise TypeError(
-                f"Loader returned {type(obj).__name__}, expected {schema_type.__name__}"
+    async def _load_coalesced(
+        self,
+        schema_type: Type[SchemaType],
+        key: str,
+        loader: Callable[[], Awaitable[Optional[SchemaType]]],
+        *,
+        ttl: Optional[int],
+        stale: Optional[str],
+        track_delta: bool,
+    ) -> Tuple[Optional[SchemaType], Optional[str]]:
+        """Run at most one load per key in this worker; others await its result."""
+        while True:
+            inflight = self._inflight.get(key)
+            if inflight is None:
+                break
+            try:
+                return await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                # The leader was cancelled (client went away); take over unless
+                # it is us being cancelled.
+                if not inflight.cancelled():
+                    raise
+
+        future: "asyncio.Future[Tuple[Any, Optional[str]]]" = (
+            asyncio.get_running_loop().create_future()
+        )
+        self._inflight[key] = future
+        try:
+            result = await self._load_with_lock(
+                schema_type,
+                key,
+                loader,
+                ttl=ttl,
+                stale=stale,
+                track_delta=track_delta,
             )
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            future.exception()  # Mark retrieved: waiters are optional
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    async def _load_with_lock(
+        self,
+        schema_type: Type[SchemaType],
+        key: str,
+        loader: Callable[[], Awaitable[Optional[SchemaType]]],
+        *,
+        ttl: Optional[int],
+        stale: Optional[str],
+        track_delta: bool,
+    ) -> Tuple[Optional[SchemaType], Optional[str]]:
+        lock_key = f"{key}:lock"
+        token = uuid.uuid4().hex
+        try:
+            acquired = await redis_client.set(
+                lock_key, token, nx=True, px=int(self.fill_lock_timeout * 1000)
+            )
+        except Exception:
+            logger.warning("Could not take fill lock: %s", lock_key, exc_info=True)
+            acquired, token = False, None
+
+        if not acquired and token is not None:
+            if stale is not None:
+                # Another worker is already refreshing; keep serving what we have
+                return None, stale
+            payload = await self._wait_for_fill(schema_type, key, lock_key)
+            if payload is not None:
+                return None, payload
+            # The holder gave up or is too slow: load it ourselves
+
+        try:
+            started = time.monotonic()
+            obj = await loader()
+            if obj is None:
+                return None, None
+
+            if isinstance(obj, str):
+                # Loader rendered the schema's JSON itself (e.g. in SQL)
+                payload, obj = obj, None
+            else:
+                # Validate type (defensive)
+                if not isinstance(obj, schema_type):
+                    raise TypeError(
+                        f"Loader returned {type(obj).__name__}, "
+                        f"expected {schema_type.__name__}"
+                    )
+
+                # Serialize once and reuse the payload for Redis and the caller
+                payload = self._dump_json(obj)
+            delta_ms = int((time.monotonic() - started) * 1000) if track_delta else None
+            try:
+                await self._store_json(
+                    schema_type,
+                    key,
+                    payload,
+                    ttl=ttl or self._ttl_for(schema_type),
+                    delta_ms=delta_ms,
+                )
+            except Exception:
+                logger.warning(
+                    "Failed to cache object with key: %s", key, exc_info=True
+                )
+            return obj, payload
+        finally:
+            if acquired:
+                try:
+                    await self._release_lock(keys=[lock_key], args=[token])
+                except Exception:
+                    logger.warning(
+                        "Could not release fill lock: %s", lock_key, exc_info=True
+                    )
+
+    async def _wait_for_fill(
+        self, schema_type: Type[SchemaType], key: str, lock_key: str
+    ) -> Optional[str]:
+        """Poll until the lock holder fills the key, drops the lock or we time out."""
+        deadline = time.monotonic() + self.fill_lock_timeout
+        delay = 0.01
+        while time.monotonic() < deadline:
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 0.2)
+            try:
+                async with redis_client.pipeline(transaction=False) as pipe:
+                    pipe.get(key)
+                    pipe.exists(lock_key)
+                    cached, locked = await pipe.execute()
+            except Exception:
+                logger.warning("Fill wait failed for key: %s", key, exc_info=True)
+                return None
+            if cached:
+                if isinstance(cached, bytes):
+                    cached = cached.decode("utf-8")
+                local = self._local.get(self._schema_name(schema_type))
+                if local is not None:
+                    local.set(key, cached)
+                return cached
+            if not locked:
+                return None
+        return None
+
+    # ---------- Query-result (page) cache ----------
+
+    @staticmethod
+    def tag(kind: str, obj_id: Any) -> str:
+        """Build an invalidation tag, e.g. tag("product", id) -> "product:<id>"."""
+        return f"{kind}:{obj_id}"
+
+    def _query_key(self, schema_type: Type[SchemaType], params: Dict[str, Any]) -> str:
+        # Canonical JSON so logically equal parameter sets hash identically
+        canonical = json.dumps(
+            params, sort_keys=True, separators=(",", ":"), default=str
+        )
+        digest = hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+        return f"{self._prefix(schema_type)}:query:{digest}"
 
-        await self.set(obj, ttl=ttl)
-        return await self.get_json(schema_type, obj_id) if return_json else obj
+    def _tag_key(self, tag: str) -> str:
+        parts: List[str] = []
+        if self.namespace:
+            parts.append(self.namespace)
+        if self.version:
+            parts.append(f"v{self.version}")
+        parts.extend(("tag", tag))
+        return ":".join(parts)
 
+    async def get_query(
+        self, schema_type: Type[SchemaType], params: Dict[str, Any]
+    ) -> Optional[str]:
+        """
+        Retrieve a cached, already-serialized query result (e.g. a list page).
+        `params` must contain everything that determines the result.
+        """
+        key = self._query_key(schema_type, params)
+        try:
+            cached = await redis_client.get(key)
+        except Exception:
+            logger.warning("Query cache lookup failed for key: %s", key, exc_info=True)
+            self._count(schema_type, "error")
+            return None
+        if not cached:
+            self._count(schema_type, "miss")
+            return None
+        self._count(schema_type, "hit")
+        return cached.decode("utf-8") if isinstance(cached, bytes) else cached
 
-cache_service = CacheService()
+    async def set_query(
+        self,
+        schema_type: Type[SchemaType],
+        params: Dict[str, Any],
+        payload: str,
+        *,
+        tags: Iterable[str],
+        ttl: Optional[int] = None,
+    ) -> None:
+        """
+        Cache a serialized query result and register it under each tag.
+
+        Every tag is a Redis set of the query keys that depend on it; the sets
+        are given the entry's TTL so they never outlive their members for long.
+        """
+        key = self._query_key(schema_type, params)
+        expire = int(ttl or self._ttl_for(schema_type))
+        try:
+            async with redis_client.pipeline(transaction=False) as pipe:
+                pipe.set(key, payload, ex=expire)
+                for tag in set(tags):
+                    tag_key = self._tag_key(tag)
+                    pipe.sadd(tag_key, key)
+                    pipe.expire(tag_key, expire)
+                await pipe.execute()
+        except Exception:
+            logger.warning("Failed to cache query result: %s", key, exc_info=True)
+
+    async def invalidate_tags(self, *tags: str) -> None:
+        """
+        Drop every query result registered under any of the given tags.
+
+        A page rendered concurrently with the write can still land after this
+        runs; entry TTLs bound how long such a page survives.
+        """
+        if not tags:
+            return
+        tag_keys = [self._tag_key(tag) for tag in set(tags)]
+        try:
+            async with redis_client.pipeline(transaction=False) as pipe:
+                for tag_key in tag_keys:
+                    pipe.smembers(tag_key)
+                members = await pipe.execute()
+
+            keys = set(tag_keys)
+            for tagged in members:
+                keys.update(tagged or ())
+            await redis_client.delete(*keys)
+        except Exception:
+            logger.warning("Failed to invalidate cache tags: %s", tags, exc_info=True)
+
+    # ---------- L1 coherence + stats ----------
+
+    def register_local(self, name: str, local: TTLCache) -> None:
+        """
+        Let another in-process cache share the cross-worker invalidation channel;
+        `broadcast_invalidation(name, keys)` then evicts keys from it everywhere.
+        """
+        self._local[name] = local
+
+    async def broadcast_invalidation(self, name: str, keys: List[str]) -> None:
+        """Tell every other worker to evict `keys` from the local cache `name`."""
+        if not self.invalidation_channel or name not in self._local:
+            return
+        message = json.dumps({"o": self._instance_id, "s": name, "k": keys})
+        await redis_client.publish(self.invalidation_channel, message)
+
+    async def _publish_invalidation(
+        self, schema_type: Type[SchemaType], keys: List[str]
+    ) -> None:
+        await self.broadcast_invalidation(self._schema_name(schema_type), keys)
+
+    def _apply_invalidation(self, raw: str) -> None:
+        try:
+            message = json.loads(raw)
+        except (TypeError, ValueError):
+            logger.warning("Ignoring malformed cache invalidation message: %r", raw)
+            return
+        if message.get("o") == self._instance_id:
+            return
+        local = self._local.get(message.get("s"))
+        if local is None:
+            return
+        for key in message.get("k", ()):
+            local.pop(key)
+
+    async def _listen_for_invalidations(self) -> None:
+        while True:
+            pubsub = redis_client.pubsub()
+            try:
+                await pubsub.subscribe(self.invalidation_channel)
+                # Anything published while we weren't subscribed is lost
+                for local in self._local.values():
+                    local.clear()
+                async for message in pubsub.listen():
+                    if message.get("type") == "message":
+                        self._apply_invalidation(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.warning(
+                    "Cache invalidation subscription lost; resubscribing.",
+                    exc_info=True,
+                )
+                await asyncio.sleep(1)
+            finally:
+                try:
+                    await pubsub.reset()
+                except Exception:
+                    pass
+
+    async def start_invalidation_listener(self) -> None:
+        """Subscribe to L1 invalidations from other workers (call on startup)."""
+        if not self._local or not self.invalidation_channel:
+            return
+        if self._listener_task is None or self._listener_task.done():
+            self._listener_task = asyncio.create_task(
+                self._listen_for_invalidations()
+            )
+
+    async def stop_invalidation_listener(self) -> None:
+        if self._listener_task is None:
+            return
+        self._listener_task.cancel()
+        try:
+            await self._listener_task
+        except asyncio.CancelledError:
+            pass
+        self._listener_task = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters per tier (L1 broken down per schema)."""
+        l1 = {name: local.stats() for name, local in self._local.items()}
+        return {
+            "l1": {
+                "hits": sum(entry["hits"] for entry in l1.values()),
+                "misses": sum(entry["misses"] for entry in l1.values()),
+                "schemas": l1,
+            },
+            "l2": {"hits": self._l2_hits, "misses": self._l2_misses},
+        }
+
+
+cache_service = CacheService(
+    local_limits=(
+        {
+            # Near-static reference data: small, rarely edited, read on every page
+            CategoryResponse: (settings.CACHE_LOCAL_MAXSIZE, settings.CACHE_LOCAL_TTL),
+            ColorResponse: (settings.CACHE_LOCAL_MAXSIZE, settings.CACHE_LOCAL_TTL),
+            SizeResponse: (settings.CACHE_LOCAL_MAXSIZE, settings.CACHE_LOCAL_TTL),
+        }
+        if settings.CACHE_LOCAL_ENABLED
+        else None
+    ),
+    invalidation_channel=settings.CACHE_INVALIDATION_CHANNEL,
+)
@@ -0,0 +1,193 @@
+"""
+Metrics service module.
+
+Every uvicorn worker has its own in-process registry, and a scrape only
+reaches one of them. So each worker periodically publishes its snapshot to a
+Redis hash, next to a heartbeat key that expires if the worker dies, and
+`/metrics` merges the live snapshots with the serving worker's current one.
+If Redis is down the endpoint degrades to this worker's numbers instead of
+failing.
+
+A worker whose heartbeat is gone is retired: its last counters and histograms
+are added to a persistent hash of retired totals, which is merged into every
+scrape, so restarts never make a counter go down (like prometheus_client's
+multiprocess mode keeps the files of dead processes).
+"""
+import asyncio
+import json
+import logging
+import os
+import socket
+from typing import Dict, List, Optional
+
+from app.core import metrics
+from app.core.config import settings
+from app.db.redis_conn import redis_client
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOTS_KEY = "metrics:snapshots"
+RETIRED_KEY = "metrics:retired"
+
+# Store a snapshot and refresh the heartbeat, unless this worker has published
+# before and was retired since: the caller must rebase its counts first
+_PUBLISH_LUA = """
+if ARGV[4] == "1" and redis.call("HEXISTS", KEYS[1], ARGV[1]) == 0 then
+    return 0
+end
+redis.call("HSET", KEYS[1], ARGV[1], ARGV[2])
+redis.call("SET", KEYS[2], "1", "EX", ARGV[3])
+return 1
+"""
+
+# Fold a worker's last snapshot into the retired totals, exactly once
+_RETIRE_LUA = """
+if redis.call("HGET", KEYS[1], ARGV[1]) ~= ARGV[2] then
+    return 0
+end
+redis.call("HDEL", KEYS[1], ARGV[1])
+for i = 3, #ARGV, 2 do
+    redis.call("HINCRBYFLOAT", KEYS[2], ARGV[i], ARGV[i + 1])
+end
+return 1
+"""
+
+
+class MetricsService:
+    """Publishes this worker's metrics and renders the merged view."""
+
+    def __init__(self):
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self.push_interval = settings.METRICS_PUSH_INTERVAL
+        # A worker that misses a few pushes is considered gone
+        self.snapshot_ttl = max(1, int(self.push_interval * 3))
+        # Raw registry snapshot at the last successful publish
+        self._published: Optional[Dict[str, dict]] = None
+        # Counts already in the retired totals (if this worker was retired
+        # while it could not reach Redis); subtracted from what it reports
+        self._baseline: Dict[str, dict] = {}
+        self._publisher_task: Optional[asyncio.Task] = None
+        self._publish_script = redis_client.register_script(_PUBLISH_LUA)
+        self._retire_script = redis_client.register_script(_RETIRE_LUA)
+        self._logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+
+    def _worker_key(self, worker_id: str) -> str:
+        return f"metrics:worker:{worker_id}"
+
+    def _local_snapshot(
+        self, raw: Optional[Dict[str, dict]] = None
+    ) -> Dict[str, dict]:
+        """This worker's snapshot, less whatever is counted as retired."""
+        raw = raw if raw is not None else metrics.registry.snapshot()
+        return metrics.subtract(raw, self._baseline) if self._baseline else raw
+
+    async def _store(self, raw: Dict[str, dict]) -> Optional[str]:
+        """Publish `raw`; returns the stored payload, or None if retired."""
+        payload = json.dumps(self._local_snapshot(raw), separators=(",", ":"))
+        stored = await self._publish_script(
+            keys=[SNAPSHOTS_KEY, self._worker_key(self.worker_id)],
+            args=[
+                self.worker_id,
+                payload,
+                self.snapshot_ttl,
+                "1" if self._published is not None else "0",
+            ],
+        )
+        return payload if stored else None
+
+    async def publish(self) -> str:
+        """
+        Store this worker's snapshot in Redis for the other workers to merge.
+        Returns the published payload.
+        """
+        raw = metrics.registry.snapshot()
+        payload = await self._store(raw)
+        if payload is None:
+            # Our last published snapshot was retired while we were presumed
+            # dead; it is in the retired totals, so only report what followed
+            self._logger.warning("Metrics of this worker were retired; rebasing.")
+            self._baseline = self._published or {}
+            self._published = None
+            payload = await self._store(raw)
+        self._published = raw
+        return payload
+
+    async def _retire(self, worker_id: str, payload: str) -> None:
+        """Add a worker's last published counts to the retired totals."""
+        args: List = [worker_id, payload]
+        for field, value in metrics.cumulative_fields(json.loads(payload)).items():
+            if value:
+                args.extend((field, repr(float(value))))
+        if await self._retire_script(keys=[SNAPSHOTS_KEY, RETIRED_KEY], args=args):
+            self._logger.info(f"Retired metrics of worker {worker_id}.")
+
+    async def _worker_snapshots(self) -> List[Dict[str, dict]]:
+        """
+        Published snapshots of the other live workers, plus the retired
+        totals; retires workers whose heartbeat expired.
+        """
+        published = await redis_client.hgetall(SNAPSHOTS_KEY)
+        others = [worker for worker in published if worker != self.worker_id]
+        snapshots: List[Dict[str, dict]] = []
+        if others:
+            beats = await redis_client.mget([self._worker_key(w) for w in others])
+            for worker_id, beat in zip(others, beats):
+                if beat is not None:
+                    snapshots.append(json.loads(published[worker_id]))
+                else:
+                    await self._retire(worker_id, published[worker_id])
+
+        retired = await redis_client.hgetall(RETIRED_KEY)
+        if retired:
+            fields = {field: float(value) for field, value in retired.items()}
+            snapshots.append(
+                metrics.from_fields(fields, template=metrics.registry.snapshot())
+            )
+        return snapshots
+
+    async def render(self) -> str:
+        """All workers' metrics, dead ones included, in the Prometheus format."""
+        snapshots = [self._local_snapshot()]
+        try:
+            snapshots.extend(await self._worker_snapshots())
+        except Exception:
+            self._logger.warning(
+                "Could not read other workers' metrics; serving local only.",
+                exc_info=True,
+            )
+        return metrics.render(metrics.merge(snapshots))
+
+    async def _publish_periodically(self) -> None:
+        while True:
+            try:
+                await self.publish()
+            except Exception:
+                self._logger.warning("Publishing metrics failed.", exc_info=True)
+            await asyncio.sleep(self.push_interval)
+
+    async def start_publisher(self) -> None:
+        """Start publishing this worker's snapshot (call on startup)."""
+        if self._publisher_task is None or self._publisher_task.done():
+            self._publisher_task = asyncio.create_task(self._publish_periodically())
+
+    async def stop_publisher(self) -> None:
+        """Stop publishing and hand this worker's final counts to the totals."""
+        if self._publisher_task is None:
+            return
+        self._publisher_task.cancel()
+        try:
+            await self._publisher_task
+        except asyncio.CancelledError:
+            pass
+        self._publisher_task = None
+        try:
+            payload = await self.publish()
+            await self._retire(self.worker_id, payload)
+            await redis_client.delete(self._worker_key(self.worker_id))
+        except Exception:
+            self._logger.warning(
+                "Could not retire this worker's metrics.", exc_info=True
+            )
+
+
+metrics_service = MetricsService()
@@ -0,0 +1,141 @@
+"""
+Authenticated-principal cache.
+
+Authentication only needs a handful of user fields (id, role, is_active and
+tokens_valid_from_utc). They are cached per user in-process with a short TTL,
+backed by Redis, so most authenticated requests never touch the users table.
+Anything that changes those fields must call `principal_cache.invalidate`.
+"""
+import json
+import logging
+import uuid
+from datetime import datetime
+from typing import Awaitable, Callable, Optional
+
+from app.core.config import settings
+from app.db.redis_conn import redis_client
+from app.models.user_model import User, UserRole
+from app.services.cache_service import cache_service
+from app.utils.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+
+class AuthPrincipal:
+    """The authenticated caller: just what authn/authz checks need."""
+
+    __slots__ = ("id", "role", "is_active", "tokens_valid_from_utc")
+
+    def __init__(
+        self,
+        id: uuid.UUID,
+        role: UserRole,
+        is_active: bool,
+        tokens_valid_from_utc: Optional[datetime] = None,
+    ):
+        self.id = id
+        self.role = role
+        self.is_active = is_active
+        self.tokens_valid_from_utc = tokens_valid_from_utc
+
+    @property
+    def is_admin(self) -> bool:
+        return UserRole(self.role) == UserRole.ADMIN
+
+    @classmethod
+    def from_user(cls, user: User) -> "AuthPrincipal":
+        return cls(
+            id=user.id,
+            role=UserRole(user.role),
+            is_active=user.is_active,
+            tokens_valid_from_utc=user.tokens_valid_from_utc,
+        )
+
+    def to_json(self) -> str:
+        valid_from = self.tokens_valid_from_utc
+        return json.dumps(
+            {
+                "role": UserRole(self.role).value,
+                "is_active": self.is_active,
+                "tv": valid_from.isoformat() if valid_from else None,
+            },
+            separators=(",", ":"),
+        )
+
+    @classmethod
+    def from_json(cls, user_id: uuid.UUID, raw: str) -> "AuthPrincipal":
+        data = json.loads(raw)
+        return cls(
+            id=user_id,
+            role=UserRole(data["role"]),
+            is_active=bool(data["is_active"]),
+            tokens_valid_from_utc=(
+                datetime.fromisoformat(data["tv"]) if data.get("tv") else None
+            ),
+        )
+
+    def __repr__(self) -> str:
+        return f"<AuthPrincipal(id='{self.id}', role='{self.role}')>"
+
+
+class PrincipalCache:
+    """In-process TTL cache in front of Redis for AuthPrincipal records."""
+
+    LOCAL_NAME = "auth_principal"
+
+    def __init__(self, *, maxsize: int, local_ttl: float, ttl: int):
+        self.ttl = int(ttl)
+        self._local: TTLCache[AuthPrincipal] = TTLCache(maxsize=maxsize, ttl=local_ttl)
+        # Evictions in one worker reach all the others over the cache channel
+        cache_service.register_local(self.LOCAL_NAME, self._local)
+
+    def _key(self, user_id: uuid.UUID) -> str:
+        return f"auth:principal:{user_id}"
+
+    async def get(
+        self,
+        user_id: uuid.UUID,
+        loader: Callable[[], Awaitable[Optional[User]]],
+    ) -> Optional[AuthPrincipal]:
+        """Return the principal for `user_id`, loading the user only on a miss."""
+        key = self._key(user_id)
+        principal = self._local.get(key)
+        if principal is not None:
+            return principal
+
+        try:
+            raw = await redis_client.get(key)
+            if raw:
+                principal = AuthPrincipal.from_json(user_id, raw)
+                self._local.set(key, principal)
+                return principal
+        except Exception:
+            logger.warning("Principal cache lookup failed: %s", key, exc_info=True)
+
+        user = await loader()
+        if user is None:
+            return None
+        principal = AuthPrincipal.from_user(user)
+        self._local.set(key, principal)
+        try:
+            await redis_client.set(key, principal.to_json(), ex=self.ttl)
+        except Exception:
+            logger.warning("Failed to cache principal: %s", key, exc_info=True)
+        return principal
+
+    async def invalidate(self, user_id: uuid.UUID) -> None:
+        """Drop the principal everywhere; call after role/status/token changes."""
+        key = self._key(user_id)
+        self._local.pop(key)
+        try:
+            await redis_client.delete(key)
+            await cache_service.broadcast_invalidation(self.LOCAL_NAME, [key])
+        except Exception:
+            logger.warning("Failed to invalidate principal: %s", key, exc_info=True)
+
+
+principal_cache = PrincipalCache(
+    maxsize=settings.AUTH_PRINCIPAL_CACHE_SIZE,
+    local_ttl=settings.AUTH_PRINCIPAL_LOCAL_TTL,
+    ttl=settings.AUTH_PRINCIPAL_TTL,
+)
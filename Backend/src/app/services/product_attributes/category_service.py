@@ -1,10 +1,12 @@
 import logging
 import uuid
 from slugify import slugify
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Union
 
 from sqlmodel.ext.asyncio.session import AsyncSession
 from app.crud.product_attributes.category_crud import category_repository
+from app.crud.pagination import CountStrategy
+from app.db.session import primary_for
 from app.schemas.category_schema import (
     CategoryCreate,
     CategoryUpdate,
@@ -77,19 +79,27 @@ class CategoryService:
         """Private helper to load a size from the DB and convert it to a Pydantic schema.
         This is our "loader" function for the cache."""
 
-        category_model = await self.category_repository.get(db=db, obj_id=category_id)
-        raise_for_status(
-            condition=category_model is None,
-            exception=ResourceNotFound,
-            detail=f"Category with ID {category_id} not Found.",
-            resource_type="Category",
-        )
-        return CategoryResponse.model_validate(category_model)
+        async with primary_for(db) as session:
+            category_model = await self.category_repository.get(
+                db=session, obj_id=category_id
+            )
+            raise_for_status(
+                condition=category_model is None,
+                exception=ResourceNotFound,
+                detail=f"Category with ID {category_id} not Found.",
+                resource_type="Category",
+            )
+            return CategoryResponse.model_validate(category_model)
 
     async def get_category_by_id(
-        self, db: AsyncSession, *, category_id: uuid.UUID, current_user: User
-    ) -> Optional[CategoryResponse]:
-        """Retrieve category by it's ID"""
+        self,
+        db: AsyncSession,
+        *,
+        category_id: uuid.UUID,
+        current_user: User,
+        return_json: bool = False,
+    ) -> Optional[Union[CategoryResponse, str]]:
+        """Retrieve category by it's ID (as the cached JSON if `return_json`)"""
 
         self._check_authorization(
             current_user=current_user,
@@ -103,6 +113,7 @@ class CategoryService:
                 db=db, category_id=category_id
             ),
             ttl=300,  # Cache for 5 minutes
+            return_json=return_json,
         )
 
         self._logger.debug(
@@ -118,6 +129,7 @@ class CategoryService:
         skip: int = 0,
         limit: int = 50,
         filters: Optional[Dict[str, Any]] = None,
+        count_strategy: CountStrategy = CountStrategy.EXACT,
     ) -> CategoryListResponse:
         """
         Lists categories with pagination and filtering.
@@ -145,24 +157,21 @@ class CategoryService:
             raise ValidationError("Limit must be between 1 and 100")
 
         # Delegate fetching to the repository
-        categories, total = await self.category_repository.get_all(
+        page = await self.category_repository.get_all(
             db=db,
             skip=skip,
             limit=limit,
             filters=filters,
+            count_strategy=count_strategy,
         )
 
-        # Calculate pagination info
-        page = (skip // limit) + 1
-        total_pages = (total + limit - 1) // limit  # Ceiling division
-
         # Construct the response schema
         response = CategoryListResponse(
-            items=categories, total=total, page=page, pages=total_pages, size=limit
+            items=page.items, **page.metadata(skip=skip, limit=limit)
         )
 
         self._logger.info(
-            f"Category list retrieved by {current_user.id}: {len(categories)} categories returned"
+            f"Category list retrieved by {current_user.id}: {len(page.items)} categories returned"
         )
         return response
 
@@ -271,7 +280,9 @@ class CategoryService:
             fields_to_update=update_dict,
         )
 
-        await cache_service.invalidate(Category, category_id)
+        await cache_service.invalidate(CategoryResponse, category_id)
+        # Cached product listing pages embed this category
+        await cache_service.invalidate_tags(cache_service.tag("category", category_id))
 
         self._logger.info(
             f"Category {category_id} updated by {current_user.id}",
@@ -304,7 +315,9 @@ class CategoryService:
         await self.category_repository.delete(db=db, obj_id=category_id)
 
         # 4. Clean up cache and tokens
-        await cache_service.invalidate(Category, category_id)
+        await cache_service.invalidate(CategoryResponse, category_id)
+        # Cached product listing pages embed this category
+        await cache_service.invalidate_tags(cache_service.tag("category", category_id))
 
         self._logger.warning(
             f"Category {category_id} permanently deleted by {current_user.id}",
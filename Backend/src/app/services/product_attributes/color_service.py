@@ -4,6 +4,8 @@ import uuid
 
 from sqlmodel.ext.asyncio.session import AsyncSession
 from app.crud.product_attributes.color_crud import color_repository
+from app.crud.pagination import CountStrategy
+from app.db.session import primary_for
 from app.schemas.color_schema import (
     ColorCreate,
     ColorUpdate,
@@ -65,14 +67,15 @@ class ColorService:
         """Private helper to load a size from the DB and convert it to a Pydantic schema.
         This is our "loader" function for the cache."""
 
-        color_model = await self.color_repository.get(db=db, obj_id=color_id)
-        raise_for_status(
-            condition=color_model is None,
-            exception=ResourceNotFound,
-            detail=f"Color with ID {color_id} not Found.",
-            resource_type="Color",
-        )
-        return ColorResponse.model_validate(color_model)
+        async with primary_for(db) as session:
+            color_model = await self.color_repository.get(db=session, obj_id=color_id)
+            raise_for_status(
+                condition=color_model is None,
+                exception=ResourceNotFound,
+                detail=f"Color with ID {color_id} not Found.",
+                resource_type="Color",
+            )
+            return ColorResponse.model_validate(color_model)
 
     async def get_color_by_id(
         self, db: AsyncSession, *, color_id: uuid.UUID, current_user: User
@@ -102,6 +105,7 @@ class ColorService:
         skip: int = 0,
         limit: int = 50,
         filters: Optional[Dict[str, Any]] = None,
+        count_strategy: CountStrategy = CountStrategy.EXACT,
     ) -> ColorListResponse:
         """
         Lists colors with pagination and filtering.
@@ -129,24 +133,21 @@ class ColorService:
             raise ValidationError("Limit must be between 1 and 100")
 
         # Delegate fetching to the repository
-        colors, total = await self.color_repository.get_all(
+        page = await self.color_repository.get_all(
             db=db,
             skip=skip,
             limit=limit,
             filters=filters,
+            count_strategy=count_strategy,
         )
 
-        # Calculate pagination info
-        page = (skip // limit) + 1
-        total_pages = (total + limit - 1) // limit  # Ceiling division
-
         # Construct the response schema
         response = ColorListResponse(
-            items=colors, total=total, page=page, pages=total_pages, size=limit
+            items=page.items, **page.metadata(skip=skip, limit=limit)
         )
 
         self._logger.info(
-            f"Color list retrieved by {current_user.id}: {len(colors)} colors returned"
+            f"Color list retrieved by {current_user.id}: {len(page.items)} colors returned"
         )
         return response
 
@@ -221,7 +222,9 @@ class ColorService:
             fields_to_update=update_dict,
         )
 
-        await cache_service.invalidate(Color, color_id)
+        await cache_service.invalidate(ColorResponse, color_id)
+        # Cached product listing pages embed this color
+        await cache_service.invalidate_tags(cache_service.tag("color", color_id))
 
         self._logger.info(
             f"Color {color_id} updated by {current_user.id}",
@@ -252,7 +255,9 @@ class ColorService:
         await self.color_repository.delete(db=db, obj_id=color_id)
 
         # 4. Clean up cache and tokens
-        await cache_service.invalidate(Color, color_id)
+        await cache_service.invalidate(ColorResponse, color_id)
+        # Cached product listing pages embed this color
+        await cache_service.invalidate_tags(cache_service.tag("color", color_id))
 
         self._logger.warning(
             f"Color {color_id} permanently deleted by {current_user.id}",
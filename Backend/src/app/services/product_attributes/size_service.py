@@ -4,6 +4,8 @@ import uuid
 
 from sqlmodel.ext.asyncio.session import AsyncSession
 from app.crud.product_attributes.size_crud import size_repository
+from app.crud.pagination import CountStrategy
+from app.db.session import primary_for
 from app.schemas.size_schema import (
     SizeCreate,
     SizeUpdate,
@@ -65,14 +67,15 @@ class SizeService:
         """Private helper to load a size from the DB and convert it to a Pydantic schema.
         This is our "loader" function for the cache."""
 
-        size_model = await self.size_repository.get(db=db, obj_id=size_id)
-        raise_for_status(
-            condition=size_model is None,
-            exception=ResourceNotFound,
-            detail=f"Size with ID {size_id} not Found.",
-            resource_type="Size",
-        )
-        return SizeResponse.model_validate(size_model)
+        async with primary_for(db) as session:
+            size_model = await self.size_repository.get(db=session, obj_id=size_id)
+            raise_for_status(
+                condition=size_model is None,
+                exception=ResourceNotFound,
+                detail=f"Size with ID {size_id} not Found.",
+                resource_type="Size",
+            )
+            return SizeResponse.model_validate(size_model)
 
     async def get_size_by_id(
         self, db: AsyncSession, *, size_id: uuid.UUID, current_user: User
@@ -102,6 +105,7 @@ class SizeService:
         skip: int = 0,
         limit: int = 50,
         filters: Optional[Dict[str, Any]] = None,
+        count_strategy: CountStrategy = CountStrategy.EXACT,
     ) -> SizeListResponse:
         """
         Lists sizes with pagination and filtering.
@@ -129,24 +133,21 @@ class SizeService:
             raise ValidationError("Limit must be between 1 and 100")
 
         # Delegate fetching to the repository
-        sizes, total = await self.size_repository.get_all(
+        page = await self.size_repository.get_all(
             db=db,
             skip=skip,
             limit=limit,
             filters=filters,
+            count_strategy=count_strategy,
         )
 
-        # Calculate pagination info
-        page = (skip // limit) + 1
-        total_pages = (total + limit - 1) // limit  # Ceiling division
-
         # Construct the response schema
         response = SizeListResponse(
-            items=sizes, total=total, page=page, pages=total_pages, size=limit
+            items=page.items, **page.metadata(skip=skip, limit=limit)
         )
 
         self._logger.info(
-            f"Size list retrieved by {current_user.id}: {len(sizes)} sizes returned"
+            f"Size list retrieved by {current_user.id}: {len(page.items)} sizes returned"
         )
         return response
 
@@ -210,7 +211,9 @@ class SizeService:
             fields_to_update=update_dict,
         )
 
-        await cache_service.invalidate(Size, size_id)
+        await cache_service.invalidate(SizeResponse, size_id)
+        # Cached product listing pages embed this size
+        await cache_service.invalidate_tags(cache_service.tag("size", size_id))
 
         self._logger.info(
             f"Size {size_id} updated by {current_user.id}",
@@ -241,7 +244,9 @@ class SizeService:
         await self.size_repository.delete(db=db, obj_id=size_id)
 
         # 4. Clean up cache and tokens
-        await cache_service.invalidate(Size, size_id)
+        await cache_service.invalidate(SizeResponse, size_id)
+        # Cached product listing pages embed this size
+        await cache_service.invalidate_tags(cache_service.tag("size", size_id))
 
         self._logger.warning(
             f"Size {size_id} permanently deleted by {current_user.id}",
@@ -0,0 +1,418 @@
+# app/services/product_import_service.py
+"""
+Bulk product import service.
+
+Streams an uploaded NDJSON or CSV catalog feed, validates rows with the
+product schemas, and hands them to the import repository in chunks of
+`PRODUCT_IMPORT_CHUNK_SIZE` variants. Each chunk is its own transaction, so
+memory use and lock time are bounded by the chunk, not the file.
+"""
+import codecs
+import csv
+import logging
+import uuid
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from fastapi import UploadFile
+from pydantic import ValidationError as PydanticValidationError
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+from app.core.exception_utils import raise_for_status
+from app.core.exceptions import AppException, InvalidInput, NotAuthorized
+from app.crud.product_crud import product_repository
+from app.crud.product_import_crud import product_import_repository
+from app.models.user_model import User, UserRole
+from app.schemas.product_schema import (
+    ProductCreate,
+    ProductImportError,
+    ProductImportFormat,
+    ProductImportResult,
+)
+from app.services.cache_service import cache_service
+from app.services.product_service import PRODUCT_LISTINGS_TAG
+
+logger = logging.getLogger(__name__)
+
+# Upload read size, and the longest line (or quoted CSV record) accepted
+IMPORT_READ_SIZE = 64 * 1024
+IMPORT_MAX_LINE_LENGTH = 1024 * 1024
+
+# CSV columns; image_urls is "|"-separated and read from a product's first row
+CSV_PRODUCT_COLUMNS = (
+    "name",
+    "description",
+    "brand",
+    "status",
+    "gender",
+    "category_id",
+)
+CSV_VARIANT_COLUMNS = (
+    "sku",
+    "price_in_cents",
+    "discount_price_in_cents",
+    "stock",
+    "size_id",
+    "color_id",
+)
+
+
+class _ParsedProduct:
+    """A schema-valid product and the source line of each of its variants."""
+
+    __slots__ = ("line", "product", "variant_lines")
+
+    def __init__(self, line: int, product: ProductCreate, variant_lines: List[int]):
+        self.line = line
+        self.product = product
+        self.variant_lines = variant_lines
+
+
+class ProductImportService:
+    """Handles bulk catalog imports."""
+
+    def __init__(self):
+        self.product_repository = product_repository
+        self.import_repository = product_import_repository
+        self._logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+
+    async def import_products(
+        self,
+        db: AsyncSession,
+        *,
+        upload: UploadFile,
+        current_user: User,
+        import_format: Optional[ProductImportFormat] = None,
+    ) -> ProductImportResult:
+        """
+        Import products from an NDJSON or CSV upload.
+
+        A product is imported all-or-nothing: any invalid row rejects all of
+        its rows and is reported with its line number. Chunks that were
+        committed stay imported if a later chunk fails.
+        """
+        raise_for_status(
+            condition=(current_user.role != UserRole.ADMIN),
+            exception=NotAuthorized,
+            detail="You are not authorized to Import products.",
+        )
+
+        import_format = import_format or self._detect_format(upload)
+        result = ProductImportResult()
+        chunk: List[_ParsedProduct] = []
+        chunk_variants = 0
+
+        if import_format == ProductImportFormat.CSV:
+            parsed = self._parse_csv(self._read_lines(upload), result)
+        else:
+            parsed = self._parse_ndjson(self._read_lines(upload), result)
+
+        async for item in parsed:
+            chunk.append(item)
+            chunk_variants += len(item.variant_lines)
+            if chunk_variants >= settings.PRODUCT_IMPORT_CHUNK_SIZE:
+                await self._load_chunk(db, chunk, result)
+                chunk, chunk_variants = [], 0
+        if chunk:
+            await self._load_chunk(db, chunk, result)
+
+        if result.products_created:
+            await cache_service.invalidate_tags(PRODUCT_LISTINGS_TAG)
+
+        self._logger.info(
+            f"Product import by {current_user.id}: {result.products_created} created, "
+            f"{result.products_rejected} rejected"
+        )
+        return result
+
+    # ---------- Reading ----------
+    def _detect_format(self, upload: UploadFile) -> ProductImportFormat:
+        filename = (upload.filename or "").lower()
+        content_type = (upload.content_type or "").lower()
+        if filename.endswith(".csv") or "csv" in content_type:
+            return ProductImportFormat.CSV
+        if filename.endswith((".ndjson", ".jsonl")) or "ndjson" in content_type:
+            return ProductImportFormat.NDJSON
+        raise InvalidInput(
+            detail="Could not detect the file format; pass format=ndjson or csv.",
+            field="format",
+        )
+
+    async def _read_lines(self, upload: UploadFile) -> AsyncIterator[Tuple[int, str]]:
+        """Yield (line number, text) from the upload without reading it whole."""
+        decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        pending = ""
+        line_number = 0
+        while True:
+            data = await upload.read(IMPORT_READ_SIZE)
+            try:
+                pending += decoder.decode(data, final=not data)
+            except UnicodeDecodeError:
+                raise InvalidInput(
+                    detail=f"File is not valid UTF-8 after line {line_number}.",
+                    field="file",
+                )
+            *lines, pending = pending.split("\n")
+            for line in lines:
+                line_number += 1
+                yield line_number, line.rstrip("\r")
+            raise_for_status(
+                condition=len(pending) > IMPORT_MAX_LINE_LENGTH,
+                exception=InvalidInput,
+                detail=f"Line {line_number + 1} is too long.",
+                field="file",
+            )
+            if not data:
+                break
+        if pending.strip():
+            yield line_number + 1, pending.rstrip("\r")
+
+    # ---------- Parsing ----------
+    async def _parse_ndjson(
+        self, lines: AsyncIterator[Tuple[int, str]], result: ProductImportResult
+    ) -> AsyncIterator[_ParsedProduct]:
+        async for line_number, line in lines:
+            if not line.strip():
+                continue
+            product = self._validate(
+                result, line_number, [line_number], lambda: line, from_json=True
+            )
+            if product is not None:
+                yield _ParsedProduct(
+                    line_number, product, [line_number] * len(product.variants)
+                )
+
+    async def _csv_records(
+        self, lines: AsyncIterator[Tuple[int, str]]
+    ) -> AsyncIterator[Tuple[int, List[str]]]:
+        """Join physical lines into CSV records (quoted fields may span lines)."""
+        record: Optional[str] = None
+        start = 0
+        async for line_number, line in lines:
+            if record is None:
+                record, start = line, line_number
+            else:
+                record = f"{record}\n{line}"
+            # An odd number of quotes means a quoted field is still open
+            if record.count('"') % 2:
+                raise_for_status(
+                    condition=len(record) > IMPORT_MAX_LINE_LENGTH,
+                    exception=InvalidInput,
+                    detail=f"Record starting on line {start} is too long.",
+                    field="file",
+                )
+                continue
+            if record.strip():
+                yield start, next(csv.reader([record]))
+            record = None
+        if record is not None and record.strip():
+            yield start, next(csv.reader([record]))
+
+    async def _parse_csv(
+        self, lines: AsyncIterator[Tuple[int, str]], result: ProductImportResult
+    ) -> AsyncIterator[_ParsedProduct]:
+        """Group contiguous rows sharing a product name into one product."""
+        header: Optional[List[str]] = None
+        rows: List[Tuple[int, Dict[str, str]]] = []
+        oversized = False
+
+        async for line_number, values in self._csv_records(lines):
+            if header is None:
+                header = [name.strip().lower() for name in values]
+                missing = set(CSV_PRODUCT_COLUMNS + CSV_VARIANT_COLUMNS) - set(header)
+                raise_for_status(
+                    condition=bool(missing),
+                    exception=InvalidInput,
+                    detail=f"CSV header is missing columns: {sorted(missing)}",
+                    field="file",
+                )
+                continue
+            if len(values) != len(header):
+                self._record_error(
+                    result, line_number, f"Expected {len(header)} columns."
+                )
+                result.products_rejected += 1
+                continue
+
+            row = dict(zip(header, (value.strip() for value in values)))
+            if rows and row["name"] != rows[0][1]["name"]:
+                product = self._validate_csv_group(result, rows, oversized)
+                if product is not None:
+                    yield product
+                rows, oversized = [], False
+            # A single product must fit in one chunk; extra rows are dropped
+            if len(rows) < settings.PRODUCT_IMPORT_CHUNK_SIZE:
+                rows.append((line_number, row))
+            else:
+                oversized = True
+
+        if rows:
+            product = self._validate_csv_group(result, rows, oversized)
+            if product is not None:
+                yield product
+
+    def _validate_csv_group(
+        self,
+        result: ProductImportResult,
+        rows: List[Tuple[int, Dict[str, str]]],
+        oversized: bool,
+    ) -> Optional[_ParsedProduct]:
+        line_number, first = rows[0]
+        variant_lines = [line for line, _ in rows]
+        if oversized:
+            self._record_error(
+                result,
+                line_number,
+                f"More than {settings.PRODUCT_IMPORT_CHUNK_SIZE} variants.",
+            )
+            result.products_rejected += 1
+            return None
+
+        def build() -> Dict[str, Any]:
+            data: Dict[str, Any] = {
+                name: first[name] or None for name in CSV_PRODUCT_COLUMNS
+            }
+            data["images"] = [
+                {"url": url.strip(), "order_index": index}
+                for index, url in enumerate(
+                    url for url in first.get("image_urls", "").split("|") if url.strip()
+                )
+            ]
+            data["variants"] = [
+                {name: row[name] or None for name in CSV_VARIANT_COLUMNS}
+                for _, row in rows
+            ]
+            return data
+
+        product = self._validate(result, line_number, variant_lines, build)
+        if product is None:
+            return None
+        return _ParsedProduct(line_number, product, variant_lines)
+
+    def _validate(
+        self,
+        result: ProductImportResult,
+        line_number: int,
+        variant_lines: List[int],
+        build,
+        from_json: bool = False,
+    ) -> Optional[ProductCreate]:
+        """Validate a product with ProductCreate, reporting failures by line."""
+        try:
+            if from_json:
+                return ProductCreate.model_validate_json(build())
+            return ProductCreate.model_validate(build())
+        except PydanticValidationError as e:
+            error = e.errors()[0]
+            location = error["loc"]
+            # Point variant errors at the variant's own row
+            if (
+                len(location) > 1
+                and location[0] == "variants"
+                and isinstance(location[1], int)
+                and location[1] < len(variant_lines)
+            ):
+                line_number = variant_lines[location[1]]
+            field = ".".join(str(part) for part in location)
+            self._record_error(result, line_number, f"{field}: {error['msg']}")
+        except AppException as e:
+            self._record_error(result, line_number, e.detail)
+        result.products_rejected += 1
+        return None
+
+    # ---------- Loading ----------
+    async def _load_chunk(
+        self, db: AsyncSession, chunk: List[_ParsedProduct], result: ProductImportResult
+    ) -> None:
+        products, variants, images = [], [], []
+        for item in chunk:
+            product = item.product
+            product_id = uuid.uuid4()
+            products.append(
+                (
+                    item.line,
+                    product_id,
+                    product.name,
+                    product.description,
+                    product.brand,
+                    product.status.name,
+                    product.gender.name,
+                    product.category_id,
+                )
+            )
+            for variant, line in zip(product.variants, item.variant_lines):
+                variants.append(
+                    (
+                        len(variants),
+                        line,
+                        item.line,
+                        product_id,
+                        variant.sku,
+                        variant.price_in_cents,
+                        variant.discount_price_in_cents,
+                        variant.stock,
+                        variant.size_id,
+                        variant.color_id,
+                    )
+                )
+            for image in product.images:
+                images.append(
+                    (
+                        item.line,
+                        product_id,
+                        image.url,
+                        image.alt_text,
+                        image.order_index,
+                    )
+                )
+
+        try:
+            rejections = await self.import_repository.stage(
+                db, products=products, variants=variants, images=images
+            )
+            rejected_lines = {rejection.product_line for rejection in rejections}
+            loaded = await self.import_repository.load(
+                db, rejected_lines=rejected_lines
+            )
+            await self.product_repository.refresh_listing_projections(
+                db, product_ids=loaded.product_ids
+            )
+            await db.commit()
+        except AppException as e:
+            # e.g. a concurrent write took a name or SKU after validation
+            await db.rollback()
+            self._logger.error(f"Product import chunk failed: {e}", exc_info=True)
+            for item in chunk:
+                self._record_error(
+                    result, item.line, f"Chunk could not be loaded: {e.detail}"
+                )
+            result.products_rejected += len(chunk)
+            return
+
+        for rejection in rejections:
+            self._record_error(
+                result,
+                rejection.line,
+                self.import_repository.REJECTION_MESSAGES[rejection.reason],
+                sku=rejection.sku,
+            )
+        result.products_created += len(loaded.product_ids)
+        result.variants_created += loaded.variants
+        result.images_created += loaded.images
+        result.products_rejected += len(rejected_lines)
+
+    def _record_error(
+        self,
+        result: ProductImportResult,
+        line: int,
+        message: str,
+        sku: Optional[str] = None,
+    ) -> None:
+        """Add an error to the report, keeping it within PRODUCT_IMPORT_MAX_ERRORS."""
+        if len(result.errors) >= settings.PRODUCT_IMPORT_MAX_ERRORS:
+            result.errors_truncated = True
+            return
+        result.errors.append(ProductImportError(line=line, sku=sku, message=message))
+
+
+product_import_service = ProductImportService()
@@ -5,24 +5,38 @@ Product service module.
 This module provides the business logic layer for product operations,
 handling authorization, validation, and orchestrating repository calls.
 """
+import json
 import logging
-from typing import Optional, Dict, Any
+from enum import Enum
+from typing import Optional, Dict, Any, List, Tuple, Union
 import uuid
 
 from sqlmodel.ext.asyncio.session import AsyncSession
 from datetime import datetime, timezone
 from app.crud.product_crud import product_repository
+from app.crud.product_attributes.category_crud import category_repository
+from app.crud.product_attributes.color_crud import color_repository
+from app.crud.product_attributes.size_crud import size_repository
+from app.crud.pagination import CountStrategy
+from app.db.session import primary_for
 from app.schemas.product_schema import (
     ProductCreate,
     ProductUpdate,
     ProductResponse,
     ProductListResponse,
+    ProductFacets,
+    FacetCount,
+    PriceRangeFacet,
     ProductImageCreate,
+    ProductImageResponse,
     ProductVariantCreate,
     ProductVariantUpdate,
     ProductVariantResponse,
     ProductVariantListResponse,
 )
+from app.schemas.category_schema import CategoryResponse
+from app.schemas.color_schema import ColorResponse
+from app.schemas.size_schema import SizeResponse
 from app.models.user_model import User, UserRole
 from app.models.product_model import (
     Product,
@@ -31,6 +45,8 @@ from app.models.product_model import (
     ProductStatus,
 )
 from app.services.cache_service import cache_service
+from app.core.config import settings
+from app.core.cursor import cursor_codec
 from app.core.exception_utils import raise_for_status
 from app.core.exceptions import (
     ResourceNotFound,
@@ -38,10 +54,27 @@ from app.core.exceptions import (
     ValidationError,
     ResourceAlreadyExists,
     InternalServerError,
+    InvalidInput,
 )
 
 logger = logging.getLogger(__name__)
 
+# Rendered public listing pages. Kept short because offset pages also shift
+# for reasons tags can't see (e.g. ordering by updated_at).
+LISTING_CACHE_TTL = 60
+# Carried by every cached listing page; dropping it flushes them all
+PRODUCT_LISTINGS_TAG = "product:listings"
+# Changing any of these can move a product into or out of a filtered or
+# ordered page, so it invalidates every listing, not just the pages showing it.
+# The effective (discounted) price drives the price filter and sort, and stock
+# the in_stock filter, so neither is content-only.
+_PRODUCT_LISTING_FIELDS = frozenset(
+    {"name", "description", "brand", "status", "gender", "category_id"}
+)
+_VARIANT_LISTING_FIELDS = frozenset(
+    {"price_in_cents", "discount_price_in_cents", "stock", "size_id", "color_id"}
+)
+
 
 class ProductService:
     """Handles all product-related business logic."""
@@ -78,26 +111,59 @@ class ProductService:
         if current_user.is_admin:
             return
 
+    async def _invalidate_product_caches(
+        self,
+        product_id: uuid.UUID,
+        *,
+        listings: bool = False,
+        variant_id: Optional[uuid.UUID] = None,
+    ) -> None:
+        """
+        Drop the cached product view (and variant view, if given) and every
+        cached listing page showing it. With `listings=True` all cached listing
+        pages are dropped instead.
+        """
+        entries = [(ProductResponse, product_id)]
+        if variant_id is not None:
+            entries.append((ProductVariantResponse, variant_id))
+        await cache_service.invalidate_many(entries)
+        await cache_service.invalidate_tags(
+            PRODUCT_LISTINGS_TAG
+            if listings
+            else cache_service.tag("product", product_id)
+        )
+
     # ==========PRODUCT OPERATIONS====================
     async def _load_product_schema_from_db(
         self, *, db: AsyncSession, product_id: uuid.UUID
-    ) -> Optional[ProductResponse]:
+    ) -> Optional[Union[ProductResponse, str]]:
         """Private helper to load a size from the DB and convert it to a Pydantic schema.
-        This is our "loader" function for the cache."""
+        This is our "loader" function for the cache.
+        With PRODUCT_JSON_LOADER the JSON document is built by Postgres instead."""
 
-        product_model = await self.product_repository.get(db=db, obj_id=product_id)
+        if settings.PRODUCT_JSON_LOADER:
+            product = await self.product_repository.get_json(db=db, obj_id=product_id)
+        else:
+            product = await self.product_repository.get(db=db, obj_id=product_id)
         raise_for_status(
-            condition=product_model is None,
+            condition=product is None,
             exception=ResourceNotFound,
             detail=f"Product with ID {product_id} not Found.",
             resource_type="Product",
         )
-        return ProductResponse.model_validate(product_model)
+        if isinstance(product, str):
+            return product
+        return ProductResponse.model_validate(product)
 
     async def get_product_by_id(
-        self, db: AsyncSession, *, product_id: uuid.UUID, current_user: User
-    ) -> Optional[ProductResponse]:
-        """Retrieve product by it's ID"""
+        self,
+        db: AsyncSession,
+        *,
+        product_id: uuid.UUID,
+        current_user: User,
+        return_json: bool = False,
+    ) -> Optional[Union[ProductResponse, str]]:
+        """Retrieve product by it's ID (as the cached JSON if `return_json`)"""
 
         self._check_authorization(
             current_user=current_user,
@@ -111,6 +177,8 @@ class ProductService:
                 db=db, product_id=product_id
             ),
             ttl=300,  # Cache for 5 minutes
+            return_json=return_json,
+            early_refresh=1.0,  # Hot and costly to load: renew before expiry
         )
 
         self._logger.debug(f"Product {product_id} retrieved by user {current_user.id}")
@@ -121,8 +189,24 @@ class ProductService:
         db: AsyncSession,
         *,
         product_id: uuid.UUID,
-    ) -> Optional[ProductResponse]:
-        """"""
+        return_json: bool = False,
+    ) -> Optional[Union[ProductResponse, str]]:
+        """
+        Retrieve an active product for the public catalog.
+        With `return_json` and PRODUCT_JSON_LOADER on, Postgres renders the JSON.
+        """
+
+        if return_json and settings.PRODUCT_JSON_LOADER:
+            payload = await self.product_repository.get_json(
+                db=db, obj_id=product_id, active_only=True
+            )
+            raise_for_status(
+                condition=payload is None,
+                exception=ResourceNotFound,
+                detail=f"Product with ID {product_id} not Found.",
+                resource_type="Product",
+            )
+            return payload
 
         product = await self.product_repository.get(db=db, obj_id=product_id)
         raise_for_status(
@@ -131,6 +215,8 @@ class ProductService:
             detail=f"Product with ID {product_id} not Found.",
             resource_type="Product",
         )
+        if return_json:
+            return ProductResponse.model_validate(product).model_dump_json()
         return product
 
     async def get_all_products(
@@ -143,8 +229,10 @@ class ProductService:
         filters: Optional[Dict[str, Any]] = None,
         order_by: str = "created_at",
         order_desc: bool = True,
-    ) -> ProductListResponse:
-        """Lists users with pagination and filtering."""
+        count_strategy: CountStrategy = CountStrategy.EXACT,
+        return_json: bool = False,
+    ) -> Union[ProductListResponse, str]:
+        """Lists users with pagination and filtering (as JSON if `return_json`)."""
 
         self._check_authorization(current_user=current_user, action="List")
 
@@ -154,29 +242,105 @@ class ProductService:
         if limit <= 0 or limit > 100:
             raise ValidationError("Limit must be between 1 and 100")
 
+        as_json = return_json and settings.PRODUCT_JSON_LOADER
+
         # Delegate fetching to the repository
-        products, total = await self.product_repository.get_all(
+        page = await self.product_repository.get_all(
             db=db,
             skip=skip,
             limit=limit,
             filters=filters,
             order_by=order_by,
             order_desc=order_desc,
+            count_strategy=count_strategy,
+            as_json=as_json,
         )
 
-        # Calculate pagination info
-        page = (skip // limit) + 1
-        total_pages = (total + limit - 1) // limit  # Ceiling division
+        self._logger.info(
+            f"Product list retrieved by {current_user.id}: {len(page.items)} products returned"
+        )
+        if as_json:
+            return self._render_list_json(
+                page.items, **page.metadata(skip=skip, limit=limit)
+            )
 
         # Construct the response schema
         response = ProductListResponse(
-            items=products, total=total, page=page, pages=total_pages, size=limit
+            items=page.items, **page.metadata(skip=skip, limit=limit)
         )
+        if return_json:
+            return response.model_dump_json()
+        return response
 
-        self._logger.info(
-            f"Product list retrieved by {current_user.id}: {len(products)} products returned"
+    def _render_list_json(self, documents: List[str], **fields: Any) -> str:
+        """
+        Render a ProductListResponse around product documents that are already
+        JSON, without parsing them back into models.
+        """
+        items = "[" + ",".join(documents) + "]"
+        rest = ProductListResponse(items=[], **fields).model_dump_json(
+            exclude={"items"}
         )
-        return response
+        if rest == "{}":
+            return '{"items":' + items + "}"
+        # Open the metadata object with the items member
+        return '{"items":' + items + "," + rest[1:]
+
+    def _build_facets(self, counts: Dict[str, Dict[Any, int]]) -> ProductFacets:
+        """Shape repository facet counts into the response schema."""
+
+        def ordered(facet: str) -> List[FacetCount]:
+            values = sorted(counts[facet].items(), key=lambda item: -item[1])
+            return [
+                FacetCount(
+                    value=value.value if isinstance(value, Enum) else str(value),
+                    count=count,
+                )
+                for value, count in values
+            ]
+
+        edges = self.product_repository.PRICE_FACET_EDGES
+        price_ranges = []
+        for bucket, count in sorted(counts["price"].items()):
+            price_ranges.append(
+                PriceRangeFacet(
+                    min_price=edges[bucket - 1] if bucket > 0 else 0,
+                    max_price=edges[bucket] - 1 if bucket < len(edges) else None,
+                    count=count,
+                )
+            )
+
+        return ProductFacets(
+            sizes=ordered("size"),
+            colors=ordered("color"),
+            categories=ordered("category"),
+            genders=ordered("gender"),
+            price_ranges=price_ranges,
+        )
+
+    def _decode_product_cursor(
+        self, *, cursor: str, order_by: str, order_desc: bool
+    ) -> Tuple[Any, uuid.UUID]:
+        """Verify a listing cursor and make sure it matches the requested ordering."""
+
+        payload = cursor_codec.decode(cursor)
+        raise_for_status(
+            condition=(
+                payload.get("o") != order_by
+                or payload.get("d") != order_desc
+                or "v" not in payload
+                or "i" not in payload
+            ),
+            exception=InvalidInput,
+            detail="Cursor does not match the requested ordering.",
+            field="cursor",
+        )
+        try:
+            return self.product_repository.parse_keyset_value(
+                order_by, payload["v"], payload["i"]
+            )
+        except (TypeError, ValueError):
+            raise InvalidInput(detail="Malformed pagination cursor.", field="cursor")
 
     async def get_all_active_products(
         self,
@@ -187,41 +351,179 @@ class ProductService:
         filters: Optional[Dict[str, Any]] = None,
         order_by: str = "created_at",
         order_desc: bool = True,
-    ) -> ProductListResponse:
-        """"""
+        cursor: Optional[str] = None,
+        count_strategy: CountStrategy = CountStrategy.EXACT,
+        facets: bool = False,
+        return_json: bool = False,
+    ) -> Union[ProductListResponse, str]:
+        """
+        Lists active products for the public catalog.
+
+        Offset pagination (`skip`) is the default. Passing a `cursor` from a previous
+        response switches to keyset pagination, whose cost does not grow with depth.
+        Every response carries a `next_cursor` so clients can switch at any page,
+        except for orders with no keyset (`relevance` searches, `price` and
+        columns such as `status`), which are offset-only.
+        With `facets`, the response also carries facet counts for the filters.
+        With `return_json` the response is returned rendered; when PRODUCT_JSON_LOADER
+        is on, the product documents are built by Postgres and never hydrated.
+        """
         # Input validation
         if skip < 0:
             raise ValidationError("Skip parameter must be non-negative")
         if limit <= 0 or limit > 100:
             raise ValidationError("Limit must be between 1 and 100")
 
-        # Delegate fetching to the repository
-        products, total = await self.product_repository.get_all_active(
+        # None for orders with no keyset to seek on (relevance, price, status...)
+        keyset_field = self.product_repository.cursor_order_field(
+            order_by, (filters or {}).get("search")
+        )
+        after = None
+        if cursor:
+            raise_for_status(
+                condition=keyset_field is None,
+                exception=InvalidInput,
+                detail=f"Cursor pagination is not available for order_by={order_by}.",
+                field="cursor",
+            )
+            after = self._decode_product_cursor(
+                cursor=cursor, order_by=keyset_field, order_desc=order_desc
+            )
+            skip = 0
+        as_json = return_json and settings.PRODUCT_JSON_LOADER
+
+        page = await self.product_repository.get_all_active(
             db=db,
             skip=skip,
             limit=limit,
             filters=filters,
-            order_by=order_by,
+            order_by=keyset_field if after is not None else order_by,
             order_desc=order_desc,
+            after=after,
+            count_strategy=count_strategy,
+            as_json=as_json,
         )
 
-        # Calculate pagination info
-        page = (skip // limit) + 1
-        total_pages = (total + limit - 1) // limit  # Ceiling division
+        next_cursor = None
+        if page.has_more and keyset_field is not None:
+            last = json.loads(page.items[-1]) if as_json else page.items[-1]
+            value, last_id = self.product_repository.keyset_value(last, keyset_field)
+            next_cursor = cursor_codec.encode(
+                {"o": keyset_field, "d": order_desc, "v": value, "i": last_id}
+            )
+
+        facet_counts = None
+        if facets:
+            facet_counts = self._build_facets(
+                await self.product_repository.get_active_facets(db=db, filters=filters)
+            )
+
+        self._logger.info(
+            f"Product list retrieved: {len(page.items)} products returned"
+        )
+        if as_json:
+            return self._render_list_json(
+                page.items,
+                next_cursor=next_cursor,
+                facets=facet_counts,
+                **page.metadata(skip=skip, limit=limit),
+            )
 
         # Construct the response schema
         response = ProductListResponse(
-            items=products, total=total, page=page, pages=total_pages, size=limit
+            items=page.items,
+            next_cursor=next_cursor,
+            facets=facet_counts,
+            **page.metadata(skip=skip, limit=limit),
         )
+        if return_json:
+            return response.model_dump_json()
+        return response
 
-        self._logger.info(
-            f"Product list retrieved: {len(products)} products returned"
+    async def get_all_active_products_json(
+        self,
+        *,
+        db: AsyncSession,
+        skip: int = 0,
+        limit: int = 50,
+        filters: Optional[Dict[str, Any]] = None,
+        order_by: str = "created_at",
+        order_desc: bool = True,
+        cursor: Optional[str] = None,
+        count_strategy: CountStrategy = CountStrategy.EXACT,
+        facets: bool = False,
+    ) -> str:
+        """
+        Public listing rendered to JSON, served from the query-result cache.
+
+        Pages are cached whole and tagged with every product, category, size and
+        color they show, so product mutations only drop the pages they affect.
+        Facet counts are cached with the page; they span the whole filtered set,
+        which only changes when the listings tag is invalidated.
+        """
+        filters = filters or {}
+        cache_params = {
+            # Multi-value filters are "any of", so their order is irrelevant
+            "filters": {
+                name: sorted(value, key=str) if isinstance(value, list) else value
+                for name, value in filters.items()
+            },
+            "skip": skip,
+            "limit": limit,
+            "order_by": order_by,
+            "order_desc": order_desc,
+            "cursor": cursor,
+            "count": CountStrategy(count_strategy).value,
+            "facets": facets,
+        }
+
+        cached = await cache_service.get_query(ProductListResponse, cache_params)
+        if cached is not None:
+            return cached
+
+        # The page is shared by every reader, so it is never built on a replica
+        async with primary_for(db) as session:
+            payload = await self.get_all_active_products(
+                db=session,
+                skip=skip,
+                limit=limit,
+                filters=filters,
+                order_by=order_by,
+                order_desc=order_desc,
+                cursor=cursor,
+                count_strategy=count_strategy,
+                facets=facets,
+                return_json=True,
+            )
+
+        tags = {PRODUCT_LISTINGS_TAG}
+        for product in json.loads(payload)["items"]:
+            tags.add(cache_service.tag("product", product["id"]))
+            tags.add(cache_service.tag("category", product["category_id"]))
+            for variant in product["variants"]:
+                tags.add(cache_service.tag("size", variant["size"]["id"]))
+                tags.add(cache_service.tag("color", variant["color"]["id"]))
+
+        await cache_service.set_query(
+            ProductListResponse,
+            cache_params,
+            payload,
+            tags=tags,
+            ttl=LISTING_CACHE_TTL,
         )
-        return response
+        return payload
 
     async def create_product(
         self, db: AsyncSession, *, product_data: ProductCreate, current_user: User
-    ) -> Product:
+    ) -> ProductResponse:
+        """
+        Create a product with its images and variants.
+
+        Validation is set-based (one query for all SKUs, combos deduplicated in
+        memory) and images and variants are written with one multi-row INSERT
+        each, so the number of round trips does not grow with the variant count.
+        The response is built from the inserted rows rather than reloaded.
+        """
 
         self._check_authorization(current_user=current_user, action="Create")
 
@@ -235,78 +537,140 @@ class ProductService:
             resource_type="Product",
         )
 
+        variants_data = product_data.variants
+        images_data = product_data.images
+
+        # A new product has no variants yet, so combos can only clash in the payload
+        skus, combos = set(), set()
+        for variant_in in variants_data:
+            raise_for_status(
+                condition=variant_in.sku in skus,
+                exception=ResourceAlreadyExists,
+                detail=f"Variant SKU '{variant_in.sku}' is used more than once.",
+                resource_type="ProductVariant",
+            )
+            raise_for_status(
+                condition=(variant_in.size_id, variant_in.color_id) in combos,
+                exception=ResourceAlreadyExists,
+                detail="Variant with this Size and Color already exists.",
+                resource_type="ProductVariant",
+            )
+            skus.add(variant_in.sku)
+            combos.add((variant_in.size_id, variant_in.color_id))
+
+        taken = await self.product_repository.get_existing_skus(
+            db=db, skus=[variant_in.sku for variant_in in variants_data]
+        )
+        raise_for_status(
+            condition=bool(taken),
+            exception=ResourceAlreadyExists,
+            detail=f"Variant SKU '{taken[0] if taken else ''}' already exists.",
+            resource_type="ProductVariant",
+        )
+
+        # Related rows for the response; also reports unknown IDs as 404s
+        category = await category_repository.get(
+            db=db, obj_id=product_data.category_id
+        )
+        raise_for_status(
+            condition=category is None,
+            exception=ResourceNotFound,
+            detail=f"Category with ID {product_data.category_id} not Found.",
+            resource_type="Category",
+        )
+        sizes = {
+            size.id: size
+            for size in await size_repository.get_by_ids(
+                db=db, ids=list({variant_in.size_id for variant_in in variants_data})
+            )
+        }
+        colors = {
+            color.id: color
+            for color in await color_repository.get_by_ids(
+                db=db, ids=list({variant_in.color_id for variant_in in variants_data})
+            )
+        }
+        for variant_in in variants_data:
+            raise_for_status(
+                condition=variant_in.size_id not in sizes,
+                exception=ResourceNotFound,
+                detail=f"Size with ID {variant_in.size_id} not Found.",
+                resource_type="Size",
+            )
+            raise_for_status(
+                condition=variant_in.color_id not in colors,
+                exception=ResourceNotFound,
+                detail=f"Color with ID {variant_in.color_id} not Found.",
+                resource_type="Color",
+            )
+
         product_dict = product_data.model_dump(exclude={"variants", "images"})
         product_dict["created_at"] = datetime.now(timezone.utc)
         product_dict["updated_at"] = datetime.now(timezone.utc)
-        variants_data = product_data.variants
-        images_data = product_data.images
 
         product_to_create = Product(**product_dict)
 
         try:
-            # 4. Add parent product to session, flush to get ID
+            # Parent row first (one INSERT ... RETURNING) for the product ID
             db.add(product_to_create)
             await db.flush()
-            await db.refresh(product_to_create)
-
             product_id = product_to_create.id
 
-            # 5. Create and add Product Images
-            for image_in in images_data:
-                image_obj = ProductImage(**image_in.model_dump(), product_id=product_id)
-                db.add(image_obj)
-
-            # 6. Create and add Product Variants (with conflict checks)
-            for variant_in in variants_data:
-                existing_sku = await self.product_repository.get_by_sku(
-                    db=db, sku=variant_in.sku
-                )
-                raise_for_status(
-                    condition=existing_sku is not None,
-                    exception=ResourceAlreadyExists,
-                    detail=f"Variant SKU '{variant_in.sku}' already exists.",
-                    resource_type="ProductVariant",
-                )
-
-                existing_combo = (
-                    await self.product_repository.get_by_product_size_color(
-                        db=db,
-                        product_id=product_id,
-                        size_id=variant_in.size_id,
-                        color_id=variant_in.color_id,
-                    )
-                )
-                raise_for_status(
-                    condition=existing_combo is not None,
-                    exception=ResourceAlreadyExists,
-                    detail="Variant with this Size and Color already exists.",
-                    resource_type="ProductVariant",
-                )
-                variant_dict = variant_in.model_dump()
-                variant_dict["product_id"] = product_id
-                variant_obj = ProductVariant(
-                    **variant_in.model_dump(), product_id=product_id
-                )
-                db.add(variant_obj)
-
-            # 7. Commit the whole transaction
-            await db.commit()
-
-            self._logger.info(
-                f"New product created: {product_to_create.name} (ID: {product_to_create.id})"
+            images = await self.product_repository.create_images(
+                db=db,
+                images=[
+                    {**image_in.model_dump(), "product_id": product_id}
+                    for image_in in images_data
+                ],
+            )
+            variants = await self.product_repository.create_variants(
+                db=db,
+                variants=[
+                    {**variant_in.model_dump(), "product_id": product_id}
+                    for variant_in in variants_data
+                ],
             )
 
-            full_product = await self.product_repository.get(db=db, obj_id=product_id)
+            # Listing projection (price range, stock, sizes, colors)
+            await self.product_repository.refresh_listing_projection(
+                db=db, product_id=product_id
+            )
 
-            return full_product
+            await db.commit()
 
         except Exception as e:
             await db.rollback()  # Rollback on failure
             self._logger.error(f"Failed to create product: {e}", exc_info=True)
-            if isinstance(e, ResourceAlreadyExists):
-                raise e
             raise InternalServerError(detail=f"Failed to create product: {str(e)}")
 
+        self._logger.info(
+            f"New product created: {product_to_create.name} (ID: {product_id})"
+        )
+
+        await cache_service.invalidate_tags(PRODUCT_LISTINGS_TAG)
+
+        return ProductResponse(
+            **product_data.model_dump(exclude={"variants", "images"}),
+            id=product_id,
+            created_at=product_to_create.created_at,
+            updated_at=product_to_create.updated_at,
+            images=[ProductImageResponse.model_validate(image) for image in images],
+            variants=[
+                ProductVariantResponse(
+                    id=variant.id,
+                    product_id=product_id,
+                    price_in_cents=variant.price_in_cents,
+                    discount_price_in_cents=variant.discount_price_in_cents,
+                    stock=variant.stock,
+                    sku=variant.sku,
+                    size=SizeResponse.model_validate(sizes[variant.size_id]),
+                    color=ColorResponse.model_validate(colors[variant.color_id]),
+                )
+                for variant in variants
+            ],
+            category=CategoryResponse.model_validate(category),
+        )
+
     async def update_product(
         self,
         db: AsyncSession,
@@ -341,7 +705,9 @@ class ProductService:
             db=db, product=product_to_update, fields_to_update=update_dict
         )
 
-        await cache_service.invalidate(Product, product_id)
+        await self._invalidate_product_caches(
+            product_id, listings=not _PRODUCT_LISTING_FIELDS.isdisjoint(update_dict)
+        )
 
         self._logger.info(
             f"Product {product_id} updated by {current_user.id}",
@@ -379,7 +745,7 @@ class ProductService:
             product=product_to_delete,
         )
 
-        await cache_service.invalidate(Product, product_id)
+        await self._invalidate_product_caches(product_id, listings=True)
 
         self._logger.warning(
             f"Product {product_id} soft deleted by {current_user.id}",
@@ -435,7 +801,7 @@ class ProductService:
             )
         # --- END FIX ---
 
-        await cache_service.invalidate(Product, product_id)
+        await self._invalidate_product_caches(product_id, listings=True)
 
         self._logger.warning(
             f"Product {product_id} permanently deleted by {current_user.id}",
@@ -507,7 +873,7 @@ class ProductService:
         )
         self._logger.info(f"New product_image created: {new_image.url}")
 
-        await cache_service.invalidate(Product, product_id)
+        await self._invalidate_product_caches(product_id)
 
         return new_image
 
@@ -526,7 +892,7 @@ class ProductService:
 
         await self.product_repository.delete_image(db=db, image_id=image_id)
 
-        await cache_service.invalidate(Product, product_id)
+        await self._invalidate_product_caches(product_id)
 
         self._logger.warning(
             f"ProductImage {image_id} permanently deleted by {current_user.id}",
@@ -588,6 +954,7 @@ class ProductService:
         skip: int = 0,
         limit: int = 50,
         filters: Optional[Dict[str, Any]] = None,
+        count_strategy: CountStrategy = CountStrategy.EXACT,
     ) -> ProductVariantListResponse:
 
         self._check_authorization(current_user=current_user, action="List")
@@ -599,25 +966,22 @@ class ProductService:
             raise ValidationError("Limit must be between 1 and 100")
 
         # Delegate fetching to the repository
-        variants, total = await self.product_repository.get_all_variants(
+        page = await self.product_repository.get_all_variants(
             db=db,
             skip=skip,
             limit=limit,
             product_id=product_id,
             filters=filters,
+            count_strategy=count_strategy,
         )
 
-        # Calculate pagination info
-        page = (skip // limit) + 1
-        total_pages = (total + limit - 1) // limit  # Ceiling division
-
         # Construct the response schema
         response = ProductVariantListResponse(
-            items=variants, total=total, page=page, pages=total_pages, size=limit
+            items=page.items, **page.metadata(skip=skip, limit=limit)
         )
 
         self._logger.info(
-            f"ProductVariants list retrieved by {current_user.id}: {len(variants)} variants returned"
+            f"ProductVariants list retrieved by {current_user.id}: {len(page.items)} variants returned"
         )
         return response
 
@@ -670,7 +1034,7 @@ class ProductService:
         )
         self._logger.info(f"New product_variant created: {new_variant.sku}")
 
-        await cache_service.invalidate(Product, product_id)
+        await self._invalidate_product_caches(product_id, listings=True)
 
         full_variant = await self.product_repository.get_variant(
             db=db, variant_id=new_variant.id
@@ -720,8 +1084,11 @@ class ProductService:
             db=db, variant=variant_to_update, fields_to_update=update_dict
         )
 
-        await cache_service.invalidate(ProductVariant, variant_id)
-        await cache_service.invalidate(Product, product_id)
+        await self._invalidate_product_caches(
+            product_id,
+            listings=not _VARIANT_LISTING_FIELDS.isdisjoint(update_dict),
+            variant_id=variant_id,
+        )
 
         self._logger.info(
             f"ProductVariant {variant_id} updated by {current_user.id}",
@@ -766,8 +1133,9 @@ class ProductService:
 
         await self.product_repository.delete_variant(db=db, variant_id=variant_id)
 
-        await cache_service.invalidate(ProductVariant, variant_id)
-        await cache_service.invalidate(Product, product_id)
+        await self._invalidate_product_caches(
+            product_id, listings=True, variant_id=variant_id
+        )
 
         self._logger.warning(
             f"ProductVariant {variant_id} permanently deleted by {current_user.id}",
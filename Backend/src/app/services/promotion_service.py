@@ -1,9 +1,10 @@
 import logging
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Union
 import uuid
 
 from sqlmodel.ext.asyncio.session import AsyncSession
 from app.crud.promotion_crud import promotion_repository
+from app.crud.pagination import CountStrategy
 from app.schemas.promotion_schema import (
     PromotionCreate,
     PromotionUpdate,
@@ -77,9 +78,14 @@ class PromotionService:
         return PromotionResponse.model_validate(promotion_model)
 
     async def get_promotion_by_id(
-        self, db: AsyncSession, *, promotion_id: uuid.UUID, current_user: User
-    ) -> Optional[PromotionResponse]:
-        """Retrieve promotion by it's ID"""
+        self,
+        db: AsyncSession,
+        *,
+        promotion_id: uuid.UUID,
+        current_user: User,
+        return_json: bool = False,
+    ) -> Optional[Union[PromotionResponse, str]]:
+        """Retrieve promotion by it's ID (as the cached JSON if `return_json`)"""
 
         self._check_authorization(
             current_user=current_user,
@@ -93,6 +99,7 @@ class PromotionService:
                 db=db, promotion_id=promotion_id
             ),
             ttl=300,  # Cache for 5 minutes
+            return_json=return_json,
         )
 
         self._logger.debug(
@@ -110,6 +117,7 @@ class PromotionService:
         filters: Optional[Dict[str, Any]] = None,
         order_by: str = "created_at",
         order_desc: bool = True,
+        count_strategy: CountStrategy = CountStrategy.EXACT,
     ) -> PromotionListResponse:
         """
         Lists sizes with pagination and filtering.
@@ -137,26 +145,23 @@ class PromotionService:
             raise ValidationError("Limit must be between 1 and 100")
 
         # Delegate fetching to the repository
-        promotions, total = await self.promotion_repository.get_all(
+        page = await self.promotion_repository.get_all(
             db=db,
             skip=skip,
             limit=limit,
             filters=filters,
             order_by=order_by,
             order_desc=order_desc,
+            count_strategy=count_strategy,
         )
 
-        # Calculate pagination info
-        page = (skip // limit) + 1
-        total_pages = (total + limit - 1) // limit  # Ceiling division
-
         # Construct the response schema
         response = PromotionListResponse(
-            items=promotions, total=total, page=page, pages=total_pages, size=limit
+            items=page.items, **page.metadata(skip=skip, limit=limit)
         )
 
         self._logger.info(
-            f"Promotion list retrieved by {current_user.id}: {len(promotions)} promotions returned"
+            f"Promotion list retrieved by {current_user.id}: {len(page.items)} promotions returned"
         )
         return response
 
@@ -226,7 +231,7 @@ class PromotionService:
             fields_to_update=update_dict,
         )
 
-        await cache_service.invalidate(Promotion, promotion_id)
+        await cache_service.invalidate(PromotionResponse, promotion_id)
 
         self._logger.info(
             f"Promotion {promotion_id} updated by {current_user.id}",
@@ -267,7 +272,7 @@ class PromotionService:
             fields_to_update={"status": PromotionStatus.ACTIVE},
         )
 
-        await cache_service.invalidate(Promotion, promotion_id)
+        await cache_service.invalidate(PromotionResponse, promotion_id)
         self._logger.info(f"Promotion {promotion_id} activated by {current_user.id}")
         return activated_promotoin
 
@@ -300,7 +305,7 @@ class PromotionService:
             fields_to_update={"status": PromotionStatus.INACTIVE},
         )
 
-        await cache_service.invalidate(Promotion, promotion_id)
+        await cache_service.invalidate(PromotionResponse, promotion_id)
         self._logger.info(f"Promotion {promotion_id} activated by {current_user.id}")
         return deactivated_promotoin
 
@@ -325,7 +330,7 @@ class PromotionService:
         await self.promotion_repository.delete(db=db, obj_id=promotion_id)
 
         # 4. Clean up cache and tokens
-        await cache_service.invalidate(Promotion, promotion_id)
+        await cache_service.invalidate(PromotionResponse, promotion_id)
 
         self._logger.warning(
             f"Promotion {promotion_id} permanently deleted by {current_user.id}",
@@ -1,64 +1,468 @@
+import asyncio
 import logging
-from typing import Dict, List
-from datetime import datetime, timedelta
-from collections import defaultdict
+import math
+import time
+import uuid
+from collections import OrderedDict, deque
+from enum import Enum
+from typing import Deque, Dict, Optional, Tuple
 
+from app.core.config import settings
 from app.db.redis_conn import redis_client
 
 logger = logging.getLogger(__name__)
 
 
+class RateLimitAlgorithm(str, Enum):
+    """Rate limiting algorithms supported by RateLimitService."""
+
+    FIXED_WINDOW = "fixed_window"
+    SLIDING_WINDOW = "sliding_window"
+    TOKEN_BUCKET = "token_bucket"
+
+
+class RateLimitResult:
+    """Outcome of a single rate limit check, including the remaining quota."""
+
+    __slots__ = ("allowed", "limit", "remaining", "reset_after", "retry_after")
+
+    def __init__(
+        self,
+        allowed: bool,
+        limit: int,
+        remaining: int,
+        reset_after: int = 0,
+        retry_after: int = 0,
+    ):
+        self.allowed = allowed
+        self.limit = limit
+        self.remaining = max(0, remaining)
+        # Seconds until the quota is fully restored / until a retry can succeed
+        self.reset_after = reset_after
+        self.retry_after = retry_after
+
+    @classmethod
+    def from_reply(cls, limit: int, reply) -> "RateLimitResult":
+        """Build from a script reply of {allowed, remaining, reset_ms, retry_ms}."""
+        allowed, remaining, reset_ms, retry_ms = (int(v) for v in reply)
+        return cls(
+            allowed=bool(allowed),
+            limit=limit,
+            remaining=remaining,
+            reset_after=math.ceil(reset_ms / 1000),
+            retry_after=math.ceil(retry_ms / 1000),
+        )
+
+    def headers(self) -> Dict[str, str]:
+        headers = {
+            "X-RateLimit-Limit": str(self.limit),
+            "X-RateLimit-Remaining": str(self.remaining),
+            "X-RateLimit-Reset": str(self.reset_after),
+        }
+        if not self.allowed:
+            headers["Retry-After"] = str(self.retry_after)
+        return headers
+
+
+# ---- Lua limiters ----
+# Every limiter defines `rate_limit(key, limit, window_ms, member)` returning
+# {allowed, remaining, reset_ms, retry_ms}. Time comes from the Redis server
+# so all workers share one clock. Each script runs atomically via EVALSHA.
+_NOW_MS_LUA = """
+local function now_ms()
+    local t = redis.call('TIME')
+    return tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+end
+"""
+
+_LIMITER_LUA = {
+    # Counter per window; INCR and PEXPIRE in one step so keys never leak.
+    RateLimitAlgorithm.FIXED_WINDOW: """
+local function rate_limit(key, limit, window_ms, member)
+    local count = redis.call('INCR', key)
+    local ttl = redis.call('PTTL', key)
+    if ttl < 0 then
+        redis.call('PEXPIRE', key, window_ms)
+        ttl = window_ms
+    end
+    if count > limit then
+        return {0, 0, ttl, ttl}
+    end
+    return {1, limit - count, ttl, 0}
+end
+""",
+    # Sorted set of request timestamps inside the trailing window.
+    RateLimitAlgorithm.SLIDING_WINDOW: """
+local function rate_limit(key, limit, window_ms, member)
+    local now = now_ms()
+    redis.call('ZREMRANGEBYSCORE', key, '-inf', now - window_ms)
+    local count = redis.call('ZCARD', key)
+    if count < limit then
+        redis.call('ZADD', key, now, member)
+        redis.call('PEXPIRE', key, window_ms)
+        return {1, limit - count - 1, window_ms, 0}
+    end
+    local oldest = redis.call('ZRANGE', key, 0, 0, 'WITHSCORES')
+    local newest = redis.call('ZRANGE', key, -1, -1, 'WITHSCORES')
+    return {
+        0,
+        0,
+        tonumber(newest[2]) + window_ms - now,
+        tonumber(oldest[2]) + window_ms - now,
+    }
+end
+""",
+    # Bucket of `limit` tokens refilled continuously over `window_ms`.
+    RateLimitAlgorithm.TOKEN_BUCKET: """
+local function rate_limit(key, limit, window_ms, member)
+    local now = now_ms()
+    local rate = limit / window_ms
+    local state = redis.call('HMGET', key, 'tokens', 'ts')
+    local tokens = tonumber(state[1])
+    if tokens == nil then
+        tokens = limit
+    else
+        local elapsed = math.max(0, now - tonumber(state[2]))
+        tokens = math.min(limit, tokens + elapsed * rate)
+    end
+    local allowed = 0
+    local retry_ms = 0
+    if tokens >= 1 then
+        tokens = tokens - 1
+        allowed = 1
+    else
+        retry_ms = math.ceil((1 - tokens) / rate)
+    end
+    local full_ms = math.ceil((limit - tokens) / rate)
+    redis.call('HSET', key, 'tokens', tokens, 'ts', now)
+    redis.call('PEXPIRE', key, math.max(full_ms, 1))
+    return {allowed, math.floor(tokens), full_ms, retry_ms}
+end
+""",
+}
+
+#   KEYS: rate_limit   ARGV: limit, window_ms, member
+_LIMIT_MAIN_LUA = """
+return rate_limit(KEYS[1], tonumber(ARGV[1]), tonumber(ARGV[2]), ARGV[3])
+"""
+
+# One round trip for everything an authenticated request needs from Redis:
+# the caller's failed-auth counter, the token's revocation marker and,
+# optionally, the rate limit check.
+#   KEYS: failed_auth, revoked_token, rate_limit
+#   ARGV: check_revoked (0/1), count_request (0/1), limit, window_ms, member
+_AUTH_GATE_MAIN_LUA = """
+local failed = tonumber(redis.call('GET', KEYS[1]) or '0')
+local revoked = 0
+if ARGV[1] == '1' then
+    revoked = redis.call('EXISTS', KEYS[2])
+end
+local limited = {1, 0, 0, 0}
+if ARGV[2] == '1' then
+    limited = rate_limit(KEYS[3], tonumber(ARGV[3]), tonumber(ARGV[4]), ARGV[5])
+end
+return {failed, revoked, limited[1], limited[2], limited[3], limited[4]}
+"""
+
+
+class AuthGate:
+    """
+    Result of `RateLimitService.check_auth_gate`.
+
+    `revoked` is None when revocation was not checked (no jti, or Redis was
+    unavailable) so the caller can apply its own fail-secure policy.
+    `rate_limit` is None when no rate limit was requested.
+    """
+
+    __slots__ = ("failed_attempts", "revoked", "rate_limit")
+
+    def __init__(
+        self,
+        failed_attempts: int = 0,
+        revoked: Optional[bool] = None,
+        rate_limit: Optional[RateLimitResult] = None,
+    ):
+        self.failed_attempts = failed_attempts
+        self.revoked = revoked
+        self.rate_limit = rate_limit
+
+
+# ---- In-process fallback ----
+class _FixedWindowState:
+    __slots__ = ("expires_at", "window_start", "count")
+
+    def __init__(self, now: float):
+        self.expires_at = now
+        self.window_start = now
+        self.count = 0
+
+
+class _SlidingWindowState:
+    __slots__ = ("expires_at", "hits")
+
+    def __init__(self, now: float, max_requests: int):
+        self.expires_at = now
+        # Never holds more than `max_requests` timestamps
+        self.hits: Deque[float] = deque(maxlen=max(1, max_requests))
+
+
+class _TokenBucketState:
+    __slots__ = ("expires_at", "tokens", "updated_at")
+
+    def __init__(self, now: float, max_requests: int):
+        self.expires_at = now
+        self.tokens = float(max_requests)
+        self.updated_at = now
+
+
+class LocalRateLimiter:
+    """
+    Bounded in-process rate limiter used while Redis is unavailable.
+
+    Mirrors the Lua algorithms on the monotonic clock. Each check is O(1)
+    amortized; identifiers live in an LRU capped at `maxsize`, and `sweep`
+    drops state whose window has fully elapsed. Limits are per process, so
+    effective limits are looser than the shared Redis ones during an outage.
+    """
+
+    def __init__(self, maxsize: int):
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        self.maxsize = int(maxsize)
+        self._states: "OrderedDict[str, object]" = OrderedDict()
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    def _state(self, key: str, factory):
+        state = self._states.get(key)
+        if state is None:
+            state = factory()
+            self._states[key] = state
+            if len(self._states) > self.maxsize:
+                self._states.popitem(last=False)
+                self.evictions += 1
+        else:
+            self._states.move_to_end(key)
+        return state
+
+    def check(
+        self,
+        identifier: str,
+        max_requests: int,
+        window_seconds: int,
+        algorithm: RateLimitAlgorithm,
+    ) -> RateLimitResult:
+        now = time.monotonic()
+        window = float(window_seconds)
+        key = f"{algorithm.value}:{identifier}:{window_seconds}"
+
+        if algorithm == RateLimitAlgorithm.SLIDING_WINDOW:
+            state = self._state(key, lambda: _SlidingWindowState(now, max_requests))
+            hits = state.hits
+            while hits and hits[0] <= now - window:
+                hits.popleft()
+            if len(hits) < max_requests:
+                hits.append(now)
+                state.expires_at = now + window
+                return RateLimitResult(
+                    allowed=True,
+                    limit=max_requests,
+                    remaining=max_requests - len(hits),
+                    reset_after=window_seconds,
+                )
+            return RateLimitResult(
+                allowed=False,
+                limit=max_requests,
+                remaining=0,
+                reset_after=math.ceil(hits[-1] + window - now),
+                retry_after=math.ceil(hits[0] + window - now),
+            )
+
+        if algorithm == RateLimitAlgorithm.TOKEN_BUCKET:
+            state = self._state(key, lambda: _TokenBucketState(now, max_requests))
+            rate = max_requests / window
+            state.tokens = min(
+                max_requests, state.tokens + (now - state.updated_at) * rate
+            )
+            state.updated_at = now
+            allowed = state.tokens >= 1
+            retry_after = 0
+            if allowed:
+                state.tokens -= 1
+            else:
+                retry_after = math.ceil((1 - state.tokens) / rate)
+            full_after = (max_requests - state.tokens) / rate
+            state.expires_at = now + full_after
+            return RateLimitResult(
+                allowed=allowed,
+                limit=max_requests,
+                remaining=int(state.tokens),
+                reset_after=math.ceil(full_after),
+                retry_after=retry_after,
+            )
+
+        state = self._state(key, lambda: _FixedWindowState(now))
+        if now >= state.window_start + window:
+            state.window_start = now
+            state.count = 0
+        state.count += 1
+        state.expires_at = state.window_start + window
+        reset_after = math.ceil(state.expires_at - now)
+        if state.count > max_requests:
+            return RateLimitResult(
+                allowed=False,
+                limit=max_requests,
+                remaining=0,
+                reset_after=reset_after,
+                retry_after=reset_after,
+            )
+        return RateLimitResult(
+            allowed=True,
+            limit=max_requests,
+            remaining=max_requests - state.count,
+            reset_after=reset_after,
+        )
+
+    def sweep(self, batch: int = 1000) -> int:
+        """
+        Drop expired state, scanning at most `batch` entries from the
+        least-recently-used end. Returns how many were removed.
+        """
+        now = time.monotonic()
+        expired = []
+        for scanned, (key, state) in enumerate(self._states.items()):
+            if scanned >= batch:
+                break
+            if state.expires_at <= now:
+                expired.append(key)
+        for key in expired:
+            del self._states[key]
+        return len(expired)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "size": len(self._states),
+            "maxsize": self.maxsize,
+            "evictions": self.evictions,
+        }
+
+
 class RateLimitService:
     """Handles rate limiting business logic."""
 
-    def __init__(self):
-        self.memory_store: Dict[str, List[datetime]] = defaultdict(list)
+    def __init__(
+        self,
+        local_maxsize: int = settings.RATE_LIMIT_LOCAL_MAXSIZE,
+        sweep_interval: float = settings.RATE_LIMIT_SWEEP_INTERVAL,
+    ):
+        # Used when Redis is missing or a Redis call fails
+        self.local = LocalRateLimiter(maxsize=local_maxsize)
+        self.sweep_interval = float(sweep_interval)
+        self._sweeper_task: Optional[asyncio.Task] = None
         self.use_redis = redis_client is not None
+        # algorithm -> (standalone limiter script, auth gate script)
+        self._scripts: Dict[RateLimitAlgorithm, Tuple] = {}
+        if self.use_redis:
+            for algorithm, limiter in _LIMITER_LUA.items():
+                self._scripts[algorithm] = (
+                    redis_client.register_script(
+                        _NOW_MS_LUA + limiter + _LIMIT_MAIN_LUA
+                    ),
+                    redis_client.register_script(
+                        _NOW_MS_LUA + limiter + _AUTH_GATE_MAIN_LUA
+                    ),
+                )
 
-    async def is_rate_limited(
-        self, identifier: str, max_requests: int, window_seconds: int
-    ) -> bool:
-        """Check if identifier is rate limited."""
+    @staticmethod
+    def _rate_key(
+        identifier: str, window_seconds: int, algorithm: RateLimitAlgorithm
+    ) -> str:
+        return f"rate_limit:{algorithm.value}:{identifier}:{window_seconds}"
+
+    @staticmethod
+    def _limiter_args(
+        max_requests: int, window_seconds: int, algorithm: RateLimitAlgorithm
+    ) -> list:
+        # Sliding-window entries need a unique member per request
+        member = (
+            uuid.uuid4().hex if algorithm == RateLimitAlgorithm.SLIDING_WINDOW else ""
+        )
+        return [max_requests, window_seconds * 1000, member]
+
+    async def check_rate_limit(
+        self,
+        identifier: str,
+        max_requests: int,
+        window_seconds: int,
+        algorithm: RateLimitAlgorithm = RateLimitAlgorithm.FIXED_WINDOW,
+    ) -> RateLimitResult:
+        """Count a request for `identifier` and return the remaining quota."""
         if self.use_redis:
             return await self._check_redis_rate_limit(
-                identifier, max_requests, window_seconds
-            )
-        else:
-            return self._check_memory_rate_limit(
-                identifier, max_requests, window_seconds
+                identifier, max_requests, window_seconds, algorithm
             )
+        return self.local.check(identifier, max_requests, window_seconds, algorithm)
 
-    async def _check_redis_rate_limit(
-        self, identifier: str, max_requests: int, window_seconds: int
+    async def is_rate_limited(
+        self,
+        identifier: str,
+        max_requests: int,
+        window_seconds: int,
+        algorithm: RateLimitAlgorithm = RateLimitAlgorithm.FIXED_WINDOW,
     ) -> bool:
-        """Redis-based rate limiting."""
+        """Check if identifier is rate limited."""
+        result = await self.check_rate_limit(
+            identifier, max_requests, window_seconds, algorithm
+        )
+        return not result.allowed
+
+    async def _check_redis_rate_limit(
+        self,
+        identifier: str,
+        max_requests: int,
+        window_seconds: int,
+        algorithm: RateLimitAlgorithm,
+    ) -> RateLimitResult:
+        """Redis-based rate limiting: one atomic EVALSHA per check."""
+        limit_script, _ = self._scripts[algorithm]
         try:
-            key = f"rate_limit:{identifier}:{window_seconds}"
-            current = await redis_client.incr(key)
-            if current == 1:
-                await redis_client.expire(key, window_seconds)
-            return current > max_requests
+            reply = await limit_script(
+                keys=[self._rate_key(identifier, window_seconds, algorithm)],
+                args=self._limiter_args(max_requests, window_seconds, algorithm),
+            )
+            return RateLimitResult.from_reply(max_requests, reply)
         except Exception:
-            logger.error("Redis rate limit check failed.", exc_info=True)
-            return False  # Fail open
+            logger.error(
+                "Redis rate limit check failed; using local limiter.", exc_info=True
+            )
+            return self.local.check(
+                identifier, max_requests, window_seconds, algorithm
+            )
 
-    def _check_memory_rate_limit(
-        self, identifier: str, max_requests: int, window_seconds: int
-    ) -> bool:
-        """Memory-based rate limiting."""
-        now = datetime.now()
-        # Clean old entries
-        self.memory_store[identifier] = [
-            call
-            for call in self.memory_store[identifier]
-            if now - call < timedelta(seconds=window_seconds)
-        ]
-        # Check limit
-        if len(self.memory_store[identifier]) >= max_requests:
-            return True
-        # Record this request
-        self.memory_store[identifier].append(now)
-        return False
+    async def _sweep_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            try:
+                self.local.sweep()
+            except Exception:
+                logger.error("Local rate limit sweep failed.", exc_info=True)
+
+    async def start_sweeper(self) -> None:
+        """Start the periodic cleanup of local limiter state (call on startup)."""
+        if self._sweeper_task is None or self._sweeper_task.done():
+            self._sweeper_task = asyncio.create_task(self._sweep_periodically())
+
+    async def stop_sweeper(self) -> None:
+        if self._sweeper_task is None:
+            return
+        self._sweeper_task.cancel()
+        try:
+            await self._sweeper_task
+        except asyncio.CancelledError:
+            pass
+        self._sweeper_task = None
 
     async def is_auth_rate_limited(
         self, identifier: str, max_attempts: int = 5
@@ -73,14 +477,18 @@ class RateLimitService:
 
     async def record_failed_auth_attempt(
         self, identifier: str, lockout_duration: int = 300
-    ):
-        """Record failed authentication attempt."""
+    ) -> int:
+        """Record failed authentication attempt; returns the attempt count."""
         try:
             key = f"failed_auth:{identifier}"
-            await redis_client.incr(key)
-            await redis_client.expire(key, lockout_duration)
+            async with redis_client.pipeline(transaction=False) as pipe:
+                pipe.incr(key)
+                pipe.expire(key, lockout_duration)
+                attempts, _ = await pipe.execute()
+            return int(attempts)
         except Exception:
             logger.error("Failed to record auth attempt.", exc_info=True)
+            return 0
 
     async def clear_failed_auth_attempts(self, identifier: str):
         """Clear failed auth attempts on successful login."""
@@ -90,5 +498,66 @@ class RateLimitService:
         except Exception:
             logger.error("Failed to clear auth attempts.", exc_info=True)
 
+    async def check_auth_gate(
+        self,
+        identifier: str,
+        *,
+        revoked_key: Optional[str] = None,
+        rate_identifier: Optional[str] = None,
+        max_requests: int = 0,
+        window_seconds: int = 0,
+        algorithm: RateLimitAlgorithm = RateLimitAlgorithm.FIXED_WINDOW,
+    ) -> AuthGate:
+        """
+        Run the per-request auth checks in a single Redis call.
+
+        Reads the failed-auth counter for `identifier`, checks `revoked_key`
+        when given, and counts the request against `rate_identifier`'s
+        limit when given. Fails open like the individual checks; the
+        revocation result is left unknown on errors.
+        """
+        count_request = rate_identifier is not None
+
+        def local_gate() -> AuthGate:
+            if not count_request:
+                return AuthGate()
+            return AuthGate(
+                rate_limit=self.local.check(
+                    rate_identifier, max_requests, window_seconds, algorithm
+                )
+            )
+
+        if not self.use_redis:
+            return local_gate()
+
+        _, gate_script = self._scripts[algorithm]
+        rate_key = (
+            self._rate_key(rate_identifier, window_seconds, algorithm)
+            if count_request
+            else ""
+        )
+        try:
+            failed, revoked, *limited = await gate_script(
+                keys=[f"failed_auth:{identifier}", revoked_key or "", rate_key],
+                args=[
+                    int(revoked_key is not None),
+                    int(count_request),
+                    *self._limiter_args(max_requests, window_seconds, algorithm),
+                ],
+            )
+        except Exception:
+            logger.error("Redis auth gate check failed.", exc_info=True)
+            return local_gate()
+
+        return AuthGate(
+            failed_attempts=int(failed),
+            revoked=bool(revoked) if revoked_key is not None else None,
+            rate_limit=(
+                RateLimitResult.from_reply(max_requests, limited)
+                if count_request
+                else None
+            ),
+        )
+
 
 rate_limit_service = RateLimitService()
@@ -6,12 +6,13 @@ This module provides the business logic layer for user operations,
 handling authorization, validation, and orchestrating repository calls.
 """
 import logging
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Union
 import uuid
 
 from sqlmodel.ext.asyncio.session import AsyncSession
 from datetime import datetime, timezone
 from app.crud.user_crud import user_repository
+from app.crud.pagination import CountStrategy
 from app.schemas.user_schema import (
     UserUpdate,
     UserListResponse,
@@ -20,6 +21,7 @@ from app.schemas.user_schema import (
 )
 from app.models.user_model import User, UserRole
 from app.services.cache_service import cache_service
+from app.services.principal_cache import AuthPrincipal, principal_cache
 from app.services.auth_service import auth_service
 from app.core.exception_utils import raise_for_status
 from app.core.exceptions import (
@@ -77,12 +79,24 @@ class UserService:
         self, db: AsyncSession, *, user_id: uuid.UUID
     ) -> Optional[User]:
         """
-        A simplified user retrieval method for authentication purposes, using a
-        cache-aside pattern.
+        Load the full user row for endpoints that need more than the principal.
         """
 
         return await self.user_repository.get(db=db, obj_id=user_id)
 
+    async def get_auth_principal(
+        self, db: AsyncSession, *, user_id: uuid.UUID
+    ) -> Optional[AuthPrincipal]:
+        """
+        The fields authentication needs, cache-aside: in-process, then Redis,
+        then the users table.
+        """
+
+        return await principal_cache.get(
+            user_id,
+            loader=lambda: self.user_repository.get(db=db, obj_id=user_id),
+        )
+
     async def _load_user_schema_from_db(
         self, *, db: AsyncSession, user_id: uuid.UUID
     ) -> Optional[UserResponse]:
@@ -99,26 +113,29 @@ class UserService:
         return UserResponse.model_validate(user_model)
 
     async def get_user_by_id(
-        self, db: AsyncSession, *, user_id: uuid.UUID, current_user: User
-    ) -> Optional[UserResponse]:
-        """Retrieve user by it's ID"""
+        self,
+        db: AsyncSession,
+        *,
+        user_id: uuid.UUID,
+        current_user: User,
+        return_json: bool = False,
+    ) -> Optional[Union[UserResponse, str]]:
+        """Retrieve user by it's ID (as the cached JSON if `return_json`)"""
+
+        # Fine-grained authorization check. Done on the requested ID so the
+        # cached JSON never has to be decoded just to read its owner.
+        raise_for_status(
+            condition=(not current_user.is_admin and current_user.id != user_id),
+            exception=NotAuthorized,
+            detail="You are not authorized to view this user's profile.",
+        )
 
         user = await cache_service.get_or_set(
             schema_type=UserResponse,
             obj_id=user_id,
             loader=lambda: self._load_user_schema_from_db(db=db, user_id=user_id),
             ttl=300,  # Cache for 5 minutes
-        )
-
-        # Fine-grained authorization check
-        if current_user.is_admin:
-            return user
-        is_not_self = current_user.id != user.id
-
-        raise_for_status(
-            condition=(is_not_self),
-            exception=NotAuthorized,
-            detail="You are not authorized to view this user's profile.",
+            return_json=return_json,
         )
 
         self._logger.debug(f"User {user_id} retrieved by user {current_user.id}")
@@ -134,6 +151,7 @@ class UserService:
         filters: Optional[Dict[str, Any]] = None,
         order_by: str = "created_at",
         order_desc: bool = True,
+        count_strategy: CountStrategy = CountStrategy.EXACT,
     ) -> UserListResponse:
         """
         Lists users with pagination and filtering.
@@ -167,26 +185,23 @@ class UserService:
             raise ValidationError("Limit must be between 1 and 100")
 
         # Delegate fetching to the repository
-        users, total = await self.user_repository.get_all(
+        page = await self.user_repository.get_all(
             db=db,
             skip=skip,
             limit=limit,
             filters=filters,
             order_by=order_by,
             order_desc=order_desc,
+            count_strategy=count_strategy,
         )
 
-        # Calculate pagination info
-        page = (skip // limit) + 1
-        total_pages = (total + limit - 1) // limit  # Ceiling division
-
         # Construct the response schema
         response = UserListResponse(
-            items=users, total=total, page=page, pages=total_pages, size=limit
+            items=page.items, **page.metadata(skip=skip, limit=limit)
         )
 
         self._logger.info(
-            f"User list retrieved by {current_user.id}: {len(users)} users returned"
+            f"User list retrieved by {current_user.id}: {len(page.items)} users returned"
         )
         return response
 
@@ -206,7 +221,9 @@ class UserService:
         # 2. Prepare the user model
         user_dict = user_in.model_dump()
         password = user_dict.pop("password")
-        user_dict["hashed_password"] = password_manager.hash_password(password)
+        user_dict["hashed_password"] = await password_manager.hash_password_async(
+            password
+        )
         user_dict["created_at"] = datetime.now(timezone.utc)
         user_dict["updated_at"] = datetime.now(timezone.utc)
 
@@ -255,7 +272,7 @@ class UserService:
             fields_to_update=update_dict,
         )
 
-        await cache_service.invalidate(User, user_id_to_update)
+        await cache_service.invalidate(UserResponse, user_id_to_update)
 
         self._logger.info(
             f"User {user_id_to_update} updated by {current_user.id}",
@@ -319,10 +336,10 @@ class UserService:
             fields_to_update={"is_active": False},
         )
 
-        # 6. Invalidate cache and potentially revoke tokens
-        await cache_service.invalidate(User, user_id_to_deactivate)
+        # 6. Invalidate cache and revoke tokens (also drops the auth principal)
+        await cache_service.invalidate(UserResponse, user_id_to_deactivate)
 
-        auth_service.revoke_all_user_tokens(db=db, user=user_to_deactivate)
+        await auth_service.revoke_all_user_tokens(db=db, user=user_to_deactivate)
 
         self._logger.info(
             f"User {user_id_to_deactivate} deactivated by {current_user.id}",
@@ -359,7 +376,8 @@ class UserService:
             db=db, user=user_to_activate, fields_to_update={"is_active": True}
         )
 
-        await cache_service.invalidate(User, user_id_to_activate)
+        await cache_service.invalidate(UserResponse, user_id_to_activate)
+        await principal_cache.invalidate(user_id_to_activate)
         self._logger.info(f"User {user_id_to_activate} activated by {current_user.id}")
         return activated_user
 
@@ -390,7 +408,8 @@ class UserService:
             db=db, user=user_to_change, fields_to_update={"role": new_role}
         )
 
-        await cache_service.invalidate(User, user_id_to_change)
+        await cache_service.invalidate(UserResponse, user_id_to_change)
+        await principal_cache.invalidate(user_id_to_change)
         self._logger.info(
             f"User {user_id_to_change} role changed to {new_role.value} by {current_user.id}"
         )
@@ -440,10 +459,9 @@ class UserService:
         # 4. Perform the deletion
         await self.user_repository.delete(db=db, obj_id=user_id_to_delete)
 
-        auth_service.revoke_all_user_tokens(db=db, user=user_to_delete)
-
-        # 5. Clean up cache and tokens
-        await cache_service.invalidate(User, user_id_to_delete)
+        # 5. Clean up cache; with the row and principal gone, tokens stop working
+        await cache_service.invalidate(UserResponse, user_id_to_delete)
+        await principal_cache.invalidate(user_id_to_delete)
 
         self._logger.warning(
             f"User {user_id_to_delete} permanently deleted by {current_user.id}",
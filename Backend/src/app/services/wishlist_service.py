@@ -6,17 +6,21 @@ This module provides the business logic layer for Wishlist operations,
 handling authorization, validation, and orchestrating repository calls.
 """
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, List
 import uuid
 
 from sqlmodel.ext.asyncio.session import AsyncSession
+from app.schemas.product_schema import ProductResponse
 from app.schemas.wishlist_schema import (
     WishlistListResponse,
+    WishlistResponse,
 )
 from app.models.user_model import User
 from app.models.wishlist_model import Wishlist
 from app.crud.wishlist_crud import wishlist_repository
+from app.crud.pagination import CountStrategy
 from app.crud.product_crud import product_repository
+from app.services.cache_service import cache_service
 from app.core.exception_utils import raise_for_status
 from app.core.exceptions import (
     ResourceNotFound,
@@ -49,6 +53,7 @@ class WishlistService:
         limit: int = 50,
         order_by: str = "created_at",
         order_desc: bool = True,
+        count_strategy: CountStrategy = CountStrategy.EXACT,
     ) -> WishlistListResponse:
 
         # Input validation
@@ -58,29 +63,57 @@ class WishlistService:
             raise ValidationError("Limit must be between 1 and 100")
 
         # Delegate fetching to the repository
-        wishlist, total = await self.wishlist_repository.get_full_wishlist(
+        page = await self.wishlist_repository.get_full_wishlist(
             db=db,
             skip=skip,
             limit=limit,
             user_id=current_user.id,
             order_by=order_by,
             order_desc=order_desc,
+            count_strategy=count_strategy,
         )
 
-        # Calculate pagination info
-        page = (skip // limit) + 1
-        total_pages = (total + limit - 1) // limit  # Ceiling division
+        # Hydrate products from the per-product cache, loading only the gaps
+        products = await self._get_products(
+            db=db, product_ids=[item.product_id for item in page.items]
+        )
+        items = [
+            WishlistResponse(
+                id=item.id,
+                created_at=item.created_at,
+                product=products[item.product_id],
+            )
+            for item in page.items
+            if item.product_id in products
+        ]
 
         # Construct the response schema
         response = WishlistListResponse(
-            items=wishlist, total=total, page=page, pages=total_pages, size=limit
+            items=items, **page.metadata(skip=skip, limit=limit)
         )
 
         self._logger.info(
-            f"Wishlist list retrieved by {current_user.id}: {len(wishlist)} items returned"
+            f"Wishlist list retrieved by {current_user.id}: {len(page.items)} items returned"
         )
         return response
 
+    async def _get_products(
+        self, *, db: AsyncSession, product_ids: List[uuid.UUID]
+    ) -> Dict[uuid.UUID, ProductResponse]:
+        """Cached ProductResponse for each ID; misses come from one IN query."""
+
+        products, missing = await cache_service.get_many(ProductResponse, product_ids)
+        if missing:
+            loaded = [
+                ProductResponse.model_validate(product)
+                for product in await self.product_repository.get_by_ids(
+                    db=db, ids=missing
+                )
+            ]
+            await cache_service.set_many(loaded, ttl=300)
+            products.update({product.id: product for product in loaded})
+        return products
+
     async def add_product_to_wishlist(
         self,
         db: AsyncSession,
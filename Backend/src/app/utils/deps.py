@@ -8,20 +8,29 @@ from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio.session import AsyncSession
 
 from app.core.config import settings
-from app.core.security import token_manager, TokenType
+from app.core.metrics import rate_limit_rejections
+from app.core.revocation import revocation_filter
+from app.core.security import constant_time_compare, token_manager, TokenType
+from app.crud.pagination import CountStrategy
 from app.db.session import get_session
 from app.models.user_model import User, UserRole
 
 from app.core.exceptions import (
     InvalidToken,
     ResourceNotFound,
+    TokenExpired,
     TokenRevoked,
     RateLimitExceeded,
     InactiveUser,
     NotAuthorized,
 )
+from app.services.cache_service import cache_service
+from app.services.principal_cache import AuthPrincipal
 from app.services.user_service import UserService
 from app.services.rate_limit_service import (
+    AuthGate,
+    RateLimitAlgorithm,
+    RateLimitResult,
     RateLimitService,
     rate_limit_service as _rate_limit_singleton,
 )
@@ -50,62 +59,151 @@ def get_rate_limit_service() -> RateLimitService:
 
 
 # ================== CORE AUTHENTICATION ==================
-async def _authenticate_user_from_token(
+AUTH_MAX_FAILED_ATTEMPTS = 5
+
+
+class _VerifiedToken:
+    """An access token decoded once per request, plus its auth gate result."""
+
+    __slots__ = ("token", "payload", "gate")
+
+    def __init__(self, token: str, payload: Dict[str, Any], gate: AuthGate):
+        self.token = token
+        self.payload = payload
+        self.gate = gate
+
+
+def _bearer_token(request: Request) -> Optional[str]:
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    token = token.strip()
+    return token if scheme.lower() == "bearer" and token else None
+
+
+async def _verify_access_token(
     request: Request,
-    db: AsyncSession,
     token: str,
-    user_svc: UserService,
     rate_limit_svc: RateLimitService,
-) -> User:
+    limiter: Optional["RateLimitChecker"] = None,
+) -> _VerifiedToken:
     """
-    Core auth routine: validates token, checks revocation, returns User.
-    Applies auth-specific rate limiting by client IP on failure bursts.
+    Decode the access token and run all of its Redis checks in one round trip:
+    failed-auth counter, revocation marker (unless the local revocation filter
+    can answer) and, when `limiter` is given, the caller's rate limit window.
+    The result is kept on request.state so the auth dependency that follows
+    the rate limiter does not repeat the work.
     """
+    payload = token_manager.decode_token(token, expected_type=TokenType.ACCESS)
     client_ip = request.client.host if request.client else "unknown"
 
-    # Brute-force protection (auth attempts)
-    lockout_seconds = int(getattr(settings, "AUTH_LOCKOUT_SECONDS", 300))
-    if await rate_limit_svc.is_auth_rate_limited(
+    jti = payload.get("jti") if token_manager.config.ENABLE_TOKEN_BLACKLIST else None
+    # Only ask Redis when the local revocation filter cannot answer
+    revoked = revocation_filter.is_revoked(jti) if jti else None
+    limit_kwargs: Dict[str, Any] = {}
+    if limiter is not None:
+        limit_kwargs = {
+            "rate_identifier": f"user:{payload.get('sub')}",
+            "max_requests": limiter.max_requests,
+            "window_seconds": limiter.window_seconds,
+            "algorithm": limiter.algorithm,
+        }
+    gate = await rate_limit_svc.check_auth_gate(
         client_ip,
-        max_attempts=5,
-    ):
+        revoked_key=(
+            token_manager.revoked_key(jti) if jti and revoked is None else None
+        ),
+        **limit_kwargs,
+    )
+    if revoked is not None:
+        gate.revoked = revoked
+
+    verified = _VerifiedToken(token, payload, gate)
+    request.state.verified_token = verified
+    return verified
+
+
+async def _record_auth_failure(
+    rate_limit_svc: RateLimitService, client_ip: str, lockout_seconds: int
+) -> None:
+    """Count a failed attempt; past the limit the caller is locked out."""
+    attempts = await rate_limit_svc.record_failed_auth_attempt(
+        client_ip, lockout_duration=lockout_seconds
+    )
+    if attempts > AUTH_MAX_FAILED_ATTEMPTS:
         raise RateLimitExceeded(
             detail="Too many failed authentication attempts.",
             retry_after=lockout_seconds,
         )
 
-    # Verify token
+
+async def _authenticate_user_from_token(
+    request: Request,
+    db: AsyncSession,
+    token: str,
+    user_svc: UserService,
+    rate_limit_svc: RateLimitService,
+) -> AuthPrincipal:
+    """
+    Core auth routine: validates token, checks revocation, returns the principal.
+    Applies auth-specific rate limiting by client IP on failure bursts.
+    The principal comes from the principal cache, so a warm request never
+    queries the users table, and the Redis checks share a single round trip
+    with the rate limiter.
+    """
+    client_ip = request.client.host if request.client else "unknown"
+    lockout_seconds = int(getattr(settings, "AUTH_LOCKOUT_SECONDS", 300))
+
+    # Verify token (reusing the rate limiter's result when it already ran)
+    verified: Optional[_VerifiedToken] = getattr(
+        request.state, "verified_token", None
+    )
     try:
-        payload = await token_manager.verify_token(
-            token, expected_type=TokenType.ACCESS
-        )
-        sub = payload.get("sub")
+        if verified is None or verified.token != token:
+            verified = await _verify_access_token(request, token, rate_limit_svc)
+        sub = verified.payload.get("sub")
         if sub is None:
             raise InvalidToken(
                 detail="Token subject (sub) is missing.", token_type="access"
             )
         user_id = uuid.UUID(sub)
     except InvalidToken:
-        await rate_limit_svc.record_failed_auth_attempt(
-            client_ip, lockout_duration=lockout_seconds
-        )
+        await _record_auth_failure(rate_limit_svc, client_ip, lockout_seconds)
         raise
 
-    # Load user
-    user = await user_svc.get_user_for_auth(db=db, user_id=user_id)
+    # Brute-force protection (auth attempts)
+    if verified.gate.failed_attempts >= AUTH_MAX_FAILED_ATTEMPTS:
+        raise RateLimitExceeded(
+            detail="Too many failed authentication attempts.",
+            retry_after=lockout_seconds,
+        )
+
+    # Blacklist check; the gate leaves it unknown when Redis was unavailable
+    if token_manager.config.ENABLE_TOKEN_BLACKLIST:
+        revoked = verified.gate.revoked
+        if revoked is None:
+            revoked = await token_manager.is_token_revoked(verified.payload["jti"])
+        if revoked:
+            await _record_auth_failure(rate_limit_svc, client_ip, lockout_seconds)
+            raise TokenRevoked()
+
+    # Load principal
+    user = await user_svc.get_auth_principal(db=db, user_id=user_id)
     if not user:
         # Treat unknown user as a not found (and not as auth failure) to avoid info leaks
         raise ResourceNotFound(resource_type="User", resource_id=str(user_id))
 
     # Token revocation check
     # We only compare if token has iat; if missing, treat as invalid token.
-    iat = payload.get("iat")
+    iat = verified.payload.get("iat")
     if iat is None:
-        await rate_limit_svc.record_failed_auth_attempt(
-            client_ip, lockout_duration=lockout_seconds
-        )
+        await _record_auth_failure(rate_limit_svc, client_ip, lockout_seconds)
         raise InvalidToken(detail="Token is missing 'iat' claim.", token_type="access")
 
+    # Watermarks published since the principal was cached
+    watermark = revocation_filter.valid_from(str(user.id))
+    if watermark is not None and iat < watermark:
+        await _record_auth_failure(rate_limit_svc, client_ip, lockout_seconds)
+        raise TokenRevoked()
+
     if user.tokens_valid_from_utc:
         token_issued_at = datetime.fromtimestamp(iat, tz=timezone.utc)
 
@@ -116,29 +214,54 @@ async def _authenticate_user_from_token(
 
         # Now, both are guaranteed to be datetime objects
         if token_issued_at < revocation_timestamp:
-            await rate_limit_svc.record_failed_auth_attempt(client_ip)
+            await _record_auth_failure(rate_limit_svc, client_ip, lockout_seconds)
             raise TokenRevoked()
 
-    # Success path: clear failures and attach to request
-    await rate_limit_svc.clear_failed_auth_attempts(client_ip)
+    # Success path: clear failures (only if there were any) and attach to request
+    if verified.gate.failed_attempts:
+        await rate_limit_svc.clear_failed_auth_attempts(client_ip)
     request.state.user = user
     request.state.user_id = str(user.id)
     return user
 
 
-async def get_current_user(
+async def get_current_principal(
     request: Request,
     db: AsyncSession = Depends(get_session),
     token: str = Depends(reusable_oauth2),
     user_svc: UserService = Depends(get_user_service),
     rate_limit_svc: RateLimitService = Depends(get_rate_limit_service),
-) -> User:
-    """Primary authentication dependency. Validates JWT and returns current user."""
+) -> AuthPrincipal:
+    """Primary authentication dependency. Validates JWT and returns the principal."""
     return await _authenticate_user_from_token(
         request, db, token, user_svc, rate_limit_svc
     )
 
 
+async def get_current_active_principal(
+    principal: AuthPrincipal = Depends(get_current_principal),
+) -> AuthPrincipal:
+    """Ensure the authenticated principal is active."""
+    if not principal.is_active:
+        logger.warning(
+            "Inactive user attempted access", extra={"user_id": str(principal.id)}
+        )
+        raise InactiveUser()
+    return principal
+
+
+async def get_current_user(
+    db: AsyncSession = Depends(get_session),
+    principal: AuthPrincipal = Depends(get_current_principal),
+    user_svc: UserService = Depends(get_user_service),
+) -> User:
+    """Full User row, for the few endpoints that need more than the principal."""
+    user = await user_svc.get_user_for_auth(db=db, user_id=principal.id)
+    if not user:
+        raise ResourceNotFound(resource_type="User", resource_id=str(principal.id))
+    return user
+
+
 async def get_current_active_user(
     current_user: User = Depends(get_current_user),
 ) -> User:
@@ -162,8 +285,10 @@ class RoleChecker:
         self.required_role = required_role
 
     def __call__(
-        self, request: Request, current_user: User = Depends(get_current_active_user)
-    ) -> User:
+        self,
+        request: Request,
+        current_user: AuthPrincipal = Depends(get_current_active_principal),
+    ) -> AuthPrincipal:
         """Check if user has sufficient role privileges."""
 
         # 1. Explicitly convert the current user's role (which might be a string)
@@ -196,6 +321,7 @@ require_admin = RoleChecker(UserRole.ADMIN)
 class RateLimitChecker:
     """
     Dependency for rate limiting. Delegates actual limiting logic to service layer.
+    The result is left on request.state.rate_limit for the X-RateLimit-* headers.
     """
 
     def __init__(
@@ -203,10 +329,14 @@ class RateLimitChecker:
         max_requests: int = 100,
         window_seconds: int = 60,
         identifier_type: str = "ip",  # "ip" or "user"
+        algorithm: RateLimitAlgorithm = RateLimitAlgorithm.FIXED_WINDOW,
+        name: str = "default",  # Label for the rejection metric
     ):
         self.max_requests = max_requests
         self.window_seconds = window_seconds
         self.identifier_type = identifier_type
+        self.algorithm = algorithm
+        self.name = name
 
     async def __call__(
         self,
@@ -215,6 +345,23 @@ class RateLimitChecker:
     ):
         """Check rate limits using service layer."""
         if self.identifier_type == "user":
+            token = _bearer_token(request)
+            if token:
+                # Count the request in the same Redis call as the token checks
+                try:
+                    verified = await _verify_access_token(
+                        request, token, rate_limit_svc, limiter=self
+                    )
+                except (InvalidToken, TokenExpired):
+                    verified = None  # authentication reports it; limit by IP
+                if verified is not None:
+                    self._apply(
+                        request,
+                        f"user:{verified.payload.get('sub')}",
+                        verified.gate.rate_limit,
+                    )
+                    return
+
             user = getattr(request.state, "user", None)
             identifier = (
                 f"user:{user.id}"
@@ -224,28 +371,57 @@ class RateLimitChecker:
         else:
             identifier = f"ip:{request.client.host if request.client else 'unknown'}"
 
-        if await rate_limit_svc.is_rate_limited(
-            identifier, self.max_requests, self.window_seconds
-        ):
+        result = await rate_limit_svc.check_rate_limit(
+            identifier, self.max_requests, self.window_seconds, self.algorithm
+        )
+        self._apply(request, identifier, result)
+
+    def _apply(
+        self, request: Request, identifier: str, result: Optional[RateLimitResult]
+    ) -> None:
+        if result is None:
+            return
+        # With several limiters on a route, report the tightest one
+        current = getattr(request.state, "rate_limit", None)
+        if current is None or result.remaining <= current.remaining:
+            request.state.rate_limit = result
+        if not result.allowed:
             logger.warning(f"Rate limit exceeded for {identifier}")
+            rate_limit_rejections.inc(self.name)
             raise RateLimitExceeded(
                 detail=f"Rate limit exceeded. Maximum {self.max_requests} requests per {self.window_seconds} seconds.",
-                retry_after=self.window_seconds,
+                retry_after=max(1, result.retry_after),
             )
 
 
 # Preconfigured instances
 rate_limit_auth = RateLimitChecker(
-    max_requests=5, window_seconds=60, identifier_type="ip"
+    max_requests=5,
+    window_seconds=60,
+    identifier_type="ip",
+    algorithm=RateLimitAlgorithm.SLIDING_WINDOW,
+    name="auth",
 )
 rate_limit_api = RateLimitChecker(
-    max_requests=35, window_seconds=60, identifier_type="user"
+    max_requests=35,
+    window_seconds=60,
+    identifier_type="user",
+    algorithm=RateLimitAlgorithm.TOKEN_BUCKET,
+    name="api",
 )
 rate_limit_heavy = RateLimitChecker(
-    max_requests=10, window_seconds=60, identifier_type="user"
+    max_requests=10,
+    window_seconds=60,
+    identifier_type="user",
+    algorithm=RateLimitAlgorithm.TOKEN_BUCKET,
+    name="heavy",
 )
 rate_limit_refresh = RateLimitChecker(
-    max_requests=3, window_seconds=86400, identifier_type="user"
+    max_requests=3,
+    window_seconds=86400,
+    identifier_type="user",
+    algorithm=RateLimitAlgorithm.SLIDING_WINDOW,
+    name="refresh",
 )
 
 
@@ -262,11 +438,13 @@ class PaginationParams:
             le=int(getattr(settings, "MAX_PAGE_SIZE", 100)),
             description="Page size",
         ),
+        count: CountStrategy = CountStrategy.EXACT,
     ):
         self.page = page
         self.size = size
         self.skip = (page - 1) * size
         self.limit = size
+        self.count_strategy = count
 
 
 async def get_pagination_params(
@@ -277,9 +455,16 @@ async def get_pagination_params(
         le=int(getattr(settings, "MAX_PAGE_SIZE", 100)),
         description="Page size",
     ),
+    count: CountStrategy = Query(
+        CountStrategy.EXACT,
+        description=(
+            "How to compute `total`: exact (window count), estimated "
+            "(planner estimate) or none (only `has_more`)"
+        ),
+    ),
 ) -> PaginationParams:
     """Get pagination parameters as a dependency."""
-    return PaginationParams(page=page, size=size)
+    return PaginationParams(page=page, size=size, count=count)
 
 
 # ================== HEALTH CHECK ==================
@@ -289,9 +474,22 @@ async def get_health_status() -> Dict[str, Any]:
         "status": "healthy",
         "timestamp": datetime.now(timezone.utc).isoformat(),
         "version": getattr(settings, "APP_VERSION", "unknown"),
+        "cache": cache_service.stats(),
     }
 
 
+# ================== METRICS ==================
+async def require_metrics_token(request: Request) -> None:
+    """Admit a scrape only with `Authorization: Bearer <METRICS_TOKEN>`."""
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if (
+        not settings.METRICS_TOKEN
+        or scheme.lower() != "bearer"
+        or not constant_time_compare(token, settings.METRICS_TOKEN)
+    ):
+        raise InvalidToken(detail="Invalid metrics token.")
+
+
 # ================== REQUEST CONTEXT ==================
 def _client_ip_from_headers(request: Request) -> str:
     xff = request.headers.get("x-forwarded-for")
@@ -323,7 +521,7 @@ async def get_current_user_optional(
     token: Optional[str] = Depends(optional_oauth2),
     user_svc: UserService = Depends(get_user_service),
     rate_limit_svc: RateLimitService = Depends(get_rate_limit_service),
-) -> Optional[User]:
+) -> Optional[AuthPrincipal]:
     """
     Optional authentication - returns None if no valid token.
     Useful for endpoints that work for both authenticated and anonymous u